@@ -28,9 +28,27 @@ from pytgcalls.exceptions import NoActiveGroupCall
 import config
 from ShrutiMusic import LOGGER, app, userbot
 from ShrutiMusic.core.call import Nand
+from ShrutiMusic.core.executor import shutdown_pools
+from ShrutiMusic.core.http import http
+from ShrutiMusic.core.mongo import ensure_indexes
+from ShrutiMusic.core.shard import coordinator
 from ShrutiMusic.misc import sudo
 from ShrutiMusic.plugins import ALL_MODULES
-from ShrutiMusic.utils.database import get_banned_users, get_gbanned
+from ShrutiMusic.utils.broadcast import resume_broadcasts
+from ShrutiMusic.utils.database import (
+    get_assistant_sessions,
+    get_banned_users,
+    get_gbanned,
+    start_leaderboards,
+)
+from ShrutiMusic.utils.database.chatsettings import chat_settings
+from ShrutiMusic.utils.database.registry import flush_registries, start_registries
+from ShrutiMusic.utils.mediastore import media_store
+from ShrutiMusic.utils.metacache import meta_cache
+from ShrutiMusic.utils.stream.pcmcache import pcm_cache
+from ShrutiMusic.utils.stream.progressive import progressive
+from ShrutiMusic.utils.stream.snapshot import snapshots
+from ShrutiMusic.utils.thumbnails import load_cards
 from config import BANNED_USERS
 
 COMMANDS = [
@@ -76,17 +94,22 @@ async def setup_bot_commands():
         LOGGER("ShrutiMusic").error(f"Failed to set bot commands: {str(e)}")
 
 async def init():
-    if (
-        not config.STRING1
-        and not config.STRING2
-        and not config.STRING3
-        and not config.STRING4
-        and not config.STRING5
-    ):
+    await ensure_indexes()
+    sessions = await get_assistant_sessions()
+    if not sessions:
         LOGGER(__name__).error("Assistant client variables not defined, exiting...")
         exit()
 
     await sudo()
+    await http.start()
+    await meta_cache.load()
+    await media_store.start()
+    await pcm_cache.start()
+    await load_cards()
+    await progressive.start()
+    await chat_settings.start()
+    await start_registries()
+    await start_leaderboards()
 
     try:
         users = await get_gbanned()
@@ -107,7 +130,7 @@ async def init():
 
     LOGGER("ShrutiMusic.plugins").info("Successfully Imported Modules...")
 
-    await userbot.start()
+    await userbot.start(sessions)
     await Nand.start()
 
     try:
@@ -120,7 +143,8 @@ async def init():
     except:
         pass
 
-    await Nand.decorators()
+    await snapshots.restore()
+    await resume_broadcasts()
 
     LOGGER("ShrutiMusic").info(
         "\x53\x68\x72\x75\x74\x69\x20\x4d\x75\x73\x69\x63\x20\x53\x74\x61\x72\x74\x65\x64\x20\x53\x75\x63\x63\x65\x73\x73\x66\x75\x6c\x6c\x79\x2e\x0a\x0a\x44\x6f\x6e\x27\x74\x20\x66\x6f\x72\x67\x65\x74\x20\x74\x6f\x20\x76\x69\x73\x69\x74\x20\x40\x53\x68\x72\x75\x74\x69\x42\x6f\x74\x73"
@@ -128,8 +152,17 @@ async def init():
 
     await idle()
 
+    await snapshots.stop()
     await app.stop()
     await userbot.stop()
+    await coordinator.stop()
+    await progressive.stop()
+    await http.close()
+    await chat_settings.stop()
+    await meta_cache.flush()
+    await flush_registries()
+    shutdown_pools()
+    media_store.save()
     LOGGER("ShrutiMusic").info("Stopping Shruti Music Bot...🥺")
 
 if __name__ == "__main__":
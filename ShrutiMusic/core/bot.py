@@ -5,6 +5,7 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 import config
 from ..logging import LOGGER
+from .mediacache import media_cache, send_photo
 
 
 class Nand(Client):
@@ -27,6 +28,7 @@ class Nand(Client):
         self.id = get_me.id
         self.name = self.me.first_name + " " + (self.me.last_name or "")
         self.mention = self.me.mention
+        await media_cache.load(self.id)
 
         button = InlineKeyboardMarkup(
             [
@@ -41,7 +43,8 @@ class Nand(Client):
 
         if config.LOG_GROUP_ID:
             try:
-                await self.send_photo(
+                await send_photo(
+                    self.send_photo,
                     config.LOG_GROUP_ID,
                     photo=config.START_IMG_URL,
                     caption=f"<b>🎵 Bot Started Successfully</b>\n\n"
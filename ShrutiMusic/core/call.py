@@ -21,7 +21,7 @@
 
 
 import asyncio
-import os
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from typing import Union
 
@@ -39,11 +39,17 @@ from pytgcalls.types.input_stream.quality import HighQualityAudio, MediumQuality
 from pytgcalls.types.stream import StreamAudioEnded
 
 import config
-from ShrutiMusic import LOGGER, YouTube, app
+from ShrutiMusic import LOGGER, YouTube, app, userbot
+from ShrutiMusic.core.mediacache import send_photo
+from ShrutiMusic.core.scheduler import scheduler
+from ShrutiMusic.core.shard import coordinator
 from ShrutiMusic.misc import db
 from ShrutiMusic.utils.database import (
     add_active_chat,
     add_active_video_chat,
+    drop_assistant,
+    get_active_chats,
+    get_assistant_number,
     get_lang,
     get_loop,
     group_assistant,
@@ -54,9 +60,26 @@ from ShrutiMusic.utils.database import (
     set_loop,
 )
 from ShrutiMusic.utils.exceptions import AssistantErr
-from ShrutiMusic.utils.formatters import check_duration, seconds_to_min, speed_converter
+from ShrutiMusic.utils.formatters import (
+    seconds_to_min,
+    speed_converter,
+    time_to_seconds,
+)
 from ShrutiMusic.utils.inline.play import stream_markup
+from ShrutiMusic.utils.mediastore import media_store
 from ShrutiMusic.utils.stream.autoclear import auto_clean
+from ShrutiMusic.utils.stream.pcmcache import pcm_cache
+from ShrutiMusic.utils.stream.position import (
+    clear_position,
+    get_played,
+    pause_position,
+    resume_position,
+    start_position,
+)
+from ShrutiMusic.utils.stream.prefetch import cancel_prefetch, schedule_prefetch
+from ShrutiMusic.utils.stream.progressive import progressive
+from ShrutiMusic.utils.stream.simulcast import simulcast
+from ShrutiMusic.utils.stream.speed import speed_parameters, speed_variants
 from ShrutiMusic.utils.thumbnails import gen_thumb
 from strings import get_string
 
@@ -65,6 +88,12 @@ counter = {}
 
 
 async def _clear_(chat_id):
+    cancel_prefetch(chat_id)
+    for queued in db.get(chat_id) or []:
+        await auto_clean(queued)
+    media_store.clear_playing(chat_id)
+    simulcast.leave(chat_id)
+    clear_position(chat_id)
     db[chat_id] = []
     await remove_active_video_chat(chat_id)
     await remove_active_chat(chat_id)
@@ -72,64 +101,63 @@ async def _clear_(chat_id):
 
 class Call(PyTgCalls):
     def __init__(self):
-        self.userbot1 = Client(
-            name="NandAss1",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING1),
-        )
-        self.one = PyTgCalls(
-            self.userbot1,
-            cache_duration=100,
-        )
-        self.userbot2 = Client(
-            name="NandAss2",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING2),
-        )
-        self.two = PyTgCalls(
-            self.userbot2,
-            cache_duration=100,
-        )
-        self.userbot3 = Client(
-            name="NandAss3",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING3),
-        )
-        self.three = PyTgCalls(
-            self.userbot3,
-            cache_duration=100,
-        )
-        self.userbot4 = Client(
-            name="NandAss4",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING4),
-        )
-        self.four = PyTgCalls(
-            self.userbot4,
-            cache_duration=100,
-        )
-        self.userbot5 = Client(
-            name="NandAss5",
+        self.clients = {}
+        self.calls = {}
+        simulcast.fallback = self._decode_alone
+
+    async def add(self, number: int, session: str):
+        if config.SHARD_WORKERS:
+            link = coordinator.link_for(number)
+            await link.request(None, "add", number, session)
+            await coordinator.attach(link, number)
+            return self.calls[number]
+        client = Client(
+            name=f"NandAss{number}",
             api_id=config.API_ID,
             api_hash=config.API_HASH,
-            session_string=str(config.STRING5),
+            session_string=str(session),
         )
-        self.five = PyTgCalls(
-            self.userbot5,
+        call = PyTgCalls(
+            client,
             cache_duration=100,
         )
+        await call.start()
+        self.decorators(call)
+        self.clients[number] = client
+        self.calls[number] = call
+        return call
+
+    async def remove(self, number: int):
+        call = self.calls.get(number)
+        if not call:
+            return
+        for chat_id in list(await get_active_chats()):
+            if await get_assistant_number(chat_id) != number:
+                continue
+            try:
+                await _clear_(chat_id)
+                await call.leave_group_call(chat_id)
+            except:
+                pass
+        await drop_assistant(number)
+        self.calls.pop(number)
+        try:
+            if config.SHARD_WORKERS:
+                await coordinator.link_for(number).request(None, "remove", number)
+            else:
+                await self.clients.pop(number).stop()
+        except:
+            pass
 
     async def pause_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         await assistant.pause_stream(chat_id)
+        pause_position(chat_id)
 
     async def resume_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         await assistant.resume_stream(chat_id)
+        resume_position(chat_id)
 
     async def stop_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
@@ -140,31 +168,11 @@ class Call(PyTgCalls):
             pass
 
     async def stop_stream_force(self, chat_id: int):
-        try:
-            if config.STRING1:
-                await self.one.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING2:
-                await self.two.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING3:
-                await self.three.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING4:
-                await self.four.leave_group_call(chat_id)
-        except:
-            pass
-        try:
-            if config.STRING5:
-                await self.five.leave_group_call(chat_id)
-        except:
-            pass
+        for call in list(self.calls.values()):
+            try:
+                await call.leave_group_call(chat_id)
+            except:
+                pass
         try:
             await _clear_(chat_id)
         except:
@@ -172,60 +180,36 @@ class Call(PyTgCalls):
 
     async def speedup_stream(self, chat_id: int, file_path, speed, playing):
         assistant = await group_assistant(self, chat_id)
-        if str(speed) != str("1.0"):
-            base = os.path.basename(file_path)
-            chatdir = os.path.join(os.getcwd(), "playback", str(speed))
-            if not os.path.isdir(chatdir):
-                os.makedirs(chatdir)
-            out = os.path.join(chatdir, base)
-            if not os.path.isfile(out):
-                if str(speed) == str("0.5"):
-                    vs = 2.0
-                if str(speed) == str("0.75"):
-                    vs = 1.35
-                if str(speed) == str("1.5"):
-                    vs = 0.68
-                if str(speed) == str("2.0"):
-                    vs = 0.5
-                proc = await asyncio.create_subprocess_shell(
-                    cmd=(
-                        "ffmpeg "
-                        "-i "
-                        f"{file_path} "
-                        "-filter:v "
-                        f"setpts={vs}*PTS "
-                        "-filter:a "
-                        f"atempo={speed} "
-                        f"{out}"
-                    ),
-                    stdin=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                await proc.communicate()
-            else:
-                pass
+        speed = float(speed)
+        video = playing[0]["streamtype"] == "video"
+        # positions count in stream time, so map back to the source before re-timing
+        source = int(get_played(chat_id) * float(playing[0].get("speed") or 1.0))
+        base = int(playing[0].get("old_second") or playing[0]["seconds"])
+        _, con_seconds = speed_converter(source, speed)
+        variant = speed_variants.lookup(file_path, speed) if speed != 1.0 else None
+        if variant:
+            out = variant
+            parameters = f"-ss {int(con_seconds)}"
         else:
             out = file_path
-        dur = await asyncio.get_event_loop().run_in_executor(None, check_duration, out)
-        dur = int(dur)
-        played, con_seconds = speed_converter(playing[0]["played"], speed)
-        duration = seconds_to_min(dur)
+            parameters = speed_parameters(speed, source, video)
         stream = (
             AudioVideoPiped(
-                out,
+                progressive.source(out),
                 audio_parameters=HighQualityAudio(),
                 video_parameters=MediumQualityVideo(),
-                additional_ffmpeg_parameters=f"-ss {played} -to {duration}",
+                additional_ffmpeg_parameters=parameters,
             )
-            if playing[0]["streamtype"] == "video"
+            if video
             else AudioPiped(
-                out,
+                progressive.source(out),
                 audio_parameters=HighQualityAudio(),
-                additional_ffmpeg_parameters=f"-ss {played} -to {duration}",
+                additional_ffmpeg_parameters=parameters,
             )
         )
         if str(db[chat_id][0]["file"]) == str(file_path):
             await assistant.change_stream(chat_id, stream)
+            simulcast.leave(chat_id)
         else:
             raise AssistantErr("Umm")
         if str(db[chat_id][0]["file"]) == str(file_path):
@@ -233,19 +217,49 @@ class Call(PyTgCalls):
             if not exis:
                 db[chat_id][0]["old_dur"] = db[chat_id][0]["dur"]
                 db[chat_id][0]["old_second"] = db[chat_id][0]["seconds"]
-            db[chat_id][0]["played"] = con_seconds
-            db[chat_id][0]["dur"] = duration
-            db[chat_id][0]["seconds"] = dur
-            db[chat_id][0]["speed_path"] = out
+            start_position(chat_id, int(con_seconds))
+            db[chat_id][0]["dur"] = seconds_to_min(int(base / speed))
+            db[chat_id][0]["seconds"] = int(base / speed)
+            db[chat_id][0]["speed_path"] = variant
             db[chat_id][0]["speed"] = speed
+        if not media_store.is_fetching(file_path):
+            speed_variants.note(file_path, speed)
+
+    async def _audio_stream(self, chat_id: int, path, offset: int = 0):
+        try:
+            stream = await simulcast.stream(chat_id, path, offset)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Shared decode unavailable, decoding alone: {e}")
+            simulcast.leave(chat_id)
+            stream = None
+        return stream or self._private_stream(path, offset)
+
+    @staticmethod
+    def _private_stream(path, offset: int = 0):
+        return AudioPiped(
+            progressive.source(path),
+            audio_parameters=HighQualityAudio(),
+            additional_ffmpeg_parameters=f"-ss {offset}" if offset else "",
+        )
+
+    async def _decode_alone(self, chat_id: int, path, offset: int):
+        # a shared decode fell behind, carry on from the same spot on our own
+        try:
+            assistant = await group_assistant(self, chat_id)
+            await assistant.change_stream(chat_id, self._private_stream(path, offset))
+        except Exception as e:
+            LOGGER(__name__).warning(f"Could not move {chat_id} to its own decode: {e}")
 
     async def force_stop_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         try:
             check = db.get(chat_id)
-            check.pop(0)
+            await auto_clean(check.pop(0))
         except:
             pass
+        media_store.clear_playing(chat_id)
+        simulcast.leave(chat_id)
+        clear_position(chat_id)
         await remove_active_video_chat(chat_id)
         await remove_active_chat(chat_id)
         try:
@@ -259,38 +273,57 @@ class Call(PyTgCalls):
         link: str,
         video: Union[bool, str] = None,
         image: Union[bool, str] = None,
-    ):
+        track=None,
+    ) -> bool:
         assistant = await group_assistant(self, chat_id)
-        if video:
-            stream = AudioVideoPiped(
-                link,
-                audio_parameters=HighQualityAudio(),
-                video_parameters=MediumQualityVideo(),
-            )
-        else:
-            stream = AudioPiped(link, audio_parameters=HighQualityAudio())
-        await assistant.change_stream(
-            chat_id,
-            stream,
-        )
+
+        async def build():
+            if video:
+                simulcast.leave(chat_id)
+                return AudioVideoPiped(
+                    link,
+                    audio_parameters=HighQualityAudio(),
+                    video_parameters=MediumQualityVideo(),
+                )
+            return await self._audio_stream(chat_id, link)
+
+        return await self._commit(assistant, chat_id, track, build, link)
 
     async def seek_stream(self, chat_id, file_path, to_seek, duration, mode):
         assistant = await group_assistant(self, chat_id)
-        stream = (
-            AudioVideoPiped(
-                file_path,
-                audio_parameters=HighQualityAudio(),
-                video_parameters=MediumQualityVideo(),
-                additional_ffmpeg_parameters=f"-ss {to_seek} -to {duration}",
+        parameters = f"-ss {to_seek} -to {duration}"
+        playing = db.get(chat_id)
+        speed = float(playing[0].get("speed") or 1.0) if playing else 1.0
+        if speed != 1.0 and file_path != playing[0].get("speed_path"):
+            parameters = speed_parameters(
+                speed, int(time_to_seconds(to_seek) * speed), mode == "video"
             )
-            if mode == "video"
-            else AudioPiped(
-                file_path,
-                audio_parameters=HighQualityAudio(),
-                additional_ffmpeg_parameters=f"-ss {to_seek} -to {duration}",
+        # seeking a converted copy is a byte offset, no decode from the start
+        converted = mode != "video" and speed == 1.0 and pcm_cache.lookup(file_path)
+        if converted:
+            stream = await self._audio_stream(
+                chat_id, file_path, time_to_seconds(to_seek)
+            )
+        else:
+            stream = (
+                AudioVideoPiped(
+                    progressive.source(file_path),
+                    audio_parameters=HighQualityAudio(),
+                    video_parameters=MediumQualityVideo(),
+                    additional_ffmpeg_parameters=parameters,
+                )
+                if mode == "video"
+                else AudioPiped(
+                    progressive.source(file_path),
+                    audio_parameters=HighQualityAudio(),
+                    additional_ffmpeg_parameters=parameters,
+                )
             )
-        )
         await assistant.change_stream(chat_id, stream)
+        if not converted:
+            simulcast.leave(chat_id)
+        media_store.set_playing(chat_id, file_path)
+        start_position(chat_id, time_to_seconds(to_seek))
 
     async def stream_call(self, link):
         assistant = await group_assistant(self, config.LOG_GROUP_ID)
@@ -309,26 +342,21 @@ class Call(PyTgCalls):
         link,
         video: Union[bool, str] = None,
         image: Union[bool, str] = None,
+        offset: int = 0,
     ):
         assistant = await group_assistant(self, chat_id)
         language = await get_lang(chat_id)
         _ = get_string(language)
+        seek = f"-ss {offset}" if offset else ""
         if video:
             stream = AudioVideoPiped(
-                link,
+                progressive.source(link),
                 audio_parameters=HighQualityAudio(),
                 video_parameters=MediumQualityVideo(),
+                additional_ffmpeg_parameters=seek,
             )
         else:
-            stream = (
-                AudioVideoPiped(
-                    link,
-                    audio_parameters=HighQualityAudio(),
-                    video_parameters=MediumQualityVideo(),
-                )
-                if video
-                else AudioPiped(link, audio_parameters=HighQualityAudio())
-            )
+            stream = await self._audio_stream(chat_id, link, offset)
         try:
             await assistant.join_group_call(
                 chat_id,
@@ -338,9 +366,13 @@ class Call(PyTgCalls):
         except NoActiveGroupCall:
             raise AssistantErr(_["call_8"])
         except AlreadyJoinedError:
+            scheduler.record_error(await get_assistant_number(chat_id))
             raise AssistantErr(_["call_9"])
         except TelegramServerError:
+            scheduler.record_error(await get_assistant_number(chat_id))
             raise AssistantErr(_["call_10"])
+        media_store.set_playing(chat_id, link)
+        start_position(chat_id, offset)
         await add_active_chat(chat_id)
         await music_on(chat_id)
         if video:
@@ -351,7 +383,27 @@ class Call(PyTgCalls):
             if users == 1:
                 autoend[chat_id] = datetime.now() + timedelta(minutes=1)
 
+    async def _commit(self, client, chat_id, track, build, path=None) -> bool:
+        # a skip or stream end may have moved the queue while this one was
+        # downloading, only the track still at the head gets to play
+        async with db.lock(chat_id) if track else nullcontext():
+            if track and not db.is_current(chat_id, track):
+                return False
+            await client.change_stream(chat_id, await build())
+            if path:
+                media_store.set_playing(chat_id, path)
+            start_position(chat_id)
+            return True
+
     async def change_stream(self, client, chat_id):
+        # the lock only covers moving the queue and committing the new stream,
+        # downloads, thumbnails and messages run outside it
+        async with db.lock(chat_id):
+            track = await self._advance(client, chat_id)
+        if track:
+            await self._play_next(client, chat_id, track)
+
+    async def _advance(self, client, chat_id):
         check = db.get(chat_id)
         popped = None
         loop = await get_loop(chat_id)
@@ -364,256 +416,245 @@ class Call(PyTgCalls):
             await auto_clean(popped)
             if not check:
                 await _clear_(chat_id)
-                return await client.leave_group_call(chat_id)
+                await client.leave_group_call(chat_id)
+                return None
         except:
             try:
                 await _clear_(chat_id)
-                return await client.leave_group_call(chat_id)
+                await client.leave_group_call(chat_id)
             except:
-                return
-        else:
-            queued = check[0]["file"]
-            language = await get_lang(chat_id)
-            _ = get_string(language)
-            title = (check[0]["title"]).title()
-            user = check[0]["by"]
-            original_chat_id = check[0]["chat_id"]
-            streamtype = check[0]["streamtype"]
-            videoid = check[0]["vidid"]
-            db[chat_id][0]["played"] = 0
-            exis = (check[0]).get("old_dur")
-            if exis:
-                db[chat_id][0]["dur"] = exis
-                db[chat_id][0]["seconds"] = check[0]["old_second"]
-                db[chat_id][0]["speed_path"] = None
-                db[chat_id][0]["speed"] = 1.0
-            video = True if str(streamtype) == "video" else False
-            if "live_" in queued:
-                n, link = await YouTube.video(videoid, True)
-                if n == 0:
-                    return await app.send_message(
-                        original_chat_id,
-                        text=_["call_6"],
-                    )
+                pass
+            return None
+        schedule_prefetch(chat_id)
+        simulcast.leave(chat_id)
+        track = check[0]
+        if track.get("old_dur"):
+            track["dur"] = track["old_dur"]
+            track["seconds"] = track["old_second"]
+            track["speed_path"] = None
+            track["speed"] = 1.0
+        return track
+
+    async def _play_next(self, client, chat_id, track):
+        queued = track["file"]
+        language = await get_lang(chat_id)
+        _ = get_string(language)
+        title = (track["title"]).title()
+        user = track["by"]
+        original_chat_id = track["chat_id"]
+        streamtype = track["streamtype"]
+        videoid = track["vidid"]
+        video = True if str(streamtype) == "video" else False
+        if "live_" in queued:
+            n, link = await YouTube.video(videoid, True)
+            if n == 0:
+                return await app.send_message(
+                    original_chat_id,
+                    text=_["call_6"],
+                )
+
+            async def build():
                 if video:
-                    stream = AudioVideoPiped(
+                    return AudioVideoPiped(
                         link,
                         audio_parameters=HighQualityAudio(),
                         video_parameters=MediumQualityVideo(),
                     )
-                else:
-                    stream = AudioPiped(
-                        link,
+                return AudioPiped(
+                    link,
+                    audio_parameters=HighQualityAudio(),
+                )
+
+            try:
+                if not await self._commit(client, chat_id, track, build):
+                    return
+            except Exception:
+                return await app.send_message(
+                    original_chat_id,
+                    text=_["call_6"],
+                )
+            img = await gen_thumb(videoid)
+            button = stream_markup(_, chat_id)
+            run = await send_photo(
+                app.send_photo,
+                chat_id=original_chat_id,
+                photo=img,
+                caption=_["stream_1"].format(
+                    f"https://t.me/{app.username}?start=info_{videoid}",
+                    title[:23],
+                    track["dur"],
+                    user,
+                ),
+                reply_markup=InlineKeyboardMarkup(button),
+            )
+            track["mystic"] = run
+            track["markup"] = "tg"
+        elif "vid_" in queued:
+            mystic = await app.send_message(original_chat_id, _["call_7"])
+            try:
+                file_path, direct = await YouTube.download(
+                    videoid,
+                    mystic,
+                    videoid=True,
+                    video=True if str(streamtype) == "video" else False,
+                    progressive=True,
+                )
+            except:
+                return await mystic.edit_text(
+                    _["call_6"], disable_web_page_preview=True
+                )
+
+            async def build():
+                if video:
+                    return AudioVideoPiped(
+                        progressive.source(file_path),
                         audio_parameters=HighQualityAudio(),
+                        video_parameters=MediumQualityVideo(),
                     )
-                try:
-                    await client.change_stream(chat_id, stream)
-                except Exception:
-                    return await app.send_message(
-                        original_chat_id,
-                        text=_["call_6"],
-                    )
-                img = await gen_thumb(videoid)
-                button = stream_markup(_, chat_id)
-                run = await app.send_photo(
-                    chat_id=original_chat_id,
-                    photo=img,
-                    caption=_["stream_1"].format(
-                        f"https://t.me/{app.username}?start=info_{videoid}",
-                        title[:23],
-                        check[0]["dur"],
-                        user,
-                    ),
-                    reply_markup=InlineKeyboardMarkup(button),
+                return await self._audio_stream(chat_id, file_path)
+
+            try:
+                if not await self._commit(client, chat_id, track, build, file_path):
+                    return await mystic.delete()
+            except:
+                return await app.send_message(
+                    original_chat_id,
+                    text=_["call_6"],
                 )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "tg"
-            elif "vid_" in queued:
-                mystic = await app.send_message(original_chat_id, _["call_7"])
-                try:
-                    file_path, direct = await YouTube.download(
+            img = await gen_thumb(videoid)
+            button = stream_markup(_, chat_id)
+            await mystic.delete()
+            run = await send_photo(
+                app.send_photo,
+                chat_id=original_chat_id,
+                photo=img,
+                caption=_["stream_1"].format(
+                    f"https://t.me/{app.username}?start=info_{videoid}",
+                    title[:23],
+                    track["dur"],
+                    user,
+                ),
+                reply_markup=InlineKeyboardMarkup(button),
+            )
+            track["mystic"] = run
+            track["markup"] = "stream"
+        elif "index_" in queued:
+
+            async def build():
+                if str(streamtype) == "video":
+                    return AudioVideoPiped(
                         videoid,
-                        mystic,
-                        videoid=True,
-                        video=True if str(streamtype) == "video" else False,
-                    )
-                except:
-                    return await mystic.edit_text(
-                        _["call_6"], disable_web_page_preview=True
-                    )
-                if video:
-                    stream = AudioVideoPiped(
-                        file_path,
                         audio_parameters=HighQualityAudio(),
                         video_parameters=MediumQualityVideo(),
                     )
-                else:
-                    stream = AudioPiped(
-                        file_path,
+                return AudioPiped(videoid, audio_parameters=HighQualityAudio())
+
+            try:
+                if not await self._commit(client, chat_id, track, build):
+                    return
+            except:
+                return await app.send_message(
+                    original_chat_id,
+                    text=_["call_6"],
+                )
+            button = stream_markup(_, chat_id)
+            run = await send_photo(
+                app.send_photo,
+                chat_id=original_chat_id,
+                photo=config.STREAM_IMG_URL,
+                caption=_["stream_2"].format(user),
+                reply_markup=InlineKeyboardMarkup(button),
+            )
+            track["mystic"] = run
+            track["markup"] = "tg"
+        else:
+
+            async def build():
+                if video:
+                    return AudioVideoPiped(
+                        queued,
                         audio_parameters=HighQualityAudio(),
+                        video_parameters=MediumQualityVideo(),
                     )
-                try:
-                    await client.change_stream(chat_id, stream)
-                except:
-                    return await app.send_message(
-                        original_chat_id,
-                        text=_["call_6"],
-                    )
-                img = await gen_thumb(videoid)
+                return await self._audio_stream(chat_id, queued)
+
+            try:
+                if not await self._commit(client, chat_id, track, build, queued):
+                    return
+            except:
+                return await app.send_message(
+                    original_chat_id,
+                    text=_["call_6"],
+                )
+            if videoid == "telegram":
                 button = stream_markup(_, chat_id)
-                await mystic.delete()
-                run = await app.send_photo(
+                run = await send_photo(
+                    app.send_photo,
                     chat_id=original_chat_id,
-                    photo=img,
+                    photo=config.TELEGRAM_AUDIO_URL
+                    if str(streamtype) == "audio"
+                    else config.TELEGRAM_VIDEO_URL,
                     caption=_["stream_1"].format(
-                        f"https://t.me/{app.username}?start=info_{videoid}",
-                        title[:23],
-                        check[0]["dur"],
-                        user,
+                        config.SUPPORT_GROUP, title[:23], track["dur"], user
                     ),
                     reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "stream"
-            elif "index_" in queued:
-                stream = (
-                    AudioVideoPiped(
-                        videoid,
-                        audio_parameters=HighQualityAudio(),
-                        video_parameters=MediumQualityVideo(),
-                    )
-                    if str(streamtype) == "video"
-                    else AudioPiped(videoid, audio_parameters=HighQualityAudio())
-                )
-                try:
-                    await client.change_stream(chat_id, stream)
-                except:
-                    return await app.send_message(
-                        original_chat_id,
-                        text=_["call_6"],
-                    )
+                track["mystic"] = run
+                track["markup"] = "tg"
+            elif videoid == "soundcloud":
                 button = stream_markup(_, chat_id)
-                run = await app.send_photo(
+                run = await send_photo(
+                    app.send_photo,
                     chat_id=original_chat_id,
-                    photo=config.STREAM_IMG_URL,
-                    caption=_["stream_2"].format(user),
+                    photo=config.SOUNCLOUD_IMG_URL,
+                    caption=_["stream_1"].format(
+                        config.SUPPORT_GROUP, title[:23], track["dur"], user
+                    ),
                     reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "tg"
+                track["mystic"] = run
+                track["markup"] = "tg"
             else:
-                if video:
-                    stream = AudioVideoPiped(
-                        queued,
-                        audio_parameters=HighQualityAudio(),
-                        video_parameters=MediumQualityVideo(),
-                    )
-                else:
-                    stream = AudioPiped(
-                        queued,
-                        audio_parameters=HighQualityAudio(),
-                    )
-                try:
-                    await client.change_stream(chat_id, stream)
-                except:
-                    return await app.send_message(
-                        original_chat_id,
-                        text=_["call_6"],
-                    )
-                if videoid == "telegram":
-                    button = stream_markup(_, chat_id)
-                    run = await app.send_photo(
-                        chat_id=original_chat_id,
-                        photo=config.TELEGRAM_AUDIO_URL
-                        if str(streamtype) == "audio"
-                        else config.TELEGRAM_VIDEO_URL,
-                        caption=_["stream_1"].format(
-                            config.SUPPORT_GROUP, title[:23], check[0]["dur"], user
-                        ),
-                        reply_markup=InlineKeyboardMarkup(button),
-                    )
-                    db[chat_id][0]["mystic"] = run
-                    db[chat_id][0]["markup"] = "tg"
-                elif videoid == "soundcloud":
-                    button = stream_markup(_, chat_id)
-                    run = await app.send_photo(
-                        chat_id=original_chat_id,
-                        photo=config.SOUNCLOUD_IMG_URL,
-                        caption=_["stream_1"].format(
-                            config.SUPPORT_GROUP, title[:23], check[0]["dur"], user
-                        ),
-                        reply_markup=InlineKeyboardMarkup(button),
-                    )
-                    db[chat_id][0]["mystic"] = run
-                    db[chat_id][0]["markup"] = "tg"
-                else:
-                    img = await gen_thumb(videoid)
-                    button = stream_markup(_, chat_id)
-                    run = await app.send_photo(
-                        chat_id=original_chat_id,
-                        photo=img,
-                        caption=_["stream_1"].format(
-                            f"https://t.me/{app.username}?start=info_{videoid}",
-                            title[:23],
-                            check[0]["dur"],
-                            user,
-                        ),
-                        reply_markup=InlineKeyboardMarkup(button),
-                    )
-                    db[chat_id][0]["mystic"] = run
-                    db[chat_id][0]["markup"] = "stream"
+                img = await gen_thumb(videoid)
+                button = stream_markup(_, chat_id)
+                run = await send_photo(
+                    app.send_photo,
+                    chat_id=original_chat_id,
+                    photo=img,
+                    caption=_["stream_1"].format(
+                        f"https://t.me/{app.username}?start=info_{videoid}",
+                        title[:23],
+                        track["dur"],
+                        user,
+                    ),
+                    reply_markup=InlineKeyboardMarkup(button),
+                )
+                track["mystic"] = run
+                track["markup"] = "stream"
 
     async def ping(self):
-        pings = []
-        if config.STRING1:
-            pings.append(await self.one.ping)
-        if config.STRING2:
-            pings.append(await self.two.ping)
-        if config.STRING3:
-            pings.append(await self.three.ping)
-        if config.STRING4:
-            pings.append(await self.four.ping)
-        if config.STRING5:
-            pings.append(await self.five.ping)
+        pings = await asyncio.gather(*(call.ping for call in self.calls.values()))
         return str(round(sum(pings) / len(pings), 3))
 
     async def start(self):
         LOGGER(__name__).info("Starting PyTgCalls Client...\n")
-        if config.STRING1:
-            await self.one.start()
-        if config.STRING2:
-            await self.two.start()
-        if config.STRING3:
-            await self.three.start()
-        if config.STRING4:
-            await self.four.start()
-        if config.STRING5:
-            await self.five.start()
-
-    async def decorators(self):
-        @self.one.on_kicked()
-        @self.two.on_kicked()
-        @self.three.on_kicked()
-        @self.four.on_kicked()
-        @self.five.on_kicked()
-        @self.one.on_closed_voice_chat()
-        @self.two.on_closed_voice_chat()
-        @self.three.on_closed_voice_chat()
-        @self.four.on_closed_voice_chat()
-        @self.five.on_closed_voice_chat()
-        @self.one.on_left()
-        @self.two.on_left()
-        @self.three.on_left()
-        @self.four.on_left()
-        @self.five.on_left()
+        if config.SHARD_WORKERS:
+            return await coordinator.start(self, list(userbot.sessions))
+        await asyncio.gather(
+            *(
+                self.add(number, session)
+                for number, session in userbot.sessions.items()
+            )
+        )
+
+    def decorators(self, call):
+        @call.on_kicked()
+        @call.on_closed_voice_chat()
+        @call.on_left()
         async def stream_services_handler(_, chat_id: int):
             await self.stop_stream(chat_id)
 
-        @self.one.on_stream_end()
-        @self.two.on_stream_end()
-        @self.three.on_stream_end()
-        @self.four.on_stream_end()
-        @self.five.on_stream_end()
+        @call.on_stream_end()
         async def stream_end_handler1(client, update: Update):
             if not isinstance(update, StreamAudioEnded):
                 return
@@ -0,0 +1,170 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import config
+
+from ..logging import LOGGER
+
+
+class WorkerPool:
+    def __init__(self, name: str, factory, workers: int, timeout: int):
+        self.name = name
+        self.workers = workers
+        self.timeout = timeout
+        self._factory = factory
+        self._executor = None
+        self._running = {}
+        self._retired = set()
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+
+    @property
+    def executor(self):
+        if not self._executor:
+            self._executor = self._factory(self.workers)
+        return self._executor
+
+    async def run(self, func, *args, timeout: int = None, **kwargs):
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        self.pending += 1
+        self._running[executor] = self._running.get(executor, 0) + 1
+        try:
+            future = loop.run_in_executor(executor, partial(func, *args, **kwargs))
+            result = await asyncio.wait_for(future, timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            LOGGER(__name__).warning(f"{self.name} task {func.__name__} timed out.")
+            self._retire(executor)
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+            return result
+        finally:
+            self.pending -= 1
+            self._running[executor] -= 1
+            if not self._running[executor]:
+                self._running.pop(executor)
+                if executor in self._retired:
+                    self._kill(executor)
+
+    def _retire(self, executor):
+        # a hung process keeps its worker forever, so new work moves to a fresh
+        # pool and the old one is killed once its remaining tasks are done
+        if not isinstance(executor, ProcessPoolExecutor):
+            return
+        if self._executor is executor:
+            self._executor = None
+        self._retired.add(executor)
+
+    def _kill(self, executor):
+        self._retired.discard(executor)
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queued": max(self.pending - self.workers, 0),
+            "running": min(self.pending, self.workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+        }
+
+    def shutdown(self):
+        for executor in list(self._retired):
+            self._kill(executor)
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _process_factory(workers: int):
+    # Forking a threaded process can deadlock, so workers start clean and only
+    # import the worker modules, which stay outside the bot package.
+    try:
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["pool_worker", "card_render"])
+    except ValueError:
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def _thread_factory(workers: int):
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ShrutiWorker")
+
+
+process_pool = WorkerPool(
+    "process", _process_factory, config.EXTRACT_WORKERS, config.EXTRACT_TIMEOUT
+)
+render_pool = WorkerPool(
+    "render", _process_factory, config.RENDER_WORKERS, config.RENDER_TIMEOUT
+)
+thread_pool = WorkerPool(
+    "thread", _thread_factory, config.THREAD_WORKERS, config.THREAD_TIMEOUT
+)
+
+
+async def run_in_process(func, *args, timeout: int = None, **kwargs):
+    return await process_pool.run(func, *args, timeout=timeout, **kwargs)
+
+
+async def run_render(func, *args, timeout: int = None, **kwargs):
+    return await render_pool.run(func, *args, timeout=timeout, **kwargs)
+
+
+async def run_in_thread(func, *args, timeout: int = None, **kwargs):
+    return await thread_pool.run(func, *args, timeout=timeout, **kwargs)
+
+
+def executor_stats() -> dict:
+    return {pool.name: pool.stats() for pool in (process_pool, render_pool, thread_pool)}
+
+
+def shutdown_pools():
+    process_pool.shutdown()
+    render_pool.shutdown()
+    thread_pool.shutdown()
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
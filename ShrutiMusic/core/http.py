@@ -0,0 +1,113 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import asyncio
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import aiohttp
+
+import config
+
+from ..logging import LOGGER
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+IDEMPOTENT = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+class HttpClient:
+    def __init__(self):
+        self.session = None
+        self._hosts = {}
+
+    async def start(self):
+        if self.session and not self.session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=config.HTTP_POOL_LIMIT,
+            limit_per_host=config.HTTP_HOST_LIMIT,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+        )
+        self.session = aiohttp.ClientSession(connector=connector)
+        LOGGER(__name__).info("HTTP Client Started.")
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def _limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        limit = self._hosts.get(host)
+        if not limit:
+            limit = self._hosts[host] = asyncio.Semaphore(config.HTTP_HOST_LIMIT)
+        return limit
+
+    @asynccontextmanager
+    async def request(
+        self, method: str, url: str, retries: int = None, retry: bool = None, **kwargs
+    ):
+        await self.start()
+        retries = config.HTTP_RETRIES if retries is None else retries
+        # a retried POST may be applied twice, so callers have to opt in
+        if not (method.upper() in IDEMPOTENT if retry is None else retry):
+            retries = 0
+        # the slot only covers getting the headers, a streamed body is bounded
+        # by the connector's per-host limit instead
+        async with self._limit(url):
+            for attempt in range(retries + 1):
+                try:
+                    response = await self.session.request(method, url, **kwargs)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if attempt >= retries:
+                        raise
+                else:
+                    if response.status not in RETRY_STATUSES or attempt >= retries:
+                        break
+                    response.release()
+                await asyncio.sleep(config.HTTP_BACKOFF * (2**attempt))
+        try:
+            yield response
+        finally:
+            response.release()
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+http = HttpClient()
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -0,0 +1,167 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+from pyrogram.errors import FileIdInvalid, FileReferenceExpired, MediaEmpty
+
+import config
+
+from ..logging import LOGGER
+from .executor import run_in_thread
+from .mongo import mongodb
+
+mediadb = mongodb.mediacache
+
+STALE = (FileIdInvalid, FileReferenceExpired, MediaEmpty, ValueError)
+MEDIA_TYPES = ("photo", "video", "animation", "audio", "document")
+
+
+def _digest(path: str) -> str:
+    sha = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class MediaCache:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.bot_id = None
+        self._ids = OrderedDict()
+        self._hashes = {}
+
+    async def key(self, media):
+        if not isinstance(media, str):
+            return None
+        if media.startswith(("http://", "https://")):
+            return media
+        try:
+            stat = os.stat(media)
+        except OSError:
+            # neither a url nor a local file, most likely already a file_id
+            return None
+        stamp = (media, stat.st_size, stat.st_mtime_ns)
+        digest = self._hashes.get(stamp)
+        if not digest:
+            digest = await run_in_thread(_digest, media)
+            if len(self._hashes) >= self.maxsize:
+                self._hashes.clear()
+            self._hashes[stamp] = digest
+        return f"sha1:{digest}"
+
+    def get(self, key):
+        file_id = self._ids.get(key)
+        if file_id:
+            self._ids.move_to_end(key)
+        return file_id
+
+    def put(self, key, message):
+        file_id = None
+        for kind in MEDIA_TYPES:
+            media = getattr(message, kind, None)
+            if media:
+                file_id = media.file_id
+                break
+        if not key or not file_id or self._ids.get(key) == file_id:
+            return
+        self._ids[key] = file_id
+        self._ids.move_to_end(key)
+        while len(self._ids) > self.maxsize:
+            self._ids.popitem(last=False)
+        if self.bot_id:
+            asyncio.create_task(self._persist(key, file_id))
+
+    def drop(self, key):
+        self._ids.pop(key, None)
+        if self.bot_id:
+            asyncio.create_task(mediadb.delete_one({"_id": f"{self.bot_id}:{key}"}))
+
+    async def _persist(self, key, file_id):
+        try:
+            await mediadb.update_one(
+                {"_id": f"{self.bot_id}:{key}"},
+                {"$set": {"file_id": file_id, "bot": self.bot_id, "ts": time.time()}},
+                upsert=True,
+            )
+        except Exception:
+            pass
+
+    async def load(self, bot_id: int):
+        self.bot_id = bot_id
+        prefix = f"{bot_id}:"
+        try:
+            cursor = (
+                mediadb.find({"bot": bot_id}).sort("ts", -1).limit(self.maxsize)
+            )
+            async for doc in cursor:
+                self._ids[doc["_id"][len(prefix) :]] = doc["file_id"]
+                self._ids.move_to_end(doc["_id"][len(prefix) :], last=False)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Failed to load media cache: {e}")
+        LOGGER(__name__).info(f"Media Cache Loaded ({len(self._ids)} files).")
+
+    async def send(self, method, args, media, swap):
+        key = await self.key(media)
+        file_id = self.get(key) if key else None
+        if file_id:
+            try:
+                return await method(*args, **swap(file_id))
+            except STALE:
+                self.drop(key)
+        message = await method(*args, **swap(media))
+        self.put(key, message)
+        return message
+
+
+media_cache = MediaCache(config.MEDIA_CACHE_SIZE)
+
+
+async def send_photo(method, *args, photo, **kwargs):
+    return await media_cache.send(
+        method, args, photo, lambda value: {**kwargs, "photo": value}
+    )
+
+
+async def edit_media(method, *args, media, **kwargs):
+    def swap(value):
+        media.media = value
+        return {**kwargs, "media": media}
+
+    return await media_cache.send(method, args, media.media, swap)
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
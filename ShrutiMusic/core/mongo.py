@@ -20,15 +20,21 @@
 # Email: badboy809075@gmail.com
 
 
+import asyncio
+
 from motor.motor_asyncio import AsyncIOMotorClient
 
-from config import MONGO_DB_URI
+from config import MONGO_DB_URI, MONGO_DEBUG, MONGO_SLOW_MS
 
 from ..logging import LOGGER
+from .schema import INDEXES, QueryAudit, index_models
 
 LOGGER(__name__).info("Connecting to your Mongo Database...")
 try:
-    _mongo_async_ = AsyncIOMotorClient(MONGO_DB_URI)
+    _mongo_async_ = AsyncIOMotorClient(
+        MONGO_DB_URI,
+        event_listeners=[QueryAudit(MONGO_SLOW_MS)] if MONGO_DEBUG else [],
+    )
     mongodb = _mongo_async_.Yukki
     LOGGER(__name__).info("Connected to your Mongo Database.")
 except:
@@ -36,6 +42,20 @@ except:
     exit()
 
 
+async def _ensure(name: str) -> bool:
+    try:
+        await mongodb[name].create_indexes(index_models(name))
+        return True
+    except Exception as e:
+        LOGGER(__name__).warning(f"Failed to index {name}: {e}")
+        return False
+
+
+async def ensure_indexes():
+    done = await asyncio.gather(*(_ensure(name) for name in INDEXES))
+    LOGGER(__name__).info(f"Ensured indexes on {sum(done)} of {len(done)} collections.")
+
+
 # ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
 
 # ===========================================
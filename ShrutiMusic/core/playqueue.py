@@ -0,0 +1,144 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import asyncio
+import random
+from collections import deque
+from itertools import islice
+
+
+class Track:
+    __slots__ = (
+        "title",
+        "dur",
+        "streamtype",
+        "by",
+        "user_id",
+        "chat_id",
+        "file",
+        "vidid",
+        "seconds",
+        "mystic",
+        "markup",
+        "old_dur",
+        "old_second",
+        "speed_path",
+        "speed",
+    )
+
+    def __init__(self, **fields):
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+    # Dict-style access keeps the old queue-entry call sites working.
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def __contains__(self, key) -> bool:
+        return hasattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, key) for key in self.__slots__ if hasattr(self, key)}
+
+
+class PlaybackQueue(deque):
+    __slots__ = ("chat_id",)
+
+    def __init__(self, chat_id: int, tracks=()):
+        super().__init__(tracks)
+        self.chat_id = chat_id
+
+    @property
+    def current(self):
+        return self[0] if self else None
+
+    def pop(self, index: int = -1):
+        if index == 0:
+            return self.popleft()
+        if index == -1:
+            return super().pop()
+        track = self[index]
+        del self[index]
+        return track
+
+    def upcoming(self, count: int, start: int = 1) -> list:
+        return list(islice(self, start, start + count))
+
+    def skip(self, count: int = 1) -> list:
+        return [self.popleft() for _ in range(min(count, len(self)))]
+
+    def move(self, src: int, dst: int):
+        track = self[src]
+        del self[src]
+        self.insert(dst, track)
+
+    def shuffle(self):
+        if len(self) < 3:
+            return
+        rest = list(islice(self, 1, None))
+        random.shuffle(rest)
+        head = self.popleft()
+        self.clear()
+        self.append(head)
+        self.extend(rest)
+
+
+class QueueStore(dict):
+    def __init__(self):
+        super().__init__()
+        self._locks = {}
+
+    def __setitem__(self, chat_id, tracks):
+        if not isinstance(tracks, PlaybackQueue):
+            tracks = PlaybackQueue(chat_id, tracks)
+        super().__setitem__(chat_id, tracks)
+
+    def lock(self, chat_id: int) -> asyncio.Lock:
+        lock = self._locks.get(chat_id)
+        if not lock:
+            lock = self._locks[chat_id] = asyncio.Lock()
+        return lock
+
+    def is_current(self, chat_id: int, track) -> bool:
+        tracks = self.get(chat_id)
+        return bool(tracks) and tracks[0] is track
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
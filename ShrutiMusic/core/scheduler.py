@@ -0,0 +1,123 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import time
+from collections import deque
+
+import config
+
+
+class AssistantScheduler:
+    def __init__(self, video_weight: int, window: int, limit: int, margin: int):
+        self.video_weight = video_weight
+        self.window = window
+        self.limit = limit
+        self.margin = margin
+        self._errors = {}
+
+    def record_error(self, number):
+        if number is None:
+            return
+        self._errors.setdefault(int(number), deque()).append(time.monotonic())
+
+    def _recent_errors(self, number: int) -> int:
+        errors = self._errors.get(number)
+        if not errors:
+            return 0
+        cutoff = time.monotonic() - self.window
+        while errors and errors[0] < cutoff:
+            errors.popleft()
+        return len(errors)
+
+    def loads(self) -> dict:
+        from ShrutiMusic.core.userbot import assistants
+        from ShrutiMusic.utils.database.database import (
+            active,
+            activevideo,
+            assistantdict,
+        )
+
+        loads = {
+            number: {"calls": 0, "video": 0, "cost": 0, "chats": 0}
+            for number in assistants
+        }
+        for number in assistantdict.values():
+            if number in loads:
+                loads[number]["chats"] += 1
+        for chat_id in active:
+            load = loads.get(assistantdict.get(chat_id))
+            if not load:
+                continue
+            load["calls"] += 1
+            if chat_id in activevideo:
+                load["video"] += 1
+                load["cost"] += self.video_weight
+            else:
+                load["cost"] += 1
+        for number, load in loads.items():
+            load["errors"] = self._recent_errors(number)
+            load["healthy"] = load["errors"] < self.limit
+        return loads
+
+    def pick(self) -> int:
+        loads = self.loads()
+        healthy = [number for number, load in loads.items() if load["healthy"]]
+        return min(
+            healthy or loads,
+            key=lambda number: (
+                loads[number]["cost"],
+                loads[number]["errors"],
+                loads[number]["chats"],
+                number,
+            ),
+        )
+
+    def should_move(self, number) -> bool:
+        loads = self.loads()
+        load = loads.get(number)
+        if not load:
+            return True
+        healthy = [other for other in loads.values() if other["healthy"]]
+        if not healthy:
+            return False
+        if not load["healthy"]:
+            return True
+        return load["cost"] - min(other["cost"] for other in healthy) >= self.margin
+
+
+scheduler = AssistantScheduler(
+    config.ASSISTANT_VIDEO_WEIGHT,
+    config.ASSISTANT_ERROR_WINDOW,
+    config.ASSISTANT_ERROR_LIMIT,
+    config.ASSISTANT_REBALANCE_MARGIN,
+)
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -0,0 +1,137 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.monitoring import CommandListener
+
+from ShrutiMusic.logging import LOGGER
+
+# collection -> indexes every lookup path relies on
+INDEXES = {
+    "adminauth": [[("chat_id", ASCENDING)]],
+    "assistants": [[("chat_id", ASCENDING)]],
+    "authuser": [[("chat_id", ASCENDING)]],
+    "autoend": [[("chat_id", ASCENDING)]],
+    "autoleave": [[("chat_id", ASCENDING)]],
+    "blacklistChat": [[("chat_id", ASCENDING)]],
+    "blockedusers": [[("user_id", ASCENDING)]],
+    "broadcasts": [[("done", ASCENDING)]],
+    "Champuvideocalls": [[("chat_id", ASCENDING)]],
+    "chats": [[("chat_id", ASCENDING)]],
+    "chatstats": [[("chat_id", ASCENDING)]],
+    "cplaymode": [[("chat_id", ASCENDING)]],
+    "filters": [[("chat_id", ASCENDING)]],
+    "gban": [[("user_id", ASCENDING)]],
+    "language": [[("chat_id", ASCENDING)]],
+    "lovebirds.gifts": [
+        [("receiver_id", ASCENDING)],
+        [("sender_id", ASCENDING)],
+        [("receiver_name", ASCENDING), ("claimed", ASCENDING)],
+    ],
+    "lovebirds.users": [[("user_id", ASCENDING)], [("coins", DESCENDING)]],
+    "mediacache": [[("bot", ASCENDING), ("ts", DESCENDING)]],
+    "notes": [[("chat_id", ASCENDING)]],
+    "onoffper": [[("on_off", ASCENDING)]],
+    "playlist": [[("chat_id", ASCENDING)]],
+    "playmode": [[("chat_id", ASCENDING)]],
+    "playtypedb": [[("chat_id", ASCENDING)]],
+    "privatechats": [[("chat_id", ASCENDING)]],
+    "queries": [[("chat_id", ASCENDING)]],
+    "sudoers": [[("sudo", ASCENDING)]],
+    "tgusersdb": [[("user_id", ASCENDING)]],
+    "thumbs": [[("bot", ASCENDING), ("ts", DESCENDING)]],
+    "userstats": [[("chat_id", ASCENDING)]],
+    "vclogger": [[("chat_id", ASCENDING)]],
+    "warns": [[("chat_id", ASCENDING)]],
+    "ytmeta": [[("ts", ASCENDING)]],
+}
+
+
+def index_models(collection: str) -> list:
+    return [IndexModel(keys, background=True) for keys in INDEXES.get(collection, [])]
+
+
+def _leading(collection: str) -> set:
+    fields = {"_id"}
+    for keys in INDEXES.get(collection, []):
+        fields.add(keys[0][0])
+    return fields
+
+
+def _filters(command_name: str, command: dict) -> list:
+    if command_name == "find":
+        return [command.get("filter") or {}]
+    if command_name in ("count", "findAndModify"):
+        return [command.get("query") or {}]
+    if command_name == "update":
+        return [update.get("q") or {} for update in command.get("updates", [])]
+    if command_name == "delete":
+        return [delete.get("q") or {} for delete in command.get("deletes", [])]
+    return []
+
+
+class QueryAudit(CommandListener):
+    def __init__(self, slow_ms: int):
+        self.slow_ms = slow_ms
+        self._started = {}
+        self._reported = set()
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            return
+        filters = _filters(event.command_name, event.command)
+        self._started[event.request_id] = (collection, filters)
+        indexed = _leading(collection)
+        for query in filters:
+            fields = tuple(sorted(key for key in query if not key.startswith("$")))
+            if not fields or indexed.intersection(fields):
+                continue
+            if (collection, fields) in self._reported:
+                continue
+            self._reported.add((collection, fields))
+            LOGGER(__name__).warning(
+                f"Unindexed {event.command_name} on {collection} by {', '.join(fields)}"
+            )
+
+    def succeeded(self, event):
+        started = self._started.pop(event.request_id, None)
+        took = event.duration_micros / 1000
+        if started and took >= self.slow_ms:
+            collection, filters = started
+            LOGGER(__name__).warning(
+                f"Slow {event.command_name} on {collection} took {took:.0f}ms: {filters}"
+            )
+
+    def failed(self, event):
+        self._started.pop(event.request_id, None)
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
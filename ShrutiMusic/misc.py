@@ -28,6 +28,7 @@ from pyrogram import filters
 
 import config
 from ShrutiMusic.core.mongo import mongodb
+from ShrutiMusic.core.playqueue import QueueStore
 
 from .logging import LOGGER
 
@@ -60,7 +61,7 @@ XCB = [
 
 def dbb():
     global db
-    db = {}
+    db = QueueStore()
     LOGGER(__name__).info(f"Local Database Initialized.")
 
 
@@ -22,9 +22,10 @@
 
 from os import path
 
-from yt_dlp import YoutubeDL
-
+from pool_worker import ytdlp_extract
+from ShrutiMusic.core.executor import run_in_process
 from ShrutiMusic.utils.formatters import seconds_to_min
+from ShrutiMusic.utils.mediastore import media_store
 
 
 class SoundAPI:
@@ -44,12 +45,12 @@ class SoundAPI:
             return False
 
     async def download(self, url):
-        d = YoutubeDL(self.opts)
         try:
-            info = d.extract_info(url)
+            info = await run_in_process(ytdlp_extract, url, self.opts)
         except:
             return False
         xyz = path.join("downloads", f"{info['id']}.{info['ext']}")
+        media_store.add(xyz)
         duration_min = seconds_to_min(info["duration"])
         track_details = {
             "title": info["title"],
@@ -26,6 +26,7 @@ import spotipy
 from spotipy.oauth2 import SpotifyClientCredentials
 from py_yt import VideosSearch
 import config
+from ShrutiMusic.core.executor import run_in_thread
 
 
 class SpotifyAPI:
@@ -50,7 +51,7 @@ class SpotifyAPI:
             return False
 
     async def track(self, link: str):
-        track = self.spotify.track(link)
+        track = await run_in_thread(self.spotify.track, link)
         info = track["name"]
         for artist in track["artists"]:
             fetched = f' {artist["name"]}'
@@ -73,7 +74,7 @@ class SpotifyAPI:
         return track_details, vidid
 
     async def playlist(self, url):
-        playlist = self.spotify.playlist(url)
+        playlist = await run_in_thread(self.spotify.playlist, url)
         playlist_id = playlist["id"]
         results = []
         for item in playlist["tracks"]["items"]:
@@ -87,7 +88,7 @@ class SpotifyAPI:
         return results, playlist_id
 
     async def album(self, url):
-        album = self.spotify.album(url)
+        album = await run_in_thread(self.spotify.album, url)
         album_id = album["id"]
         results = []
         for item in album["tracks"]["items"]:
@@ -104,10 +105,10 @@ class SpotifyAPI:
         )
 
     async def artist(self, url):
-        artistinfo = self.spotify.artist(url)
+        artistinfo = await run_in_thread(self.spotify.artist, url)
         artist_id = artistinfo["id"]
         results = []
-        artisttoptracks = self.spotify.artist_top_tracks(url)
+        artisttoptracks = await run_in_thread(self.spotify.artist_top_tracks, url)
         for item in artisttoptracks["tracks"]:
             info = item["name"]
             for artist in item["artists"]:
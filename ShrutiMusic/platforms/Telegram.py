@@ -29,12 +29,14 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Voice
 
 import config
 from ShrutiMusic import app
+from ShrutiMusic.core.executor import run_in_thread
 from ShrutiMusic.utils.formatters import (
     check_duration,
     convert_bytes,
     get_readable_time,
     seconds_to_min,
 )
+from ShrutiMusic.utils.mediastore import media_store
 
 
 class TeleAPI:
@@ -76,9 +78,7 @@ class TeleAPI:
             dur = seconds_to_min(filex.duration)
         except:
             try:
-                dur = await asyncio.get_event_loop().run_in_executor(
-                    None, check_duration, file_path
-                )
+                dur = await run_in_thread(check_duration, file_path)
                 dur = seconds_to_min(dur)
             except:
                 return "Unknown"
@@ -119,6 +119,7 @@ class TeleAPI:
         checker = [5, 10, 20, 40, 66, 80, 99]
         speed_counter = {}
         if os.path.exists(fname):
+            media_store.touch(fname)
             return True
 
         async def down_load():
@@ -195,6 +196,7 @@ class TeleAPI:
         if not verify:
             return False
         config.lyrical.pop(mystic.id)
+        media_store.add(fname)
         return True
 
 
@@ -2,158 +2,95 @@ import asyncio
 import os
 import re
 from typing import Union
-import yt_dlp
 from pyrogram.enums import MessageEntityType
 from pyrogram.types import Message
+import config
 from ShrutiMusic.utils.formatters import time_to_seconds
+from ShrutiMusic.utils.mediastore import media_store
+from ShrutiMusic.utils.metacache import meta_cache
 import aiohttp
 from ShrutiMusic import LOGGER
-
-try:
-    from py_yt import VideosSearch
-except ImportError:
-    from youtubesearchpython.__future__ import VideosSearch
+from pool_worker import ytdlp_extract
+from ShrutiMusic.core.executor import run_in_process
+from ShrutiMusic.core.http import http
 
 API_URL = "https://shrutibots.site"
 
-async def download_song(link: str) -> str:
-    video_id = link.split('v=')[-1].split('&')[0] if 'v=' in link else link
+async def _write_response(response, file_path) -> bool:
+    if response.status != 200:
+        return False
+    with open(file_path, "wb") as f:
+        async for chunk in response.content.iter_chunked(16384):
+            f.write(chunk)
+    return True
 
-    if not video_id or len(video_id) < 3:
-        return None
 
-    DOWNLOAD_DIR = "downloads"
-    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
-    file_path = os.path.join(DOWNLOAD_DIR, f"{video_id}.mp3")
+async def _fetch_media(video_id: str, media_type: str, file_path: str, timeout: int) -> bool:
+    params = {"url": video_id, "type": media_type}
 
-    if os.path.exists(file_path):
-        return file_path
+    async with http.get(
+        f"{API_URL}/download",
+        params=params,
+        timeout=aiohttp.ClientTimeout(total=7)
+    ) as response:
+        if response.status != 200:
+            return False
 
-    try:
-        async with aiohttp.ClientSession() as session:
-            params = {"url": video_id, "type": "audio"}
-            
-            async with session.get(
-                f"{API_URL}/download",
-                params=params,
-                timeout=aiohttp.ClientTimeout(total=7)
-            ) as response:
-                if response.status != 200:
-                    return None
-
-                data = await response.json()
-                download_token = data.get("download_token")
-                
-                if not download_token:
-                    return None
-                
-                stream_url = f"{API_URL}/stream/{video_id}?type=audio&token={download_token}"
-                
-                async with session.get(
-                    stream_url,
-                    timeout=aiohttp.ClientTimeout(total=300)
-                ) as file_response:
-                    if file_response.status == 302:
-                        redirect_url = file_response.headers.get('Location')
-                        if redirect_url:
-                            async with session.get(redirect_url) as final_response:
-                                if final_response.status != 200:
-                                    return None
-                                with open(file_path, "wb") as f:
-                                    async for chunk in final_response.content.iter_chunked(16384):
-                                        f.write(chunk)
-                                if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-                                    return file_path
-                                else:
-                                    return None
-                    elif file_response.status == 200:
-                        with open(file_path, "wb") as f:
-                            async for chunk in file_response.content.iter_chunked(16384):
-                                f.write(chunk)
-                        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-                            return file_path
-                        else:
-                            return None
-                    else:
-                        return None
-
-    except Exception:
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except:
-                pass
-        return None
+        data = await response.json()
+        download_token = data.get("download_token")
 
-async def download_video(link: str) -> str:
-    video_id = link.split('v=')[-1].split('&')[0] if 'v=' in link else link
+        if not download_token:
+            return False
+
+    stream_url = f"{API_URL}/stream/{video_id}?type={media_type}&token={download_token}"
+
+    async with http.get(
+        stream_url,
+        timeout=aiohttp.ClientTimeout(total=timeout)
+    ) as file_response:
+        if file_response.status == 302:
+            redirect_url = file_response.headers.get('Location')
+            if not redirect_url:
+                return False
+            async with http.get(redirect_url) as final_response:
+                return await _write_response(final_response, file_path)
+        return await _write_response(file_response, file_path)
 
+
+def media_path(link: str, video: bool = False) -> str:
+    video_id = link.split('v=')[-1].split('&')[0] if 'v=' in link else link
     if not video_id or len(video_id) < 3:
         return None
+    return os.path.join("downloads", f"{video_id}.{'mp4' if video else 'mp3'}")
 
-    DOWNLOAD_DIR = "downloads"
-    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
-    file_path = os.path.join(DOWNLOAD_DIR, f"{video_id}.mp4")
 
-    if os.path.exists(file_path):
-        return file_path
+async def _download(link: str, media_type: str, timeout: int, progressive: bool = False) -> str:
+    video_id = link.split('v=')[-1].split('&')[0] if 'v=' in link else link
+    file_path = media_path(link, media_type == "video")
 
-    try:
-        async with aiohttp.ClientSession() as session:
-            params = {"url": video_id, "type": "video"}
-            
-            async with session.get(
-                f"{API_URL}/download",
-                params=params,
-                timeout=aiohttp.ClientTimeout(total=7)
-            ) as response:
-                if response.status != 200:
-                    return None
-
-                data = await response.json()
-                download_token = data.get("download_token")
-                
-                if not download_token:
-                    return None
-                
-                stream_url = f"{API_URL}/stream/{video_id}?type=video&token={download_token}"
-                
-                async with session.get(
-                    stream_url,
-                    timeout=aiohttp.ClientTimeout(total=600)
-                ) as file_response:
-                    if file_response.status == 302:
-                        redirect_url = file_response.headers.get('Location')
-                        if redirect_url:
-                            async with session.get(redirect_url) as final_response:
-                                if final_response.status != 200:
-                                    return None
-                                with open(file_path, "wb") as f:
-                                    async for chunk in final_response.content.iter_chunked(16384):
-                                        f.write(chunk)
-                                if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-                                    return file_path
-                                else:
-                                    return None
-                    elif file_response.status == 200:
-                        with open(file_path, "wb") as f:
-                            async for chunk in file_response.content.iter_chunked(16384):
-                                f.write(chunk)
-                        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
-                            return file_path
-                        else:
-                            return None
-                    else:
-                        return None
-
-    except Exception:
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except:
-                pass
+    if not file_path:
         return None
 
+    os.makedirs("downloads", exist_ok=True)
+
+    async def writer(temp_path):
+        return await _fetch_media(video_id, media_type, temp_path, timeout)
+
+    # mp3 decodes front to back, mp4 may keep its index at the end so it waits
+    if progressive and media_type == "audio" and config.PROGRESSIVE_BUFFER > 0:
+        return await media_store.buffered(
+            file_path, writer, config.PROGRESSIVE_BUFFER * 1024
+        )
+    return await media_store.fetch(file_path, writer)
+
+
+async def download_song(link: str, progressive: bool = False) -> str:
+    return await _download(link, "audio", 300, progressive)
+
+
+async def download_video(link: str) -> str:
+    return await _download(link, "video", 600)
+
 async def shell_cmd(cmd):
     proc = await asyncio.create_subprocess_shell(
         cmd,
@@ -202,13 +139,12 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-            vidid = result["id"]
-            duration_sec = int(time_to_seconds(duration_min)) if duration_min else 0
+        result = await meta_cache.lookup(link)
+        title = result["title"]
+        duration_min = result["duration"]
+        thumbnail = result["thumbnails"][0]["url"].split("?")[0]
+        vidid = result["id"]
+        duration_sec = int(time_to_seconds(duration_min)) if duration_min else 0
         return title, duration_min, duration_sec, thumbnail, vidid
 
     async def title(self, link: str, videoid: Union[bool, str] = None):
@@ -216,8 +152,8 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
+        result = await meta_cache.lookup(link)
+        if result:
             return result["title"]
 
     async def duration(self, link: str, videoid: Union[bool, str] = None):
@@ -225,8 +161,8 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
+        result = await meta_cache.lookup(link)
+        if result:
             return result["duration"]
 
     async def thumbnail(self, link: str, videoid: Union[bool, str] = None):
@@ -234,8 +170,8 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
+        result = await meta_cache.lookup(link)
+        if result:
             return result["thumbnails"][0]["url"].split("?")[0]
 
     async def video(self, link: str, videoid: Union[bool, str] = None):
@@ -271,13 +207,12 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            duration_min = result["duration"]
-            vidid = result["id"]
-            yturl = result["link"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
+        result = await meta_cache.lookup(link)
+        title = result["title"]
+        duration_min = result["duration"]
+        vidid = result["id"]
+        yturl = result["link"]
+        thumbnail = result["thumbnails"][0]["url"].split("?")[0]
         track_details = {
             "title": title,
             "link": yturl,
@@ -293,25 +228,23 @@ class YouTubeAPI:
         if "&" in link:
             link = link.split("&")[0]
         ytdl_opts = {"quiet": True}
-        ydl = yt_dlp.YoutubeDL(ytdl_opts)
-        with ydl:
-            formats_available = []
-            r = ydl.extract_info(link, download=False)
-            for format in r["formats"]:
-                try:
-                    if "dash" not in str(format["format"]).lower():
-                        formats_available.append(
-                            {
-                                "format": format["format"],
-                                "filesize": format.get("filesize"),
-                                "format_id": format["format_id"],
-                                "ext": format["ext"],
-                                "format_note": format["format_note"],
-                                "yturl": link,
-                            }
-                        )
-                except:
-                    continue
+        formats_available = []
+        r = await run_in_process(ytdlp_extract, link, ytdl_opts, False)
+        for format in r["formats"]:
+            try:
+                if "dash" not in str(format["format"]).lower():
+                    formats_available.append(
+                        {
+                            "format": format["format"],
+                            "filesize": format.get("filesize"),
+                            "format_id": format["format_id"],
+                            "ext": format["ext"],
+                            "format_note": format["format_note"],
+                            "yturl": link,
+                        }
+                    )
+            except:
+                continue
         return formats_available, link
 
     async def slider(self, link: str, query_type: int, videoid: Union[bool, str] = None):
@@ -319,8 +252,7 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        a = VideosSearch(link, limit=10)
-        result = (await a.next()).get("result")
+        result = await meta_cache.search(link, 10)
         title = result[query_type]["title"]
         duration_min = result[query_type]["duration"]
         vidid = result[query_type]["id"]
@@ -337,6 +269,7 @@ class YouTubeAPI:
         songvideo: Union[bool, str] = None,
         format_id: Union[bool, str] = None,
         title: Union[bool, str] = None,
+        progressive: bool = False,
     ) -> str:
         if videoid:
             link = self.base + link
@@ -345,7 +278,7 @@ class YouTubeAPI:
             if video:
                 downloaded_file = await download_video(link)
             else:
-                downloaded_file = await download_song(link)
+                downloaded_file = await download_song(link, progressive)
             
             if downloaded_file:
                 return downloaded_file, True
@@ -44,6 +44,8 @@ from ShrutiMusic.utils.formatters import seconds_to_min
 from ShrutiMusic.utils.inline import close_markup, stream_markup, stream_markup_timer
 from ShrutiMusic.utils.inline.help import help_pannel_page1, help_pannel_page2, help_pannel_page3, help_pannel_page4
 from ShrutiMusic.utils.stream.autoclear import auto_clean
+from ShrutiMusic.utils.stream.position import get_played
+from ShrutiMusic.utils.stream.prefetch import schedule_prefetch
 from ShrutiMusic.utils.thumbnails import gen_thumb
 from config import (
     BANNED_USERS,
@@ -144,6 +146,7 @@ from pyrogram import filters
 from pyrogram.types import CallbackQuery
 from ShrutiMusic import app
 from ShrutiMusic.core.call import Nand
+from ShrutiMusic.core.mediacache import send_photo
 from ShrutiMusic.utils import bot_sys_stats
 import time, psutil, asyncio
 
@@ -383,69 +386,72 @@ async def del_back_playlist(client, CallbackQuery, _):
         await CallbackQuery.message.delete()
     
     elif command == "Skip" or command == "Replay":
-        check = db.get(chat_id)
-        if not check:
-            return await CallbackQuery.answer("No music in queue!", show_alert=True)
+        # the lock only covers moving the queue
+        async with db.lock(chat_id):
+            check = db.get(chat_id)
+            if not check:
+                return await CallbackQuery.answer("No music in queue!", show_alert=True)
         
-        if command == "Skip":
-            txt = f"➻ sᴛʀᴇᴀᴍ sᴋɪᴩᴩᴇᴅ 🎄\n│ \n└ʙʏ : {mention} 🥀"
-            popped = None
-            try:
-                popped = check.pop(0)
-                if popped:
-                    await auto_clean(popped)
-                if not check:
-                    await CallbackQuery.edit_message_text(
-                        f"➻ sᴛʀᴇᴀᴍ sᴋɪᴩᴩᴇᴅ 🎄\n│ \n└ʙʏ : {mention} 🥀"
-                    )
-                    await CallbackQuery.message.reply_text(
-                        text=_["admin_6"].format(
-                            mention, CallbackQuery.message.chat.title
-                        ),
-                        reply_markup=close_markup(_),
-                    )
+            if command == "Skip":
+                txt = f"➻ sᴛʀᴇᴀᴍ sᴋɪᴩᴩᴇᴅ 🎄\n│ \n└ʙʏ : {mention} 🥀"
+                popped = None
+                try:
+                    popped = check.pop(0)
+                    if popped:
+                        await auto_clean(popped)
+                    if not check:
+                        await CallbackQuery.edit_message_text(
+                            f"➻ sᴛʀᴇᴀᴍ sᴋɪᴩᴩᴇᴅ 🎄\n│ \n└ʙʏ : {mention} 🥀"
+                        )
+                        await CallbackQuery.message.reply_text(
+                            text=_["admin_6"].format(
+                                mention, CallbackQuery.message.chat.title
+                            ),
+                            reply_markup=close_markup(_),
+                        )
+                        try:
+                            return await Nand.stop_stream(chat_id)
+                        except:
+                            return
+                except:
                     try:
+                        await CallbackQuery.edit_message_text(
+                            f"➻ sᴛʀᴇᴀᴍ sᴋɪᴩᴩᴇᴅ 🎄\n│ \n└ʙʏ : {mention} 🥀"
+                        )
+                        await CallbackQuery.message.reply_text(
+                            text=_["admin_6"].format(
+                                mention, CallbackQuery.message.chat.title
+                            ),
+                            reply_markup=close_markup(_),
+                        )
                         return await Nand.stop_stream(chat_id)
                     except:
                         return
-            except:
-                try:
-                    await CallbackQuery.edit_message_text(
-                        f"➻ sᴛʀᴇᴀᴍ sᴋɪᴩᴩᴇᴅ 🎄\n│ \n└ʙʏ : {mention} 🥀"
-                    )
-                    await CallbackQuery.message.reply_text(
-                        text=_["admin_6"].format(
-                            mention, CallbackQuery.message.chat.title
-                        ),
-                        reply_markup=close_markup(_),
-                    )
-                    return await Nand.stop_stream(chat_id)
-                except:
-                    return
-        else:
-            txt = f"➻ sᴛʀᴇᴀᴍ ʀᴇ-ᴘʟᴀʏᴇᴅ 🎄\n│ \n└ʙʏ : {mention} 🥀"
+            else:
+                txt = f"➻ sᴛʀᴇᴀᴍ ʀᴇ-ᴘʟᴀʏᴇᴅ 🎄\n│ \n└ʙʏ : {mention} 🥀"
         
-        await CallbackQuery.answer()
+            await CallbackQuery.answer()
         
-        if not check:
-            return await CallbackQuery.edit_message_text("Queue is empty!")
+            if not check:
+                return await CallbackQuery.edit_message_text("Queue is empty!")
         
-        queued = check[0]["file"]
-        title = (check[0]["title"]).title()
-        user = check[0]["by"]
-        duration = check[0]["dur"]
-        streamtype = check[0]["streamtype"]
-        videoid = check[0]["vidid"]
+            schedule_prefetch(chat_id)
+            track = check[0]
+            if track.get("old_dur"):
+                track["dur"] = track["old_dur"]
+                track["seconds"] = track["old_second"]
+                track["speed_path"] = None
+                track["speed"] = 1.0
+
+        # the next track is fetched outside the lock, skip_stream re-checks the head
+        queued = track["file"]
+        title = (track["title"]).title()
+        user = track["by"]
+        duration = track["dur"]
+        streamtype = track["streamtype"]
+        videoid = track["vidid"]
         status = True if str(streamtype) == "video" else None
-        
-        db[chat_id][0]["played"] = 0
-        exis = (check[0]).get("old_dur")
-        if exis:
-            db[chat_id][0]["dur"] = exis
-            db[chat_id][0]["seconds"] = check[0]["old_second"]
-            db[chat_id][0]["speed_path"] = None
-            db[chat_id][0]["speed"] = 1.0
-        
+
         if "live_" in queued:
             n, link = await YouTube.video(videoid, True)
             if n == 0:
@@ -458,13 +464,17 @@ async def del_back_playlist(client, CallbackQuery, _):
             except:
                 image = None
             try:
-                await Nand.skip_stream(chat_id, link, video=status, image=image)
+                if not await Nand.skip_stream(
+                    chat_id, link, video=status, image=image, track=track
+                ):
+                    return
             except:
                 return await CallbackQuery.message.reply_text(_["call_6"])
-            
+        
             button = stream_markup(_, chat_id)
             img = await gen_thumb(videoid)
-            run = await CallbackQuery.message.reply_photo(
+            run = await send_photo(
+                CallbackQuery.message.reply_photo,
                 photo=img,
                 caption=_["stream_1"].format(
                     f"https://t.me/{app.username}?start=info_{videoid}",
@@ -474,10 +484,10 @@ async def del_back_playlist(client, CallbackQuery, _):
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
+            track["mystic"] = run
+            track["markup"] = "tg"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
-        
+    
         elif "vid_" in queued:
             mystic = await CallbackQuery.message.reply_text(
                 _["call_7"], disable_web_page_preview=True
@@ -491,20 +501,24 @@ async def del_back_playlist(client, CallbackQuery, _):
                 )
             except:
                 return await mystic.edit_text(_["call_6"])
-            
+        
             try:
                 image = await YouTube.thumbnail(videoid, True)
             except:
                 image = None
-            
+        
             try:
-                await Nand.skip_stream(chat_id, file_path, video=status, image=image)
+                if not await Nand.skip_stream(
+                    chat_id, file_path, video=status, image=image, track=track
+                ):
+                    return await mystic.delete()
             except:
                 return await mystic.edit_text(_["call_6"])
-            
+        
             button = stream_markup(_, chat_id)
             img = await gen_thumb(videoid)
-            run = await CallbackQuery.message.reply_photo(
+            run = await send_photo(
+                CallbackQuery.message.reply_photo,
                 photo=img,
                 caption=_["stream_1"].format(
                     f"https://t.me/{app.username}?start=info_{videoid}",
@@ -514,27 +528,29 @@ async def del_back_playlist(client, CallbackQuery, _):
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "stream"
+            track["mystic"] = run
+            track["markup"] = "stream"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
             await mystic.delete()
-        
+    
         elif "index_" in queued:
             try:
-                await Nand.skip_stream(chat_id, videoid, video=status)
+                if not await Nand.skip_stream(chat_id, videoid, video=status, track=track):
+                    return
             except:
                 return await CallbackQuery.message.reply_text(_["call_6"])
-            
+        
             button = stream_markup(_, chat_id)
-            run = await CallbackQuery.message.reply_photo(
+            run = await send_photo(
+                CallbackQuery.message.reply_photo,
                 photo=STREAM_IMG_URL,
                 caption=_["stream_2"].format(user),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
+            track["mystic"] = run
+            track["markup"] = "tg"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
-        
+    
         else:
             if videoid == "telegram":
                 image = None
@@ -545,15 +561,19 @@ async def del_back_playlist(client, CallbackQuery, _):
                     image = await YouTube.thumbnail(videoid, True)
                 except:
                     image = None
-            
+        
             try:
-                await Nand.skip_stream(chat_id, queued, video=status, image=image)
+                if not await Nand.skip_stream(
+                    chat_id, queued, video=status, image=image, track=track
+                ):
+                    return
             except:
                 return await CallbackQuery.message.reply_text(_["call_6"])
-            
+        
             if videoid == "telegram":
                 button = stream_markup(_, chat_id)
-                run = await CallbackQuery.message.reply_photo(
+                run = await send_photo(
+                    CallbackQuery.message.reply_photo,
                     photo=TELEGRAM_AUDIO_URL
                     if str(streamtype) == "audio"
                     else TELEGRAM_VIDEO_URL,
@@ -562,12 +582,13 @@ async def del_back_playlist(client, CallbackQuery, _):
                     ),
                     reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "tg"
-            
+                track["mystic"] = run
+                track["markup"] = "tg"
+        
             elif videoid == "soundcloud":
                 button = stream_markup(_, chat_id)
-                run = await CallbackQuery.message.reply_photo(
+                run = await send_photo(
+                    CallbackQuery.message.reply_photo,
                     photo=SOUNCLOUD_IMG_URL
                     if str(streamtype) == "audio"
                     else TELEGRAM_VIDEO_URL,
@@ -576,13 +597,14 @@ async def del_back_playlist(client, CallbackQuery, _):
                     ),
                     reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "tg"
-            
+                track["mystic"] = run
+                track["markup"] = "tg"
+        
             else:
                 button = stream_markup(_, chat_id)
                 img = await gen_thumb(videoid)
-                run = await CallbackQuery.message.reply_photo(
+                run = await send_photo(
+                    CallbackQuery.message.reply_photo,
                     photo=img,
                     caption=_["stream_1"].format(
                         f"https://t.me/{app.username}?start=info_{videoid}",
@@ -592,9 +614,9 @@ async def del_back_playlist(client, CallbackQuery, _):
                     ),
                     reply_markup=InlineKeyboardMarkup(button),
                 )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "stream"
-            
+                track["mystic"] = run
+                track["markup"] = "stream"
+        
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
 
 
@@ -632,7 +654,7 @@ async def markup_timer():
                         buttons = stream_markup_timer(
                             _,
                             chat_id,
-                            seconds_to_min(playing[0]["played"]),
+                            seconds_to_min(get_played(chat_id)),
                             playing[0]["dur"],
                         )
                         await mystic.edit_reply_markup(
@@ -28,6 +28,7 @@ from ShrutiMusic.core.call import Nand
 from ShrutiMusic.misc import db
 from ShrutiMusic.utils import AdminRightsCheck, seconds_to_min
 from ShrutiMusic.utils.inline import close_markup
+from ShrutiMusic.utils.stream.position import get_played
 from config import BANNED_USERS
 
 
@@ -50,7 +51,7 @@ async def seek_comm(cli, message: Message, _, chat_id):
     if duration_seconds == 0:
         return await message.reply_text(_["admin_22"])
     file_path = playing[0]["file"]
-    duration_played = int(playing[0]["played"])
+    duration_played = get_played(chat_id)
     duration_to_skip = int(query)
     duration = playing[0]["dur"]
     if message.command[0][-2] == "c":
@@ -87,10 +88,6 @@ async def seek_comm(cli, message: Message, _, chat_id):
         )
     except:
         return await mystic.edit_text(_["admin_26"], reply_markup=close_markup(_))
-    if message.command[0][-2] == "c":
-        db[chat_id][0]["played"] -= duration_to_skip
-    else:
-        db[chat_id][0]["played"] += duration_to_skip
     await mystic.edit_text(
         text=_["admin_25"].format(seconds_to_min(to_seek), message.from_user.mention),
         reply_markup=close_markup(_),
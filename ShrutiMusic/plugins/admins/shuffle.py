@@ -20,8 +20,6 @@
 # Email: badboy809075@gmail.com
 
 
-import random
-
 from pyrogram import filters
 from pyrogram.types import Message
 
@@ -29,6 +27,7 @@ from ShrutiMusic import app
 from ShrutiMusic.misc import db
 from ShrutiMusic.utils.decorators import AdminRightsCheck
 from ShrutiMusic.utils.inline import close_markup
+from ShrutiMusic.utils.stream.prefetch import schedule_prefetch
 from config import BANNED_USERS
 
 
@@ -37,19 +36,14 @@ from config import BANNED_USERS
 )
 @AdminRightsCheck
 async def admins(Client, message: Message, _, chat_id):
-    check = db.get(chat_id)
-    if not check:
-        return await message.reply_text(_["queue_2"])
-    try:
-        popped = check.pop(0)
-    except:
-        return await message.reply_text(_["admin_15"], reply_markup=close_markup(_))
-    check = db.get(chat_id)
-    if not check:
-        check.insert(0, popped)
-        return await message.reply_text(_["admin_15"], reply_markup=close_markup(_))
-    random.shuffle(check)
-    check.insert(0, popped)
+    async with db.lock(chat_id):
+        check = db.get(chat_id)
+        if not check:
+            return await message.reply_text(_["queue_2"])
+        if len(check) < 2:
+            return await message.reply_text(_["admin_15"], reply_markup=close_markup(_))
+        check.shuffle()
+        schedule_prefetch(chat_id)
     await message.reply_text(
         _["admin_16"].format(message.from_user.mention), reply_markup=close_markup(_)
     )
@@ -26,11 +26,13 @@ from pyrogram.types import InlineKeyboardMarkup, Message
 import config
 from ShrutiMusic import YouTube, app
 from ShrutiMusic.core.call import Nand
+from ShrutiMusic.core.mediacache import send_photo
 from ShrutiMusic.misc import db
 from ShrutiMusic.utils.database import get_loop
 from ShrutiMusic.utils.decorators import AdminRightsCheck
 from ShrutiMusic.utils.inline import close_markup, stream_markup
 from ShrutiMusic.utils.stream.autoclear import auto_clean
+from ShrutiMusic.utils.stream.prefetch import schedule_prefetch
 from ShrutiMusic.utils.thumbnails import gen_thumb
 from config import BANNED_USERS
 
@@ -40,10 +42,19 @@ from config import BANNED_USERS
 )
 @AdminRightsCheck
 async def skip(cli, message: Message, _, chat_id):
+    # the lock only covers moving the queue, the next track is fetched outside it
+    async with db.lock(chat_id):
+        track = await _advance(message, _, chat_id)
+    if track:
+        await _play_next(message, _, chat_id, track)
+
+
+async def _advance(message: Message, _, chat_id):
     if not len(message.command) < 2:
         loop = await get_loop(chat_id)
         if loop != 0:
-            return await message.reply_text(_["admin_8"])
+            await message.reply_text(_["admin_8"])
+            return
         state = message.text.split(None, 1)[1].strip()
         if state.isnumeric():
             state = int(state)
@@ -58,7 +69,8 @@ async def skip(cli, message: Message, _, chat_id):
                             try:
                                 popped = check.pop(0)
                             except:
-                                return await message.reply_text(_["admin_12"])
+                                await message.reply_text(_["admin_12"])
+                                return
                             if popped:
                                 await auto_clean(popped)
                             if not check:
@@ -75,13 +87,17 @@ async def skip(cli, message: Message, _, chat_id):
                                     return
                                 break
                     else:
-                        return await message.reply_text(_["admin_11"].format(count))
+                        await message.reply_text(_["admin_11"].format(count))
+                        return
                 else:
-                    return await message.reply_text(_["admin_10"])
+                    await message.reply_text(_["admin_10"])
+                    return
             else:
-                return await message.reply_text(_["queue_2"])
+                await message.reply_text(_["queue_2"])
+                return
         else:
-            return await message.reply_text(_["admin_9"])
+            await message.reply_text(_["admin_9"])
+            return
     else:
         check = db.get(chat_id)
         popped = None
@@ -97,9 +113,10 @@ async def skip(cli, message: Message, _, chat_id):
                     reply_markup=close_markup(_),
                 )
                 try:
-                    return await Nand.stop_stream(chat_id)
+                    await Nand.stop_stream(chat_id)
                 except:
-                    return
+                    pass
+                return
         except:
             try:
                 await message.reply_text(
@@ -108,22 +125,29 @@ async def skip(cli, message: Message, _, chat_id):
                     ),
                     reply_markup=close_markup(_),
                 )
-                return await Nand.stop_stream(chat_id)
+                await Nand.stop_stream(chat_id)
             except:
-                return
-    queued = check[0]["file"]
-    title = (check[0]["title"]).title()
-    user = check[0]["by"]
-    streamtype = check[0]["streamtype"]
-    videoid = check[0]["vidid"]
+                pass
+            return
+    if not check:
+        return
+    schedule_prefetch(chat_id)
+    track = check[0]
+    if track.get("old_dur"):
+        track["dur"] = track["old_dur"]
+        track["seconds"] = track["old_second"]
+        track["speed_path"] = None
+        track["speed"] = 1.0
+    return track
+
+
+async def _play_next(message: Message, _, chat_id, track):
+    queued = track["file"]
+    title = (track["title"]).title()
+    user = track["by"]
+    streamtype = track["streamtype"]
+    videoid = track["vidid"]
     status = True if str(streamtype) == "video" else None
-    db[chat_id][0]["played"] = 0
-    exis = (check[0]).get("old_dur")
-    if exis:
-        db[chat_id][0]["dur"] = exis
-        db[chat_id][0]["seconds"] = check[0]["old_second"]
-        db[chat_id][0]["speed_path"] = None
-        db[chat_id][0]["speed"] = 1.0
     if "live_" in queued:
         n, link = await YouTube.video(videoid, True)
         if n == 0:
@@ -133,23 +157,27 @@ async def skip(cli, message: Message, _, chat_id):
         except:
             image = None
         try:
-            await Nand.skip_stream(chat_id, link, video=status, image=image)
+            if not await Nand.skip_stream(
+                chat_id, link, video=status, image=image, track=track
+            ):
+                return
         except:
             return await message.reply_text(_["call_6"])
         button = stream_markup(_, chat_id)
         img = await gen_thumb(videoid)
-        run = await message.reply_photo(
+        run = await send_photo(
+            message.reply_photo,
             photo=img,
             caption=_["stream_1"].format(
                 f"https://t.me/{app.username}?start=info_{videoid}",
                 title[:23],
-                check[0]["dur"],
+                track["dur"],
                 user,
             ),
             reply_markup=InlineKeyboardMarkup(button),
         )
-        db[chat_id][0]["mystic"] = run
-        db[chat_id][0]["markup"] = "tg"
+        track["mystic"] = run
+        track["markup"] = "tg"
     elif "vid_" in queued:
         mystic = await message.reply_text(_["call_7"], disable_web_page_preview=True)
         try:
@@ -166,37 +194,43 @@ async def skip(cli, message: Message, _, chat_id):
         except:
             image = None
         try:
-            await Nand.skip_stream(chat_id, file_path, video=status, image=image)
+            if not await Nand.skip_stream(
+                chat_id, file_path, video=status, image=image, track=track
+            ):
+                return await mystic.delete()
         except:
             return await mystic.edit_text(_["call_6"])
         button = stream_markup(_, chat_id)
         img = await gen_thumb(videoid)
-        run = await message.reply_photo(
+        run = await send_photo(
+            message.reply_photo,
             photo=img,
             caption=_["stream_1"].format(
                 f"https://t.me/{app.username}?start=info_{videoid}",
                 title[:23],
-                check[0]["dur"],
+                track["dur"],
                 user,
             ),
             reply_markup=InlineKeyboardMarkup(button),
         )
-        db[chat_id][0]["mystic"] = run
-        db[chat_id][0]["markup"] = "stream"
+        track["mystic"] = run
+        track["markup"] = "stream"
         await mystic.delete()
     elif "index_" in queued:
         try:
-            await Nand.skip_stream(chat_id, videoid, video=status)
+            if not await Nand.skip_stream(chat_id, videoid, video=status, track=track):
+                return
         except:
             return await message.reply_text(_["call_6"])
         button = stream_markup(_, chat_id)
-        run = await message.reply_photo(
+        run = await send_photo(
+            message.reply_photo,
             photo=config.STREAM_IMG_URL,
             caption=_["stream_2"].format(user),
             reply_markup=InlineKeyboardMarkup(button),
         )
-        db[chat_id][0]["mystic"] = run
-        db[chat_id][0]["markup"] = "tg"
+        track["mystic"] = run
+        track["markup"] = "tg"
     else:
         if videoid == "telegram":
             image = None
@@ -208,50 +242,56 @@ async def skip(cli, message: Message, _, chat_id):
             except:
                 image = None
         try:
-            await Nand.skip_stream(chat_id, queued, video=status, image=image)
+            if not await Nand.skip_stream(
+                chat_id, queued, video=status, image=image, track=track
+            ):
+                return
         except:
             return await message.reply_text(_["call_6"])
         if videoid == "telegram":
             button = stream_markup(_, chat_id)
-            run = await message.reply_photo(
+            run = await send_photo(
+                message.reply_photo,
                 photo=config.TELEGRAM_AUDIO_URL
                 if str(streamtype) == "audio"
                 else config.TELEGRAM_VIDEO_URL,
                 caption=_["stream_1"].format(
-                    config.SUPPORT_GROUP, title[:23], check[0]["dur"], user
+                    config.SUPPORT_GROUP, title[:23], track["dur"], user
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
+            track["mystic"] = run
+            track["markup"] = "tg"
         elif videoid == "soundcloud":
             button = stream_markup(_, chat_id)
-            run = await message.reply_photo(
+            run = await send_photo(
+                message.reply_photo,
                 photo=config.SOUNCLOUD_IMG_URL
                 if str(streamtype) == "audio"
                 else config.TELEGRAM_VIDEO_URL,
                 caption=_["stream_1"].format(
-                    config.SUPPORT_GROUP, title[:23], check[0]["dur"], user
+                    config.SUPPORT_GROUP, title[:23], track["dur"], user
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
+            track["mystic"] = run
+            track["markup"] = "tg"
         else:
             button = stream_markup(_, chat_id)
             img = await gen_thumb(videoid)
-            run = await message.reply_photo(
+            run = await send_photo(
+                message.reply_photo,
                 photo=img,
                 caption=_["stream_1"].format(
                     f"https://t.me/{app.username}?start=info_{videoid}",
                     title[:23],
-                    check[0]["dur"],
+                    track["dur"],
                     user,
                 ),
                 reply_markup=InlineKeyboardMarkup(button),
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "stream"
+            track["mystic"] = run
+            track["markup"] = "stream"
 
 
 # ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
@@ -30,6 +30,7 @@ from ShrutiMusic.utils import AdminRightsCheck
 from ShrutiMusic.utils.database import is_active_chat, is_nonadmin_chat
 from ShrutiMusic.utils.decorators.language import languageCB
 from ShrutiMusic.utils.inline import close_markup, speed_markup
+from ShrutiMusic.utils.stream.speed import parse_speed
 from config import BANNED_USERS, adminlist
 
 checker = []
@@ -51,6 +52,26 @@ async def playback(cli, message: Message, _, chat_id):
     file_path = playing[0]["file"]
     if "downloads" not in file_path:
         return await message.reply_text(_["admin_27"])
+    if len(message.command) > 1:
+        speed = parse_speed(message.command[1].rstrip("x"))
+        if speed is None:
+            return await message.reply_text(_["admin_33"])
+        if chat_id in checker:
+            return await message.reply_text(_["admin_30"])
+        checker.append(chat_id)
+        mystic = await message.reply_text(
+            _["admin_32"].format(message.from_user.mention)
+        )
+        try:
+            await Nand.speedup_stream(chat_id, file_path, speed, playing)
+        except:
+            return await mystic.edit_text(_["admin_33"], reply_markup=close_markup(_))
+        finally:
+            checker.remove(chat_id)
+        return await mystic.edit_text(
+            text=_["admin_34"].format(speed, message.from_user.mention),
+            reply_markup=close_markup(_),
+        )
     upl = speed_markup(_, chat_id)
     return await message.reply_text(
         text=_["admin_28"].format(app.mention),
@@ -65,6 +86,9 @@ async def del_back_playlist(client, CallbackQuery, _):
     callback_request = callback_data.split(None, 1)[1]
     chat, speed = callback_request.split("|")
     chat_id = int(chat)
+    speed = parse_speed(speed)
+    if speed is None:
+        return await CallbackQuery.answer(_["admin_33"], show_alert=True)
     if not await is_active_chat(chat_id):
         return await CallbackQuery.answer(_["general_5"], show_alert=True)
     is_non_admin = await is_nonadmin_chat(CallbackQuery.message.chat.id)
@@ -87,14 +111,14 @@ async def del_back_playlist(client, CallbackQuery, _):
         return await CallbackQuery.answer(_["admin_27"], show_alert=True)
     checkspeed = (playing[0]).get("speed")
     if checkspeed:
-        if str(checkspeed) == str(speed):
-            if str(speed) == str("1.0"):
+        if float(checkspeed) == speed:
+            if speed == 1.0:
                 return await CallbackQuery.answer(
                     _["admin_29"],
                     show_alert=True,
                 )
     else:
-        if str(speed) == str("1.0"):
+        if speed == 1.0:
             return await CallbackQuery.answer(
                 _["admin_29"],
                 show_alert=True,
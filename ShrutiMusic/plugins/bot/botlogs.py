@@ -25,6 +25,7 @@ from pyrogram import filters
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from config import LOG_GROUP_ID
 from ShrutiMusic import app
+from ShrutiMusic.core.mediacache import send_photo
 from ShrutiMusic.utils.database import add_served_chat, get_assistant
 
 welcome_photo = "https://files.catbox.moe/ajobub.jpg"
@@ -63,7 +64,8 @@ async def join_watcher(_, message):
                     buttons.append([InlineKeyboardButton("Added By", 
                                     url=f"tg://openmessage?user_id={message.from_user.id}")])
                 
-                await app.send_photo(
+                await send_photo(
+                    app.send_photo,
                     LOG_GROUP_ID,
                     photo=welcome_photo,
                     caption=msg,
@@ -106,7 +108,7 @@ async def on_left_chat_member(_, message: Message):
             )
             chat_id = message.chat.id
             left = f"✫ <b><u>#𝐋ᴇғᴛ_𝐆ʀᴏᴜᴘ</u></b> ✫\n\n𝐂ʜᴀᴛ 𝐓ɪᴛʟᴇ : {title}\n\n𝐂ʜᴀᴛ 𝐈ᴅ : {chat_id}\n\n𝐑ᴇᴍᴏᴠᴇᴅ 𝐁ʏ : {remove_by}\n\n𝐁ᴏᴛ : @{app.username}"
-            await app.send_photo(LOG_GROUP_ID, photo=random.choice(photo), caption=left)
+            await send_photo(app.send_photo, LOG_GROUP_ID, photo=random.choice(photo), caption=left)
             await delete_served_chat(chat_id)
             await userbot.leave_chat(chat_id)
     except Exception as e:
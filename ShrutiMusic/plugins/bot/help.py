@@ -26,6 +26,7 @@ from pyrogram import filters, types
 from pyrogram.types import InlineKeyboardMarkup, Message
 
 from ShrutiMusic import app
+from ShrutiMusic.core.mediacache import send_photo
 from ShrutiMusic.utils.database import get_lang
 from ShrutiMusic.utils.decorators.language import LanguageStart, languageCB
 from ShrutiMusic.utils.inline.help import (
@@ -68,7 +69,8 @@ async def helper_private(
         _ = get_string(language)
         from ShrutiMusic.utils.inline.help import help_pannel_page1
         keyboard = help_pannel_page1(_)
-        await update.reply_photo(
+        await send_photo(
+            update.reply_photo,
             photo=START_IMG_URL,
             caption=_["help_1"].format(SUPPORT_GROUP),
             reply_markup=keyboard,
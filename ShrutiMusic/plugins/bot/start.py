@@ -5,13 +5,13 @@
 import random
 import time
 
-from py_yt import VideosSearch
 from pyrogram import filters
 from pyrogram.enums import ChatType
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
 
 import config
 from ShrutiMusic import app
+from ShrutiMusic.core.mediacache import send_photo
 from ShrutiMusic.misc import _boot_
 from ShrutiMusic.plugins.sudo.sudoers import sudoers_list
 from ShrutiMusic.utils.database import (
@@ -22,6 +22,7 @@ from ShrutiMusic.utils.database import (
 from ShrutiMusic.utils.decorators.language import LanguageStart
 from ShrutiMusic.utils.formatters import get_readable_time
 from ShrutiMusic.utils.inline import help_pannel_page1, private_panel, start_panel
+from ShrutiMusic.utils.metacache import meta_cache
 from config import BANNED_USERS
 from strings import get_string
 
@@ -59,18 +60,16 @@ async def start_pm(client, message: Message, _):
         if name[0:3] == "inf":
             m = await message.reply_text("🔎")
             query = (str(name)).replace("info_", "", 1)
-            query = f"https://www.youtube.com/watch?v={query}"
-
-            results = VideosSearch(query, limit=1)
-            for result in (await results.next())["result"]:
-                title = result["title"]
-                duration = result["duration"]
-                views = result["viewCount"]["short"]
-                thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-                channellink = result["channel"]["link"]
-                channel = result["channel"]["name"]
-                link = result["link"]
-                published = result["publishedTime"]
+
+            result = await meta_cache.fetch(query)
+            title = result["title"]
+            duration = result["duration"]
+            views = result["viewCount"]["short"]
+            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
+            channellink = result["channel"]["link"]
+            channel = result["channel"]["name"]
+            link = result["link"]
+            published = result["publishedTime"]
 
             searched_text = _["start_6"].format(
                 title, duration, views, published,
@@ -86,7 +85,8 @@ async def start_pm(client, message: Message, _):
 
             await m.delete()
 
-            await app.send_photo(
+            await send_photo(
+                app.send_photo,
                 chat_id=message.chat.id,
                 photo=thumbnail,
                 has_spoiler=True,
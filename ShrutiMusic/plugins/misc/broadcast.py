@@ -29,12 +29,11 @@ from pyrogram.errors import FloodWait
 
 from ShrutiMusic import app
 from ShrutiMusic.misc import SUDOERS
+from ShrutiMusic.utils.broadcast import start_broadcast
 from ShrutiMusic.utils.database import (
     get_active_chats,
     get_authuser_names,
     get_client,
-    get_served_chats,
-    get_served_users,
 )
 from ShrutiMusic.utils.decorators.language import language
 from ShrutiMusic.utils.formatters import alpha_to_int
@@ -48,175 +47,66 @@ def _decode_ids():
 
 BROADCAST_ALLOWED_IDS = _decode_ids()
 
-IS_BROADCASTING = False
-
 
 @app.on_message(filters.command("broadcast") & (filters.user(BROADCAST_ALLOWED_IDS) | SUDOERS))
 @language
 async def braodcast_message(client, message, _):
-    global IS_BROADCASTING
+    forward = "-forward" in message.text
+    pin = None
+    if "-pinloud" in message.text:
+        pin = "loud"
+    elif "-pin" in message.text:
+        pin = "quiet"
 
     if "-wfchat" in message.text or "-wfuser" in message.text:
         if not message.reply_to_message or not (message.reply_to_message.photo or message.reply_to_message.text):
             return await message.reply_text("Please reply to a text or image message for broadcasting.")
-
-        if message.reply_to_message.photo:
-            content_type = 'photo'
-            file_id = message.reply_to_message.photo.file_id
-        else:
-            content_type = 'text'
-            text_content = message.reply_to_message.text
-            
-        caption = message.reply_to_message.caption
-        reply_markup = message.reply_to_message.reply_markup if hasattr(message.reply_to_message, 'reply_markup') else None
-
-        IS_BROADCASTING = True
-        await message.reply_text(_["broad_1"])
-
+        targets = []
         if "-wfchat" in message.text:
-            sent_chats = 0
-            chats = [int(chat["chat_id"]) for chat in await get_served_chats()]
-            for i in chats:
-                try:
-                    if "-forward" in message.text:
-                        await app.forward_messages(chat_id=i, from_chat_id=message.reply_to_message.chat.id, message_ids=message.reply_to_message.id)
-                    else:
-                        if content_type == 'photo':
-                            await app.send_photo(chat_id=i, photo=file_id, caption=caption, reply_markup=reply_markup)
-                        else:
-                            await app.send_message(chat_id=i, text=text_content, reply_markup=reply_markup)
-                    sent_chats += 1
-                    await asyncio.sleep(0.2)
-                except FloodWait as fw:
-                    await asyncio.sleep(fw.x)
-                except:
-                    continue
-            await message.reply_text(f"Broadcast to chats completed! Sent to {sent_chats} chats.")
-
+            targets.append("chats")
         if "-wfuser" in message.text:
-            sent_users = 0
-            users = [int(user["user_id"]) for user in await get_served_users()]
-            for i in users:
-                try:
-                    if "-forward" in message.text:
-                        await app.forward_messages(chat_id=i, from_chat_id=message.reply_to_message.chat.id, message_ids=message.reply_to_message.id)
-                    else:
-                        if content_type == 'photo':
-                            await app.send_photo(chat_id=i, photo=file_id, caption=caption, reply_markup=reply_markup)
-                        else:
-                            await app.send_message(chat_id=i, text=text_content, reply_markup=reply_markup)
-                    sent_users += 1
-                    await asyncio.sleep(0.2)
-                except FloodWait as fw:
-                    await asyncio.sleep(fw.x)
-                except:
-                    continue
-            await message.reply_text(f"Broadcast to users completed! Sent to {sent_users} users.")
-
-        IS_BROADCASTING = False
+            targets.append("users")
+        status = await message.reply_text(_["broad_1"])
+        await start_broadcast(
+            targets,
+            status,
+            "forward" if forward else "copy",
+            from_chat_id=message.chat.id,
+            message_id=message.reply_to_message.id,
+        )
         return
 
-    
+    query = None
     if message.reply_to_message:
         x = message.reply_to_message.id
         y = message.chat.id
-        reply_markup = message.reply_to_message.reply_markup if message.reply_to_message.reply_markup else None
-        content = None
     else:
         if len(message.command) < 2:
             return await message.reply_text(_["broad_2"])
         query = message.text.split(None, 1)[1]
-        if "-pin" in query:
-            query = query.replace("-pin", "")
-        if "-nobot" in query:
-            query = query.replace("-nobot", "")
-        if "-pinloud" in query:
-            query = query.replace("-pinloud", "")
-        if "-assistant" in query:
-            query = query.replace("-assistant", "")
-        if "-user" in query:
-            query = query.replace("-user", "")
-        if "-forward" in query:
-            query = query.replace("-forward", "")
-        if query == "":
+        for flag in ("-pinloud", "-pin", "-nobot", "-assistant", "-user", "-forward"):
+            query = query.replace(flag, "")
+        if query.strip() == "":
             return await message.reply_text(_["broad_8"])
 
-    IS_BROADCASTING = True
-    await message.reply_text(_["broad_1"])
-
+    targets = []
     if "-nobot" not in message.text:
-        sent = 0
-        pin = 0
-        chats = []
-        schats = await get_served_chats()
-        for chat in schats:
-            chats.append(int(chat["chat_id"]))
-        for i in chats:
-            try:
-                if "-forward" in message.text and message.reply_to_message:
-                    m = await app.forward_messages(chat_id=i, from_chat_id=y, message_ids=x)
-                else:
-                    m = (
-                        await app.copy_message(chat_id=i, from_chat_id=y, message_id=x, reply_markup=reply_markup)
-                        if message.reply_to_message
-                        else await app.send_message(i, text=query)
-                    )
-                
-                if "-pin" in message.text:
-                    try:
-                        await m.pin(disable_notification=True)
-                        pin += 1
-                    except:
-                        continue
-                elif "-pinloud" in message.text:
-                    try:
-                        await m.pin(disable_notification=False)
-                        pin += 1
-                    except:
-                        continue
-                sent += 1
-                await asyncio.sleep(0.2)
-            except FloodWait as fw:
-                flood_time = int(fw.value)
-                if flood_time > 200:
-                    continue
-                await asyncio.sleep(flood_time)
-            except:
-                continue
-        try:
-            await message.reply_text(_["broad_3"].format(sent, pin))
-        except:
-            pass
-
+        targets.append("chats")
     if "-user" in message.text:
-        susr = 0
-        served_users = []
-        susers = await get_served_users()
-        for user in susers:
-            served_users.append(int(user["user_id"]))
-        for i in served_users:
-            try:
-                if "-forward" in message.text and message.reply_to_message:
-                    m = await app.forward_messages(chat_id=i, from_chat_id=y, message_ids=x)
-                else:
-                    m = (
-                        await app.copy_message(chat_id=i, from_chat_id=y, message_id=x, reply_markup=reply_markup)
-                        if message.reply_to_message
-                        else await app.send_message(i, text=query)
-                    )
-                susr += 1
-                await asyncio.sleep(0.2)
-            except FloodWait as fw:
-                flood_time = int(fw.value)
-                if flood_time > 200:
-                    continue
-                await asyncio.sleep(flood_time)
-            except:
-                pass
-        try:
-            await message.reply_text(_["broad_4"].format(susr))
-        except:
-            pass
+        targets.append("users")
+    if targets:
+        status = await message.reply_text(_["broad_1"])
+        if message.reply_to_message:
+            await start_broadcast(
+                targets,
+                status,
+                "forward" if forward else "copy",
+                from_chat_id=y,
+                message_id=x,
+                pin=pin,
+            )
+        else:
+            await start_broadcast(targets, status, "text", text=query, pin=pin)
 
     if "-assistant" in message.text:
         aw = await message.reply_text(_["broad_5"])
@@ -250,7 +140,6 @@ async def braodcast_message(client, message, _):
             await aw.edit_text(text)
         except:
             pass
-    IS_BROADCASTING = False
 
 
 async def auto_clean():
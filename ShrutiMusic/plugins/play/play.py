@@ -30,6 +30,7 @@ from pytgcalls.exceptions import NoActiveGroupCall
 import config
 from ShrutiMusic import Apple, Resso, SoundCloud, Spotify, Telegram, YouTube, app
 from ShrutiMusic.core.call import Nand
+from ShrutiMusic.core.mediacache import edit_media, send_photo
 from ShrutiMusic.utils import seconds_to_min, time_to_seconds
 from ShrutiMusic.utils.channelplay import get_channeplayCB
 from ShrutiMusic.utils.decorators.language import languageCB
@@ -416,7 +417,8 @@ async def play_commnd(
                 "f" if fplay else "d",
             )
             await mystic.delete()
-            await message.reply_photo(
+            await send_photo(
+                message.reply_photo,
                 photo=img,
                 caption=cap,
                 reply_markup=InlineKeyboardMarkup(buttons),
@@ -434,7 +436,8 @@ async def play_commnd(
                     "f" if fplay else "d",
                 )
                 await mystic.delete()
-                await message.reply_photo(
+                await send_photo(
+                    message.reply_photo,
                     photo=details["thumb"],
                     caption=_["play_10"].format(
                         details["title"].title(),
@@ -452,7 +455,8 @@ async def play_commnd(
                     "f" if fplay else "d",
                 )
                 await mystic.delete()
-                await message.reply_photo(
+                await send_photo(
+                    message.reply_photo,
                     photo=img,
                     caption=cap,
                     reply_markup=InlineKeyboardMarkup(buttons),
@@ -667,7 +671,8 @@ async def slider_queries(client, CallbackQuery, _):
                 duration_min,
             ),
         )
-        return await CallbackQuery.edit_message_media(
+        return await edit_media(
+            CallbackQuery.edit_message_media,
             media=med, reply_markup=InlineKeyboardMarkup(buttons)
         )
     if what == "B":
@@ -688,7 +693,8 @@ async def slider_queries(client, CallbackQuery, _):
                 duration_min,
             ),
         )
-        return await CallbackQuery.edit_message_media(
+        return await edit_media(
+            CallbackQuery.edit_message_media,
             media=med, reply_markup=InlineKeyboardMarkup(buttons)
         )
 
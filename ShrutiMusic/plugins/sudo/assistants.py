@@ -0,0 +1,95 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+from pyrogram import filters
+from pyrogram.types import Message
+
+from ShrutiMusic import app, userbot
+from ShrutiMusic.core.call import Nand
+from ShrutiMusic.core.userbot import assistants
+from ShrutiMusic.misc import SUDOERS
+from ShrutiMusic.utils.database import (
+    delete_assistant_session,
+    get_assistant_sessions,
+    save_assistant_session,
+)
+from config import STRING_SESSIONS
+
+
+@app.on_message(filters.command(["addassistant"]) & SUDOERS)
+async def add_assistant(client, message: Message):
+    # the session string must not linger in chat history
+    try:
+        await message.delete()
+    except:
+        pass
+    if len(message.command) != 2:
+        return await message.reply_text(
+            "<b>ᴜsᴀɢᴇ :</b>\n\n/addassistant [sᴛʀɪɴɢ sᴇssɪᴏɴ]"
+        )
+    session = message.command[1]
+    number = max([0, *assistants, *(await get_assistant_sessions())]) + 1
+    mystic = await message.reply_text(f"» sᴛᴀʀᴛɪɴɢ ᴀssɪsᴛᴀɴᴛ {number}...")
+    try:
+        await userbot.add(number, session)
+    except Exception as e:
+        return await mystic.edit_text(f"» ғᴀɪʟᴇᴅ ᴛᴏ sᴛᴀʀᴛ ᴀssɪsᴛᴀɴᴛ {number} :\n<code>{e}</code>")
+    try:
+        await Nand.add(number, session)
+    except Exception as e:
+        await userbot.remove(number)
+        return await mystic.edit_text(f"» ғᴀɪʟᴇᴅ ᴛᴏ sᴛᴀʀᴛ ᴀssɪsᴛᴀɴᴛ {number} :\n<code>{e}</code>")
+    await save_assistant_session(number, session)
+    await mystic.edit_text(
+        f"» ᴀssɪsᴛᴀɴᴛ {number} ᴀᴅᴅᴇᴅ ᴀs {userbot.clients[number].name}."
+    )
+
+
+@app.on_message(filters.command(["rmassistant", "removeassistant"]) & SUDOERS)
+async def remove_assistant(client, message: Message):
+    if len(message.command) != 2 or not message.command[1].isdigit():
+        return await message.reply_text(
+            "<b>ᴜsᴀɢᴇ :</b>\n\n/rmassistant [ᴀssɪsᴛᴀɴᴛ ɴᴜᴍʙᴇʀ]"
+        )
+    number = int(message.command[1])
+    if number not in assistants:
+        return await message.reply_text(f"» ᴀssɪsᴛᴀɴᴛ {number} ɪs ɴᴏᴛ ʀᴜɴɴɪɴɢ.")
+    if len(assistants) == 1:
+        return await message.reply_text("» ᴄᴀɴ'ᴛ ʀᴇᴍᴏᴠᴇ ᴛʜᴇ ʟᴀsᴛ ᴀssɪsᴛᴀɴᴛ.")
+    await Nand.remove(number)
+    await userbot.remove(number)
+    await delete_assistant_session(number)
+    text = f"» ᴀssɪsᴛᴀɴᴛ {number} ʀᴇᴍᴏᴠᴇᴅ."
+    if number in STRING_SESSIONS:
+        text += "\n\nɪᴛ ɪs sᴇᴛ ɪɴ ᴛʜᴇ ᴇɴᴠ ᴠᴀʀs ᴀɴᴅ ᴡɪʟʟ ᴄᴏᴍᴇ ʙᴀᴄᴋ ᴏɴ ʀᴇsᴛᴀʀᴛ."
+    await message.reply_text(text)
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -11,6 +11,7 @@ import requests
 
 from ShrutiMusic.utils import get_image, get_couple, save_couple
 from ShrutiMusic import app
+from ShrutiMusic.core.mediacache import send_photo
 
 
 # get current date in GMT+5:30 timezone
@@ -127,8 +128,9 @@ async def ctest(_, message):
 Nᴇxᴛ ᴄᴏᴜᴘʟᴇs ᴡɪʟʟ ʙᴇ sᴇʟᴇᴄᴛᴇᴅ ᴏɴ {tomorrow}!!</b>
             """
 
-            await message.reply_photo(
-                test_image_path,
+            await send_photo(
+                message.reply_photo,
+                photo=test_image_path,
                 caption=TXT,
                 reply_markup=InlineKeyboardMarkup(
                     [
@@ -164,8 +166,9 @@ Nᴇxᴛ ᴄᴏᴜᴘʟᴇs ᴡɪʟʟ ʙᴇ sᴇʟᴇᴄᴛᴇᴅ ᴏɴ {tomorro
 
 Nᴇxᴛ ᴄᴏᴜᴘʟᴇs ᴡɪʟʟ ʙᴇ sᴇʟᴇᴄᴛᴇᴅ ᴏɴ {tomorrow}!!</b>
             """
-            await message.reply_photo(
-                b,
+            await send_photo(
+                message.reply_photo,
+                photo=b,
                 caption=TXT,
                 reply_markup=InlineKeyboardMarkup(
                     [
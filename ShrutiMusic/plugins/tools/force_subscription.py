@@ -24,6 +24,7 @@ from pyrogram import Client, filters
 from pyrogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery, ChatPermissions
 from pymongo import MongoClient
 from ShrutiMusic import app
+from ShrutiMusic.core.mediacache import send_photo
 import asyncio
 from ShrutiMusic.misc import SUDOERS
 from config import MONGO_DB_URI
@@ -163,7 +164,8 @@ async def check_forcesub(client: Client, message: Message):
         else:
             invite_link = await app.export_chat_invite_link(channel_id)
             channel_url = invite_link
-        await message.reply_photo(
+        await send_photo(
+            message.reply_photo,
             photo="https://envs.sh/Tn_.jpg",
             caption=(f"**👋 ʜᴇʟʟᴏ {message.from_user.mention},**\n\n**ʏᴏᴜ ɴᴇᴇᴅ ᴛᴏ ᴊᴏɪɴ ᴛʜᴇ [ᴄʜᴀɴɴᴇʟ]({channel_url}) ᴛᴏ sᴇɴᴅ ᴍᴇssᴀɢᴇs ɪɴ ᴛʜɪs ɢʀᴏᴜᴘ.**"),
             reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("๏ ᴊᴏɪɴ ᴄʜᴀɴɴᴇʟ ๏", url=channel_url)]]),
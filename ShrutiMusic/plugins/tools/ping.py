@@ -27,6 +27,7 @@ from pyrogram.types import Message
 
 from ShrutiMusic import app
 from ShrutiMusic.core.call import Nand
+from ShrutiMusic.core.mediacache import send_photo
 from ShrutiMusic.utils import bot_sys_stats
 from ShrutiMusic.utils.decorators.language import language
 from ShrutiMusic.utils.inline import supp_markup
@@ -37,7 +38,8 @@ from config import BANNED_USERS, PING_IMG_URL
 @language
 async def ping_com(client, message: Message, _):
     start = datetime.now()
-    response = await message.reply_photo(
+    response = await send_photo(
+        message.reply_photo,
         photo=PING_IMG_URL,
         caption=_["ping_1"].format(app.mention),
     )
@@ -29,11 +29,13 @@ from pyrogram.types import CallbackQuery, InputMediaPhoto, Message
 
 import config
 from ShrutiMusic import app
+from ShrutiMusic.core.mediacache import edit_media, send_photo
 from ShrutiMusic.misc import db
 from ShrutiMusic.utils import NandBin, get_channeplayCB, seconds_to_min
 from ShrutiMusic.utils.database import get_cmode, is_active_chat, is_music_playing
 from ShrutiMusic.utils.decorators.language import language, languageCB
 from ShrutiMusic.utils.inline import queue_back_markup, queue_markup
+from ShrutiMusic.utils.stream.position import get_played
 from config import BANNED_USERS
 
 basic = {}
@@ -114,12 +116,12 @@ async def get_queue(client, message: Message, _):
             DUR,
             "c" if cplay else "g",
             videoid,
-            seconds_to_min(got[0]["played"]),
+            seconds_to_min(get_played(chat_id)),
             got[0]["dur"],
         )
     )
     basic[videoid] = True
-    mystic = await message.reply_photo(IMAGE, caption=cap, reply_markup=upl)
+    mystic = await send_photo(message.reply_photo, photo=IMAGE, caption=cap, reply_markup=upl)
     if DUR != "Unknown":
         try:
             while db[chat_id][0]["vidid"] == videoid:
@@ -133,7 +135,7 @@ async def get_queue(client, message: Message, _):
                                     DUR,
                                     "c" if cplay else "g",
                                     videoid,
-                                    seconds_to_min(db[chat_id][0]["played"]),
+                                    seconds_to_min(get_played(chat_id)),
                                     db[chat_id][0]["dur"],
                                 )
                                 await mystic.edit_reply_markup(reply_markup=buttons)
@@ -181,7 +183,7 @@ async def queued_tracks(client, CallbackQuery: CallbackQuery, _):
         media="https://telegra.ph//file/6f7d35131f69951c74ee5.jpg",
         caption=_["queue_1"],
     )
-    await CallbackQuery.edit_message_media(media=med)
+    await edit_media(CallbackQuery.edit_message_media, media=med)
     j = 0
     msg = ""
     for x in got:
@@ -200,7 +202,7 @@ async def queued_tracks(client, CallbackQuery: CallbackQuery, _):
             msg = msg.replace("✨", "")
         link = await NandBin(msg)
         med = InputMediaPhoto(media=link, caption=_["queue_3"].format(link))
-        await CallbackQuery.edit_message_media(media=med, reply_markup=buttons)
+        await edit_media(CallbackQuery.edit_message_media, media=med, reply_markup=buttons)
     else:
         await asyncio.sleep(1)
         return await CallbackQuery.edit_message_text(msg, reply_markup=buttons)
@@ -254,14 +256,14 @@ async def queue_back(client, CallbackQuery: CallbackQuery, _):
             DUR,
             cplay,
             videoid,
-            seconds_to_min(got[0]["played"]),
+            seconds_to_min(get_played(chat_id)),
             got[0]["dur"],
         )
     )
     basic[videoid] = True
 
     med = InputMediaPhoto(media=IMAGE, caption=cap)
-    mystic = await CallbackQuery.edit_message_media(media=med, reply_markup=upl)
+    mystic = await edit_media(CallbackQuery.edit_message_media, media=med, reply_markup=upl)
     if DUR != "Unknown":
         try:
             while db[chat_id][0]["vidid"] == videoid:
@@ -275,7 +277,7 @@ async def queue_back(client, CallbackQuery: CallbackQuery, _):
                                     DUR,
                                     cplay,
                                     videoid,
-                                    seconds_to_min(db[chat_id][0]["played"]),
+                                    seconds_to_min(get_played(chat_id)),
                                     db[chat_id][0]["dur"],
                                 )
                                 await mystic.edit_reply_markup(reply_markup=buttons)
@@ -27,6 +27,7 @@ from pyrogram import filters
 from pyrogram.types import Message
 
 from ShrutiMusic import app
+from ShrutiMusic.core.mediacache import send_photo
 from ShrutiMusic.misc import SUDOERS
 from ShrutiMusic.utils.decorators.language import language
 
@@ -63,7 +64,7 @@ async def speedtest_function(client, message: Message, _):
         result["server"]["latency"],
         result["ping"],
     )
-    msg = await message.reply_photo(photo=result["share"], caption=output)
+    msg = await send_photo(message.reply_photo, photo=result["share"], caption=output)
     await m.delete()
 
 
@@ -32,12 +32,16 @@ from pytgcalls.__version__ import __version__ as pytgver
 
 import config
 from ShrutiMusic import app
+from ShrutiMusic.core.executor import executor_stats
+from ShrutiMusic.core.mediacache import edit_media, send_photo
+from ShrutiMusic.core.scheduler import scheduler
 from ShrutiMusic.core.userbot import assistants
 from ShrutiMusic.misc import SUDOERS, mongodb
 from ShrutiMusic.plugins import ALL_MODULES
-from ShrutiMusic.utils.database import get_served_chats, get_served_users, get_sudoers,is_autoend,is_autoleave
+from ShrutiMusic.utils.database import get_sudoers, is_autoend, is_autoleave, served_chats_count, served_users_count
 from ShrutiMusic.utils.decorators.language import language, languageCB
 from ShrutiMusic.utils.inline.stats import back_stats_buttons, stats_buttons
+from ShrutiMusic.utils.stream.simulcast import simulcast
 from config import BANNED_USERS
 
 
@@ -45,7 +49,8 @@ from config import BANNED_USERS
 @language
 async def stats_global(client, message: Message, _):
     upl = stats_buttons(_, True if message.from_user.id in SUDOERS else False)
-    await message.reply_photo(
+    await send_photo(
+        message.reply_photo,
         photo=config.STATS_IMG_URL,
         caption=_["gstats_2"].format(app.mention),
         reply_markup=upl,
@@ -72,8 +77,8 @@ async def overall_stats(client, CallbackQuery, _):
     except:
         pass
     await CallbackQuery.edit_message_text(_["gstats_1"].format(app.mention))
-    served_chats = len(await get_served_chats())
-    served_users = len(await get_served_users())
+    served_chats = await served_chats_count()
+    served_users = await served_users_count()
     text = _["gstats_3"].format(
         app.mention,
         len(assistants),
@@ -88,9 +93,10 @@ async def overall_stats(client, CallbackQuery, _):
     )
     med = InputMediaPhoto(media=config.STATS_IMG_URL, caption=text)
     try:
-        await CallbackQuery.edit_message_media(media=med, reply_markup=upl)
+        await edit_media(CallbackQuery.edit_message_media, media=med, reply_markup=upl)
     except MessageIdInvalid:
-        await CallbackQuery.message.reply_photo(
+        await send_photo(
+            CallbackQuery.message.reply_photo,
             photo=config.STATS_IMG_URL, caption=text, reply_markup=upl
         )
 
@@ -124,8 +130,8 @@ async def bot_stats(client, CallbackQuery, _):
     call = await mongodb.command("dbstats")
     datasize = call["dataSize"] / 1024
     storage = call["storageSize"] / 1024
-    served_chats = len(await get_served_chats())
-    served_users = len(await get_served_users())
+    served_chats = await served_chats_count()
+    served_users = await served_users_count()
     text = _["gstats_5"].format(
         app.mention,
         len(ALL_MODULES),
@@ -149,11 +155,28 @@ async def bot_stats(client, CallbackQuery, _):
         call["collections"],
         call["objects"],
     )
+    for name, pool in executor_stats().items():
+        text += (
+            f"\n<b>{name} ᴡᴏʀᴋᴇʀꜱ :</b> <code>{pool['running']}/{pool['workers']} ʀᴜɴɴɪɴɢ, "
+            f"{pool['queued']} ǫᴜᴇᴜᴇᴅ, {pool['timeouts']} ᴛɪᴍᴇᴅ ᴏᴜᴛ</code>"
+        )
+    for number, load in scheduler.loads().items():
+        text += (
+            f"\n<b>ᴀssɪsᴛᴀɴᴛ {number} :</b> <code>{load['calls']} ᴄᴀʟʟs ({load['video']} ᴠɪᴅᴇᴏ), "
+            f"ᴄᴏsᴛ {load['cost']}, {load['chats']} ᴄʜᴀᴛs, {load['errors']} ᴇʀʀᴏʀs"
+            f"{'' if load['healthy'] else ', ᴀᴠᴏɪᴅᴇᴅ'}</code>"
+        )
+    shared = simulcast.stats()
+    text += (
+        f"\n<b>sʜᴀʀᴇᴅ ᴅᴇᴄᴏᴅᴇs :</b> <code>{shared['sessions']} ᴛʀᴀᴄᴋs, "
+        f"{shared['listeners']} ᴄʜᴀᴛs</code>"
+    )
     med = InputMediaPhoto(media=config.STATS_IMG_URL, caption=text)
     try:
-        await CallbackQuery.edit_message_media(media=med, reply_markup=upl)
+        await edit_media(CallbackQuery.edit_message_media, media=med, reply_markup=upl)
     except MessageIdInvalid:
-        await CallbackQuery.message.reply_photo(
+        await send_photo(
+            CallbackQuery.message.reply_photo,
             photo=config.STATS_IMG_URL, caption=text, reply_markup=upl
         )
 
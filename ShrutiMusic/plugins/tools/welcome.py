@@ -8,6 +8,7 @@ from ShrutiMusic import LOGGER
 from pyrogram.types import Message
 from ShrutiMusic.misc import SUDOERS
 from ShrutiMusic import app
+from ShrutiMusic.core.mediacache import send_photo
 from ShrutiMusic.utils.database import *
 from ShrutiMusic.utils.database import db
 
@@ -116,7 +117,8 @@ async def greet_group(_, member: ChatMemberUpdated):
         welcomeimg = welcomepic(
             pic, user.first_name, member.chat.title, user.id, user.username
         )
-        temp.MELCOW[f"welcome-{member.chat.id}"] = await app.send_photo(
+        temp.MELCOW[f"welcome-{member.chat.id}"] = await send_photo(
+            app.send_photo,
             member.chat.id,
             photo=welcomeimg,
             caption=f"""🌟 <b>ᴡᴇʟᴄᴏᴍᴇ {user.mention}!</b>
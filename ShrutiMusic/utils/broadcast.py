@@ -0,0 +1,295 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import asyncio
+import time
+
+from pyrogram.errors import (
+    ChannelInvalid,
+    ChannelPrivate,
+    ChatIdInvalid,
+    FloodWait,
+    InputUserDeactivated,
+    InternalServerError,
+    PeerIdInvalid,
+    UserIsBlocked,
+)
+
+import config
+from ShrutiMusic import app
+from ShrutiMusic.core.mongo import mongodb
+from ShrutiMusic.logging import LOGGER
+from ShrutiMusic.utils.database import (
+    delete_served_chat,
+    delete_served_user,
+    get_lang,
+    iter_served_chats,
+    iter_served_users,
+)
+from strings import get_string
+
+jobsdb = mongodb.broadcasts
+
+# targets that will never accept a message again
+DEAD = (
+    ChannelInvalid,
+    ChannelPrivate,
+    ChatIdInvalid,
+    InputUserDeactivated,
+    PeerIdInvalid,
+    UserIsBlocked,
+)
+# failures worth retrying, anything else ends the job for good
+TRANSIENT = (FloodWait, InternalServerError, OSError, asyncio.TimeoutError)
+BATCH = 200
+ATTEMPTS = 3
+PROGRESS_INTERVAL = 10
+
+TARGETS = {
+    "chats": (iter_served_chats, delete_served_chat),
+    "users": (iter_served_users, delete_served_user),
+}
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def block(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    async def take(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self.tokens = min(
+                    self.burst, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+bucket = TokenBucket(config.BROADCAST_RATE, config.BROADCAST_RATE)
+
+
+class BroadcastJob:
+    def __init__(self, doc: dict):
+        self.doc = doc
+        self.id = doc["_id"]
+        self.markup = None
+        self._reported = 0.0
+
+    async def save(self):
+        self.doc["ts"] = time.time()
+        await jobsdb.replace_one({"_id": self.id}, self.doc, upsert=True)
+
+    async def _send(self, chat_id: int):
+        doc = self.doc
+        if doc["mode"] == "forward":
+            return await app.forward_messages(
+                chat_id=chat_id,
+                from_chat_id=doc["from_chat_id"],
+                message_ids=doc["message_id"],
+            )
+        if doc["mode"] == "copy":
+            return await app.copy_message(
+                chat_id=chat_id,
+                from_chat_id=doc["from_chat_id"],
+                message_id=doc["message_id"],
+                reply_markup=self.markup,
+            )
+        return await app.send_message(chat_id, text=doc["text"])
+
+    async def _deliver(self, kind: str, chat_id: int, gate, stats: dict):
+        async with gate:
+            for _ in range(ATTEMPTS):
+                await bucket.take()
+                try:
+                    m = await self._send(chat_id)
+                except FloodWait as fw:
+                    bucket.block(int(fw.value))
+                    continue
+                except DEAD:
+                    await TARGETS[kind][1](chat_id)
+                    stats["pruned"] += 1
+                    return
+                except Exception:
+                    break
+                stats["sent"] += 1
+                if kind == "chats" and self.doc.get("pin"):
+                    try:
+                        await bucket.take()
+                        await m.pin(disable_notification=self.doc["pin"] == "quiet")
+                        stats["pinned"] += 1
+                    except Exception:
+                        pass
+                return
+            stats["failed"] += 1
+
+    async def _run_batch(self, kind: str, batch: list, gate, stats: dict):
+        await asyncio.gather(
+            *(self._deliver(kind, chat_id, gate, stats) for chat_id in batch)
+        )
+        self.doc["cursor"][kind] = batch[-1]
+        await self.save()
+        if time.monotonic() - self._reported >= PROGRESS_INTERVAL:
+            await self.report()
+
+    async def _run_targets(self, kind: str):
+        iterate = TARGETS[kind][0]
+        stats = self.doc["stats"].setdefault(
+            kind, {"sent": 0, "failed": 0, "pruned": 0, "pinned": 0}
+        )
+        gate = asyncio.Semaphore(config.BROADCAST_WORKERS)
+        batch = []
+        async for chat_id in iterate(after=self.doc["cursor"].get(kind)):
+            batch.append(chat_id)
+            if len(batch) >= BATCH:
+                await self._run_batch(kind, batch, gate, stats)
+                batch = []
+        if batch:
+            await self._run_batch(kind, batch, gate, stats)
+
+    async def report(self, final: bool = False, error: str = None):
+        self._reported = time.monotonic()
+        lines = []
+        for kind in self.doc["targets"]:
+            stats = self.doc["stats"].get(kind)
+            if not stats:
+                continue
+            lines.append(
+                f"<b>{kind}</b> : {stats['sent']} sent, {stats['failed']} failed, "
+                f"{stats['pruned']} removed"
+            )
+        if final:
+            _ = get_string(await get_lang(self.doc["status"][0]))
+            lines = []
+            chats = self.doc["stats"].get("chats")
+            users = self.doc["stats"].get("users")
+            if chats:
+                lines.append(_["broad_3"].format(chats["sent"], chats["pinned"]))
+            if users:
+                lines.append(_["broad_4"].format(users["sent"]))
+        if error:
+            lines.append(f"» ʙʀᴏᴀᴅᴄᴀsᴛ ꜰᴀɪʟᴇᴅ : {error}")
+        text = "\n".join(lines) or "» ʙʀᴏᴀᴅᴄᴀsᴛɪɴɢ..."
+        try:
+            await app.edit_message_text(
+                self.doc["status"][0], self.doc["status"][1], text
+            )
+        except Exception:
+            pass
+
+    async def _run(self):
+        if self.doc["mode"] == "copy":
+            source = await app.get_messages(
+                self.doc["from_chat_id"], self.doc["message_id"]
+            )
+            if not source or source.empty:
+                raise ValueError("source message is gone")
+            self.markup = source.reply_markup
+        for kind in self.doc["targets"]:
+            await self._run_targets(kind)
+        self.doc["done"] = True
+        await self.save()
+        await self.report(final=True)
+
+    async def _fail(self, error: Exception):
+        LOGGER(__name__).error(f"Broadcast {self.id} failed: {error}")
+        self.doc["done"] = True
+        self.doc["error"] = str(error)
+        try:
+            await self.save()
+        except Exception:
+            pass
+        await self.report(error=str(error))
+
+    async def run(self):
+        # the cursor is saved after every batch, so a retry picks up where it stopped
+        for attempt in range(ATTEMPTS):
+            try:
+                return await self._run()
+            except TRANSIENT as e:
+                wait = int(e.value) if isinstance(e, FloodWait) else 5 * 2**attempt
+                LOGGER(__name__).warning(
+                    f"Broadcast {self.id} interrupted, retrying in {wait}s: {e}"
+                )
+                await asyncio.sleep(wait)
+            except Exception as e:
+                return await self._fail(e)
+        LOGGER(__name__).error(f"Broadcast {self.id} paused until the next restart.")
+
+
+async def start_broadcast(
+    targets: list,
+    status,
+    mode: str,
+    from_chat_id: int = None,
+    message_id: int = None,
+    text: str = None,
+    pin: str = None,
+) -> BroadcastJob:
+    doc = {
+        "targets": targets,
+        "mode": mode,
+        "from_chat_id": from_chat_id,
+        "message_id": message_id,
+        "text": text,
+        "pin": pin,
+        "status": [status.chat.id, status.id],
+        "cursor": {},
+        "stats": {},
+        "done": False,
+        "ts": time.time(),
+    }
+    doc["_id"] = (await jobsdb.insert_one(doc)).inserted_id
+    job = BroadcastJob(doc)
+    asyncio.create_task(job.run())
+    return job
+
+
+async def resume_broadcasts():
+    async for doc in jobsdb.find({"done": False}):
+        LOGGER(__name__).info(f"Resuming broadcast {doc['_id']}.")
+        asyncio.create_task(BroadcastJob(doc).run())
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
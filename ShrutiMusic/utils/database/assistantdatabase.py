@@ -22,25 +22,18 @@
 
 import random
 
+import config
 from ShrutiMusic import userbot
 from ShrutiMusic.core.mongo import mongodb
 
 db = mongodb.assistants
+sessionsdb = mongodb.sessions
 
 assistantdict = {}
 
 
 async def get_client(assistant: int):
-    if int(assistant) == 1:
-        return userbot.one
-    elif int(assistant) == 2:
-        return userbot.two
-    elif int(assistant) == 3:
-        return userbot.three
-    elif int(assistant) == 4:
-        return userbot.four
-    elif int(assistant) == 5:
-        return userbot.five
+    return userbot.clients.get(int(assistant))
 
 
 async def save_assistant(chat_id, number):
@@ -126,16 +119,24 @@ async def group_assistant(self, chat_id: int) -> int:
             assis = assistant
         else:
             assis = await set_calls_assistant(chat_id)
-    if int(assis) == 1:
-        return self.one
-    elif int(assis) == 2:
-        return self.two
-    elif int(assis) == 3:
-        return self.three
-    elif int(assis) == 4:
-        return self.four
-    elif int(assis) == 5:
-        return self.five
+    return self.calls.get(int(assis))
+
+
+async def get_assistant_sessions() -> dict:
+    sessions = dict(config.STRING_SESSIONS)
+    async for doc in sessionsdb.find({}):
+        sessions.setdefault(doc["_id"], doc["session"])
+    return sessions
+
+
+async def save_assistant_session(number: int, session: str):
+    await sessionsdb.update_one(
+        {"_id": number}, {"$set": {"session": session}}, upsert=True
+    )
+
+
+async def delete_assistant_session(number: int):
+    await sessionsdb.delete_one({"_id": number})
 
 
 # ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
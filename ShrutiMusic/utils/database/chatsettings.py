@@ -0,0 +1,167 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import asyncio
+from collections import OrderedDict
+
+from pymongo import UpdateOne
+
+import config
+from ShrutiMusic.core.mongo import mongodb
+from ShrutiMusic.logging import LOGGER
+
+settingsdb = mongodb.chatsettings
+migrationsdb = mongodb.migrations
+
+DEFAULTS = {
+    "lang": "en",
+    "playmode": "Direct",
+    "playtype": "Everyone",
+    "cmode": None,
+    "skipmode": True,
+    "nonadmin": False,
+    "upvotes": 5,
+}
+
+
+class ChatSettings:
+    __slots__ = ("chat_id", *DEFAULTS)
+
+    def __init__(self, chat_id: int, doc: dict = None):
+        self.chat_id = chat_id
+        doc = doc or {}
+        for field, default in DEFAULTS.items():
+            setattr(self, field, doc.get(field, default))
+
+
+class SettingsCache:
+    def __init__(self, maxsize: int, interval: int):
+        self.maxsize = maxsize
+        self.interval = interval
+        self._data = OrderedDict()
+        self._dirty = {}
+        self._inflight = {}
+
+    async def get(self, chat_id: int) -> ChatSettings:
+        settings = self._data.get(chat_id)
+        if settings:
+            self._data.move_to_end(chat_id)
+            return settings
+        task = self._inflight.get(chat_id)
+        if not task:
+            task = asyncio.ensure_future(self._load(chat_id))
+            self._inflight[chat_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(chat_id, None))
+        return await asyncio.shield(task)
+
+    async def _load(self, chat_id: int) -> ChatSettings:
+        doc = await settingsdb.find_one({"_id": chat_id}) or {}
+        # writes not flushed yet win over what is stored
+        doc.update(self._dirty.get(chat_id, {}))
+        settings = ChatSettings(chat_id, doc)
+        self._data[chat_id] = settings
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return settings
+
+    async def set(self, chat_id: int, **fields):
+        settings = await self.get(chat_id)
+        for field, value in fields.items():
+            setattr(settings, field, value)
+        self._dirty.setdefault(chat_id, {}).update(fields)
+
+    async def flush(self):
+        if not self._dirty:
+            return
+        pending, self._dirty = self._dirty, {}
+        try:
+            await settingsdb.bulk_write(
+                [
+                    UpdateOne({"_id": chat_id}, {"$set": fields}, upsert=True)
+                    for chat_id, fields in pending.items()
+                ],
+                ordered=False,
+            )
+        except Exception as e:
+            LOGGER(__name__).warning(f"Failed to flush chat settings: {e}")
+            for chat_id, fields in pending.items():
+                self._dirty[chat_id] = {**fields, **self._dirty.get(chat_id, {})}
+
+    async def _flusher(self):
+        while not await asyncio.sleep(self.interval):
+            await self.flush()
+
+    async def start(self):
+        await migrate_settings()
+        asyncio.create_task(self._flusher())
+
+    async def stop(self):
+        await self.flush()
+
+
+async def migrate_settings():
+    if await migrationsdb.find_one({"_id": "chatsettings"}):
+        return
+    folded = {}
+
+    def fold(chat_id, field, value):
+        if isinstance(chat_id, int):
+            folded.setdefault(chat_id, {})[field] = value
+
+    async for doc in mongodb.language.find({}):
+        fold(doc.get("chat_id"), "lang", doc.get("lang"))
+    async for doc in mongodb.playmode.find({}):
+        fold(doc.get("chat_id"), "playmode", doc.get("mode"))
+    async for doc in mongodb.playtypedb.find({}):
+        fold(doc.get("chat_id"), "playtype", doc.get("mode"))
+    async for doc in mongodb.cplaymode.find({}):
+        fold(doc.get("chat_id"), "cmode", doc.get("mode"))
+    async for doc in mongodb.upcount.find({}):
+        fold(doc.get("chat_id"), "upvotes", doc.get("mode"))
+    async for doc in mongodb.skipmode.find({}):
+        fold(doc.get("chat_id"), "skipmode", False)
+    async for doc in mongodb.adminauth.find({}):
+        fold(doc.get("chat_id"), "nonadmin", True)
+
+    requests = [
+        UpdateOne({"_id": chat_id}, {"$setOnInsert": fields}, upsert=True)
+        for chat_id, fields in folded.items()
+    ]
+    for i in range(0, len(requests), 1000):
+        await settingsdb.bulk_write(requests[i : i + 1000], ordered=False)
+    await migrationsdb.insert_one({"_id": "chatsettings", "chats": len(folded)})
+    LOGGER(__name__).info(f"Migrated settings of {len(folded)} chats.")
+
+
+chat_settings = SettingsCache(config.SETTINGS_CACHE_SIZE, config.SETTINGS_FLUSH_INTERVAL)
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
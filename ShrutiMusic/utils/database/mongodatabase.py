@@ -20,13 +20,18 @@
 # Email: badboy809075@gmail.com
 
 
+import asyncio
+import time
 from typing import Dict, List, Union
 
+import config
 from ShrutiMusic.core.mongo import mongodb
+from ShrutiMusic.logging import LOGGER
 
 queriesdb = mongodb.queries
 userdb = mongodb.userstats
 chattopdb = mongodb.chatstats
+leaderboarddb = mongodb.leaderboards
 authuserdb = mongodb.authuser
 gbansdb = mongodb.gban
 sudoersdb = mongodb.sudoers
@@ -336,35 +341,91 @@ async def set_queries(mode: int):
 # Top Chats DB
 
 
+def _totals_pipeline(match: dict) -> list:
+    return [
+        {"$match": match},
+        {
+            "$project": {
+                "_id": 0,
+                "chat_id": 1,
+                "total": {
+                    "$sum": {
+                        "$map": {
+                            "input": {"$objectToArray": "$vidid"},
+                            "in": "$$this.v.spot",
+                        }
+                    }
+                },
+            }
+        },
+        {"$match": {"total": {"$gt": 0}}},
+        {"$sort": {"total": -1}},
+        {"$limit": config.LEADERBOARD_SIZE},
+    ]
+
+
+def _tracks_pipeline() -> list:
+    return [
+        {"$match": {"chat_id": {"$lt": 0}}},
+        {"$project": {"_id": 0, "played": {"$objectToArray": "$vidid"}}},
+        {"$unwind": "$played"},
+        {
+            "$group": {
+                "_id": "$played.k",
+                "spot": {"$sum": "$played.v.spot"},
+                "title": {"$first": "$played.v.title"},
+            }
+        },
+        {"$match": {"spot": {"$gt": 0}}},
+        {"$sort": {"spot": -1}},
+        {"$limit": config.LEADERBOARD_SIZE},
+    ]
+
+
+async def refresh_leaderboards():
+    boards = {
+        "chats": (chattopdb, _totals_pipeline({"chat_id": {"$lt": 0}})),
+        "users": (userdb, _totals_pipeline({"chat_id": {"$gt": 0}})),
+        "tracks": (chattopdb, _tracks_pipeline()),
+    }
+    for name, (collection, pipeline) in boards.items():
+        entries = await collection.aggregate(pipeline, allowDiskUse=True).to_list(
+            length=None
+        )
+        await leaderboarddb.replace_one(
+            {"_id": name}, {"entries": entries, "ts": time.time()}, upsert=True
+        )
+
+
+async def _leaderboard_refresher():
+    while True:
+        try:
+            await refresh_leaderboards()
+        except Exception as e:
+            LOGGER(__name__).warning(f"Failed to refresh leaderboards: {e}")
+        await asyncio.sleep(config.LEADERBOARD_INTERVAL)
+
+
+async def start_leaderboards():
+    asyncio.create_task(_leaderboard_refresher())
+
+
+async def _leaderboard(name: str) -> list:
+    board = await leaderboarddb.find_one({"_id": name})
+    if not board:
+        return []
+    return board["entries"]
+
+
 async def get_top_chats() -> dict:
-    results = {}
-    async for chat in chattopdb.find({"chat_id": {"$lt": 0}}):
-        chat_id = chat["chat_id"]
-        total = 0
-        for i in chat["vidid"]:
-            counts_ = chat["vidid"][i]["spot"]
-            if counts_ > 0:
-                total += counts_
-                results[chat_id] = total
-    return results
+    return {entry["chat_id"]: entry["total"] for entry in await _leaderboard("chats")}
 
 
 async def get_global_tops() -> dict:
-    results = {}
-    async for chat in chattopdb.find({"chat_id": {"$lt": 0}}):
-        for i in chat["vidid"]:
-            counts_ = chat["vidid"][i]["spot"]
-            title_ = chat["vidid"][i]["title"]
-            if counts_ > 0:
-                if i not in results:
-                    results[i] = {}
-                    results[i]["spot"] = counts_
-                    results[i]["title"] = title_
-                else:
-                    spot = results[i]["spot"]
-                    count_ = spot + counts_
-                    results[i]["spot"] = count_
-    return results
+    return {
+        entry["_id"]: {"spot": entry["spot"], "title": entry["title"]}
+        for entry in await _leaderboard("tracks")
+    }
 
 
 async def get_particulars(chat_id: int) -> Dict[str, int]:
@@ -375,16 +436,18 @@ async def get_particulars(chat_id: int) -> Dict[str, int]:
 
 
 async def get_particular_top(chat_id: int, name: str) -> Union[bool, dict]:
-    ids = await get_particulars(chat_id)
-    if name in ids:
-        return ids[name]
+    ids = await chattopdb.find_one(
+        {"chat_id": chat_id}, {f"vidid.{name}": 1, "_id": 0}
+    )
+    if ids:
+        return ids.get("vidid", {}).get(name)
 
 
-async def update_particular_top(chat_id: int, name: str, vidid: dict):
-    ids = await get_particulars(chat_id)
-    ids[name] = vidid
+async def update_particular_top(chat_id: int, name: str, title: str):
     await chattopdb.update_one(
-        {"chat_id": chat_id}, {"$set": {"vidid": ids}}, upsert=True
+        {"chat_id": chat_id},
+        {"$inc": {f"vidid.{name}.spot": 1}, "$set": {f"vidid.{name}.title": title}},
+        upsert=True,
     )
 
 
@@ -399,28 +462,31 @@ async def get_userss(chat_id: int) -> Dict[str, int]:
 
 
 async def get_user_top(chat_id: int, name: str) -> Union[bool, dict]:
-    ids = await get_userss(chat_id)
-    if name in ids:
-        return ids[name]
+    ids = await userdb.find_one({"chat_id": chat_id}, {f"vidid.{name}": 1, "_id": 0})
+    if ids:
+        return ids.get("vidid", {}).get(name)
 
 
-async def update_user_top(chat_id: int, name: str, vidid: dict):
-    ids = await get_userss(chat_id)
-    ids[name] = vidid
-    await userdb.update_one({"chat_id": chat_id}, {"$set": {"vidid": ids}}, upsert=True)
+async def update_user_top(chat_id: int, name: str, title: str):
+    await userdb.update_one(
+        {"chat_id": chat_id},
+        {"$inc": {f"vidid.{name}.spot": 1}, "$set": {f"vidid.{name}.title": title}},
+        upsert=True,
+    )
 
 
 async def get_topp_users() -> dict:
-    results = {}
-    async for chat in userdb.find({"chat_id": {"$gt": 0}}):
-        user_id = chat["chat_id"]
-        total = 0
-        for i in chat["vidid"]:
-            counts_ = chat["vidid"][i]["spot"]
-            if counts_ > 0:
-                total += counts_
-        results[user_id] = total
-    return results
+    return {entry["chat_id"]: entry["total"] for entry in await _leaderboard("users")}
+
+
+async def record_play(chat_id: int, user_id: int, name: str, title: str):
+    try:
+        await asyncio.gather(
+            update_particular_top(chat_id, name, title),
+            update_user_top(user_id, name, title),
+        )
+    except Exception as e:
+        LOGGER(__name__).warning(f"Failed to count play of {name}: {e}")
 
 
 # Gban Users
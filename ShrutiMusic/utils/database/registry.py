@@ -0,0 +1,152 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import asyncio
+from array import array
+from bisect import bisect_left
+
+from pymongo import DeleteOne, UpdateOne
+
+from ShrutiMusic.core.mongo import mongodb
+from ShrutiMusic.logging import LOGGER
+
+FLUSH_INTERVAL = 10
+MERGE_AT = 4096
+
+
+class IdRegistry:
+    def __init__(self, collection, field: str, query: dict):
+        self.collection = collection
+        self.field = field
+        self.query = query
+        self._ids = array("q")
+        self._recent = set()
+        self._added = set()
+        self._removed = set()
+
+    def __len__(self):
+        return len(self._ids) + len(self._recent)
+
+    def __contains__(self, value: int) -> bool:
+        if value in self._recent:
+            return True
+        i = bisect_left(self._ids, value)
+        return i < len(self._ids) and self._ids[i] == value
+
+    def _merge(self):
+        self._ids = array("q", sorted({*self._ids, *self._recent}))
+        self._recent.clear()
+
+    def add(self, value: int):
+        value = int(value)
+        if value in self:
+            return
+        self._recent.add(value)
+        self._added.add(value)
+        self._removed.discard(value)
+        if len(self._recent) >= MERGE_AT:
+            self._merge()
+
+    def remove(self, value: int):
+        value = int(value)
+        if value not in self:
+            return
+        if value in self._recent:
+            self._recent.discard(value)
+        else:
+            del self._ids[bisect_left(self._ids, value)]
+        self._removed.add(value)
+        self._added.discard(value)
+
+    async def load(self):
+        ids = []
+        cursor = self.collection.find(self.query, {self.field: 1, "_id": 0})
+        async for doc in cursor.batch_size(5000):
+            ids.append(doc[self.field])
+        self._ids = array("q", sorted(set(ids)))
+        self._recent.clear()
+        LOGGER(__name__).info(
+            f"Loaded {len(self._ids)} {self.collection.name} ids."
+        )
+
+    async def flush(self):
+        if not self._added and not self._removed:
+            return
+        added, self._added = self._added, set()
+        removed, self._removed = self._removed, set()
+        requests = [
+            UpdateOne(
+                {self.field: value},
+                {"$setOnInsert": {self.field: value}},
+                upsert=True,
+            )
+            for value in added
+        ] + [DeleteOne({self.field: value}) for value in removed]
+        try:
+            await self.collection.bulk_write(requests, ordered=False)
+        except Exception as e:
+            LOGGER(__name__).warning(
+                f"Failed to flush {self.collection.name} registry: {e}"
+            )
+            self._added |= added - self._removed
+            self._removed |= removed - self._added
+
+    async def stream(self, batch_size: int = 1000, after: int = None):
+        await self.flush()
+        query = self.query
+        if after is not None:
+            query = {"$and": [query, {self.field: {"$gt": after}}]}
+        cursor = self.collection.find(query, {self.field: 1, "_id": 0})
+        async for doc in cursor.sort(self.field, 1).batch_size(batch_size):
+            yield doc[self.field]
+
+    async def _flusher(self):
+        while not await asyncio.sleep(FLUSH_INTERVAL):
+            await self.flush()
+
+
+served_users = IdRegistry(mongodb.tgusersdb, "user_id", {"user_id": {"$gt": 0}})
+served_chats = IdRegistry(mongodb.chats, "chat_id", {"chat_id": {"$lt": 0}})
+registries = (served_users, served_chats)
+
+
+async def start_registries():
+    for registry in registries:
+        await registry.load()
+        asyncio.create_task(registry._flusher())
+
+
+async def flush_registries():
+    for registry in registries:
+        await registry.flush()
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -32,6 +32,7 @@ from pyrogram.errors import (
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from ShrutiMusic import YouTube, app
+from ShrutiMusic.core.mediacache import send_photo
 from ShrutiMusic.misc import SUDOERS
 from ShrutiMusic.utils.database import (
     get_assistant,
@@ -95,7 +96,8 @@ def PlayWrapper(command):
                 if "stream" in message.command:
                     return await message.reply_text(_["str_1"])
                 buttons = botplaylist_markup(_)
-                return await message.reply_photo(
+                return await send_photo(
+                    message.reply_photo,
                     photo=PLAYLIST_IMG_URL,
                     caption=_["play_18"],
                     reply_markup=InlineKeyboardMarkup(buttons),
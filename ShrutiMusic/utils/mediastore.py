@@ -0,0 +1,358 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import asyncio
+import json
+import os
+import time
+
+import config
+from ShrutiMusic.logging import LOGGER
+
+DOWNLOAD_DIR = "downloads"
+INDEX_FILE = os.path.join(DOWNLOAD_DIR, ".index.json")
+FRESH_GRACE = 300
+
+
+class MediaStore:
+    def __init__(self, root: str, quota: int, policy: str):
+        self.root = os.path.realpath(root)
+        self.quota = quota
+        self.policy = policy
+        self._index = {}
+        self._refs = {}
+        self._playing = {}
+        self._inflight = {}
+        self._waiters = {}
+        self._streams = {}
+        self._fresh = {}
+        self._dirty = False
+
+    def _key(self, path):
+        if not path or not isinstance(path, str):
+            return None
+        path = os.path.realpath(path)
+        if os.path.dirname(path) != self.root:
+            return None
+        return os.path.basename(path)
+
+    def _score(self, name):
+        entry = self._index[name]
+        if self.policy == "lfu":
+            return entry["hits"], entry["atime"]
+        return entry["atime"], entry["hits"]
+
+    @property
+    def size(self) -> int:
+        return sum(entry["size"] for entry in self._index.values())
+
+    def is_referenced(self, name) -> bool:
+        return (
+            self._refs.get(name, 0) > 0
+            or name in self._playing.values()
+            or self._fresh.get(name, 0) > time.time()
+        )
+
+    def _fetching(self) -> set:
+        return {self._key(path) for path in self._inflight}
+
+    def add(self, path):
+        name = self._key(path)
+        if not name or not os.path.isfile(path):
+            return
+        entry = self._index.get(name, {"hits": 0})
+        entry["size"] = os.path.getsize(path)
+        entry["atime"] = time.time()
+        entry["hits"] += 1
+        self._index[name] = entry
+        # a new download is kept until its queue entry acquires it
+        self._fresh[name] = time.time() + FRESH_GRACE
+        self._dirty = True
+        self.evict()
+
+    def touch(self, path):
+        name = self._key(path)
+        if not name:
+            return
+        if name not in self._index:
+            return self.add(path)
+        self._index[name]["atime"] = time.time()
+        self._index[name]["hits"] += 1
+        self._dirty = True
+
+    def acquire(self, path):
+        name = self._key(path)
+        if name:
+            self._refs[name] = self._refs.get(name, 0) + 1
+            self._fresh.pop(name, None)
+
+    def release(self, path):
+        name = self._key(path)
+        if not name or name not in self._refs:
+            return
+        self._refs[name] -= 1
+        if self._refs[name] <= 0:
+            self._refs.pop(name)
+        self.evict()
+
+    def set_playing(self, chat_id: int, path):
+        name = self._key(path)
+        previous = self._playing.pop(chat_id, None)
+        if name:
+            self._playing[chat_id] = name
+            self.touch(path)
+        if previous and previous != name:
+            self.evict()
+
+    def clear_playing(self, chat_id: int):
+        if self._playing.pop(chat_id, None):
+            self.evict()
+
+    def partial(self, path):
+        if path not in self._inflight:
+            return None
+        temp = path + ".part"
+        return temp if os.path.isfile(temp) else None
+
+    def is_fetching(self, path) -> bool:
+        return path in self._inflight
+
+    async def fetch(self, path, writer):
+        if os.path.isfile(path):
+            self.touch(path)
+            return path
+        task = self._start(path, writer)
+        self._wait(path)
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            self._abandon(path, task)
+            raise
+        finally:
+            self._unwait(path)
+
+    def _wait(self, path):
+        self._waiters[path] = self._waiters.get(path, 0) + 1
+
+    def _unwait(self, path):
+        self._waiters[path] -= 1
+        if not self._waiters[path]:
+            self._waiters.pop(path, None)
+
+    def _abandon(self, path, task):
+        # the last waiter walking away (e.g. a cancelled prefetch) stops the download
+        if self._waiters.get(path) == 1 and not task.done():
+            task.cancel()
+
+    def _hold_stream(self, path, task):
+        self._wait(path)
+        self._streams[path] = self._streams.get(path, 0) + 1
+        if self._streams[path] == 1:
+            task.add_done_callback(lambda _: self._drop_streams(path))
+
+    def _release_stream(self, path):
+        if not self._streams.get(path):
+            return
+        self._streams[path] -= 1
+        if not self._streams[path]:
+            self._streams.pop(path)
+        self._unwait(path)
+
+    def _drop_streams(self, path):
+        while self._streams.get(path):
+            self._release_stream(path)
+
+    def _start(self, path, writer):
+        task = self._inflight.get(path)
+        if not task:
+            task = asyncio.ensure_future(self._fetch(path, writer))
+            self._inflight[path] = task
+            task.add_done_callback(lambda _: self._inflight.pop(path, None))
+        return task
+
+    async def buffered(self, path, writer, size: int):
+        # returns as soon as `size` bytes are on disk, the rest keeps downloading
+        if os.path.isfile(path):
+            self.touch(path)
+            return path
+        task = self._start(path, writer)
+        temp = path + ".part"
+        self._wait(path)
+        try:
+            while not task.done():
+                if os.path.isfile(temp) and os.path.getsize(temp) >= size:
+                    # the stream stays a waiter until follow() has drained it
+                    self._hold_stream(path, task)
+                    return path
+                await asyncio.sleep(0.1)
+        except asyncio.CancelledError:
+            self._abandon(path, task)
+            raise
+        finally:
+            self._unwait(path)
+        if task.cancelled():
+            return None
+        return task.result()
+
+    async def _fetch(self, path, writer):
+        temp = path + ".part"
+        try:
+            if await writer(temp) and os.path.getsize(temp) > 0:
+                os.replace(temp, path)
+                self.add(path)
+                return path
+        except asyncio.CancelledError:
+            self._discard(temp)
+            raise
+        except Exception as e:
+            LOGGER(__name__).warning(f"Download failed for {path}: {e}")
+        self._discard(temp)
+        return None
+
+    @staticmethod
+    def _discard(temp):
+        try:
+            os.remove(temp)
+        except:
+            pass
+
+    async def follow(self, path, chunk_size: int = 65536, stall: int = 0):
+        temp = path + ".part"
+        task = self._inflight.get(path)
+        source = temp if task and os.path.isfile(temp) else path
+        waited = 0.0
+        try:
+            with open(source, "rb") as f:
+                while True:
+                    chunk = f.read(chunk_size)
+                    if chunk:
+                        waited = 0.0
+                        yield chunk
+                        continue
+                    if not task or task.done():
+                        if task and task.cancelled():
+                            raise IOError(f"Download cancelled for {path}")
+                        if task and not task.result():
+                            raise IOError(f"Download failed for {path}")
+                        chunk = f.read()
+                        if chunk:
+                            yield chunk
+                        return
+                    if stall and waited >= stall:
+                        raise IOError(f"Download stalled for {path}")
+                    await asyncio.sleep(0.2)
+                    waited += 0.2
+        finally:
+            self._release_stream(path)
+
+    def _remove(self, name):
+        self._index.pop(name, None)
+        self._fresh.pop(name, None)
+        try:
+            os.remove(os.path.join(self.root, name))
+        except:
+            pass
+        self._dirty = True
+
+    def evict(self):
+        fetching = self._fetching()
+        if self.quota == 0:
+            for name in list(self._index):
+                if not self.is_referenced(name) and name not in fetching:
+                    self._remove(name)
+            return
+        total = self.size
+        if total <= self.quota:
+            return
+        for name in sorted(self._index, key=self._score):
+            if total <= self.quota:
+                break
+            if self.is_referenced(name) or name in fetching:
+                continue
+            total -= self._index[name]["size"]
+            self._remove(name)
+        LOGGER(__name__).info(f"Media store trimmed to {total} bytes.")
+
+    def save(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        temp = INDEX_FILE + ".tmp"
+        try:
+            with open(temp, "w") as f:
+                json.dump(self._index, f)
+            os.replace(temp, INDEX_FILE)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Failed to save media index: {e}")
+
+    def rebuild(self):
+        os.makedirs(self.root, exist_ok=True)
+        try:
+            with open(INDEX_FILE) as f:
+                saved = json.load(f)
+        except:
+            saved = {}
+        self._index = {}
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.startswith(".") or not os.path.isfile(path):
+                continue
+            if name.endswith(".part"):
+                os.remove(path)
+                continue
+            stat = os.stat(path)
+            entry = saved.get(name) or {"hits": 0, "atime": stat.st_mtime}
+            entry["size"] = stat.st_size
+            self._index[name] = entry
+        self._dirty = True
+        self.evict()
+        self.save()
+        LOGGER(__name__).info(
+            f"Media Store Indexed ({len(self._index)} files, {self.size} bytes)."
+        )
+
+    async def start(self):
+        self.rebuild()
+        asyncio.create_task(self._flusher())
+
+    async def _flusher(self):
+        while not await asyncio.sleep(30):
+            self.save()
+
+
+media_store = MediaStore(
+    DOWNLOAD_DIR,
+    config.DOWNLOAD_CACHE_LIMIT * 1024 * 1024,
+    config.DOWNLOAD_CACHE_POLICY,
+)
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -0,0 +1,193 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Union
+
+from pymongo import UpdateOne
+
+import config
+from ShrutiMusic.core.mongo import mongodb
+from ShrutiMusic.logging import LOGGER
+
+try:
+    from py_yt import VideosSearch
+except ImportError:
+    from youtubesearchpython.__future__ import VideosSearch
+
+metadb = mongodb.ytmeta
+
+VIDEO_ID = re.compile(r"(?:v=|youtu\.be/|shorts/|live/)([0-9A-Za-z_-]{11})")
+BASE = "https://www.youtube.com/watch?v="
+
+
+def extract_video_id(link: str) -> Union[str, None]:
+    match = VIDEO_ID.search(link)
+    if match:
+        return match.group(1)
+    return None
+
+
+class MetaCache:
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._queries = OrderedDict()
+        self._inflight = {}
+        self._unsaved = {}
+        self._writer = None
+
+    def get(self, vidid: str) -> Union[dict, None]:
+        item = self._data.get(vidid)
+        if not item:
+            return None
+        stamp, result = item
+        if time.time() - stamp > self.ttl:
+            self._data.pop(vidid, None)
+            return None
+        self._data.move_to_end(vidid)
+        return result
+
+    def put(self, result: dict, stamp: float = None, persist: bool = True):
+        vidid = result.get("id")
+        if not vidid:
+            return
+        self._data[vidid] = (stamp or time.time(), result)
+        self._data.move_to_end(vidid)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        if persist:
+            self._unsaved[vidid] = result
+            if not self._writer or self._writer.done():
+                self._writer = asyncio.create_task(self._persist())
+
+    async def _persist(self):
+        # a search puts several results at once, so they share one bulk write
+        while self._unsaved:
+            await asyncio.sleep(1)
+            await self.flush()
+
+    async def flush(self):
+        if not self._unsaved:
+            return
+        unsaved, self._unsaved = self._unsaved, {}
+        now = time.time()
+        try:
+            await metadb.bulk_write(
+                [
+                    UpdateOne(
+                        {"_id": vidid},
+                        {"$set": {"data": result, "ts": now}},
+                        upsert=True,
+                    )
+                    for vidid, result in unsaved.items()
+                ],
+                ordered=False,
+            )
+        except Exception as e:
+            LOGGER(__name__).warning(f"Failed to save metadata cache: {e}")
+
+    async def _collapse(self, key, factory):
+        task = self._inflight.get(key)
+        if not task:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _search(self, query: str, limit: int) -> list:
+        results = VideosSearch(query, limit=limit)
+        found = (await results.next()).get("result") or []
+        for result in found:
+            self.put(result)
+        return found
+
+    async def fetch(self, vidid: str) -> Union[dict, None]:
+        result = self.get(vidid)
+        if result:
+            return result
+
+        async def _fetch():
+            for result in await self._search(BASE + vidid, 1):
+                return result
+
+        return await self._collapse(("id", vidid), _fetch)
+
+    async def lookup(self, link: str) -> Union[dict, None]:
+        vidid = extract_video_id(link)
+        if vidid:
+            return await self.fetch(vidid)
+        results = await self.search(link, 1)
+        return results[0] if results else None
+
+    async def search(self, query: str, limit: int = 1) -> list:
+        key = (query, limit)
+        ids = self._queries.get(key)
+        if ids and time.time() - ids[0] <= self.ttl:
+            cached = [self.get(vidid) for vidid in ids[1]]
+            if all(cached):
+                self._queries.move_to_end(key)
+                return cached
+
+        async def _query():
+            found = await self._search(query, limit)
+            self._queries[key] = (time.time(), [result["id"] for result in found])
+            while len(self._queries) > self.maxsize:
+                self._queries.popitem(last=False)
+            return found
+
+        return await self._collapse(("q",) + key, _query)
+
+    async def load(self):
+        count = 0
+        try:
+            cursor = (
+                metadb.find({"ts": {"$gt": time.time() - self.ttl}})
+                .sort("ts", -1)
+                .limit(self.maxsize)
+            )
+            async for doc in cursor:
+                self._data[doc["_id"]] = (doc["ts"], doc["data"])
+                self._data.move_to_end(doc["_id"], last=False)
+                count += 1
+        except Exception as e:
+            LOGGER(__name__).warning(f"Failed to warm metadata cache: {e}")
+        LOGGER(__name__).info(f"Metadata Cache Loaded ({count} videos).")
+
+
+meta_cache = MetaCache(config.META_CACHE_SIZE, config.META_CACHE_TTL)
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
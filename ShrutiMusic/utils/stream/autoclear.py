@@ -20,22 +20,12 @@
 # Email: badboy809075@gmail.com
 
 
-import os
-
-from config import autoclean
+from ShrutiMusic.utils.mediastore import media_store
 
 
 async def auto_clean(popped):
     try:
-        rem = popped["file"]
-        autoclean.remove(rem)
-        count = autoclean.count(rem)
-        if count == 0:
-            if "vid_" not in rem or "live_" not in rem or "index_" not in rem:
-                try:
-                    os.remove(rem)
-                except:
-                    pass
+        media_store.release(popped["file"])
     except:
         pass
 
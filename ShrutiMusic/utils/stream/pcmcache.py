@@ -0,0 +1,170 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import asyncio
+import os
+import time
+
+import config
+from ShrutiMusic.logging import LOGGER
+from ShrutiMusic.utils.mediastore import DOWNLOAD_DIR, media_store
+
+PCM_DIR = os.path.join(DOWNLOAD_DIR, "pcm")
+RATE = 48000
+# what pytgcalls feeds a voice chat: 16 bit little endian mono at 48 kHz
+RAW_INPUT = ["-f", "s16le", "-ar", str(RATE), "-ac", "1"]
+
+
+class PcmCache:
+    def __init__(self, root: str, quota: int):
+        self.root = os.path.realpath(root)
+        self.quota = quota
+        self._index = {}
+        self._jobs = {}
+        self._budget = None
+
+    def _name(self, path):
+        if not path or not isinstance(path, str):
+            return None
+        path = os.path.realpath(path)
+        if os.path.dirname(path) != media_store.root:
+            return None
+        return os.path.basename(path) + ".pcm"
+
+    def lookup(self, path):
+        name = self._name(path)
+        if not name or name not in self._index:
+            return None
+        raw = os.path.join(self.root, name)
+        if not os.path.isfile(raw):
+            self._index.pop(name, None)
+            return None
+        self._index[name]["atime"] = time.time()
+        return raw
+
+    def schedule(self, path):
+        name = self._name(path)
+        if (
+            self.quota <= 0
+            or not name
+            or name in self._index
+            or name in self._jobs
+            or not os.path.isfile(path)
+            or media_store.is_fetching(path)
+        ):
+            return
+        self._jobs[name] = asyncio.create_task(self._convert(path, name))
+
+    def output(self, path):
+        # the file a running conversion writes to, started here if it is not yet
+        self.schedule(path)
+        name = self._name(path)
+        job = self._jobs.get(name)
+        if not job:
+            return None
+        temp = os.path.join(self.root, name) + ".part"
+        if self._budget and self._budget.locked() and not os.path.exists(temp):
+            # still queued behind other conversions, nothing to read yet
+            return None
+        return temp, job
+
+    async def _convert(self, path, name) -> bool:
+        if self._budget is None:
+            self._budget = asyncio.Semaphore(max(config.PCM_CACHE_WORKERS, 1))
+        raw = os.path.join(self.root, name)
+        temp = raw + ".part"
+        try:
+            async with self._budget:
+                proc = await asyncio.create_subprocess_exec(
+                    "ffmpeg",
+                    "-nostdin",
+                    "-y",
+                    "-loglevel",
+                    "error",
+                    "-i",
+                    path,
+                    "-threads",
+                    "1",
+                    "-vn",
+                    *RAW_INPUT,
+                    temp,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                _, error = await proc.communicate()
+            if proc.returncode != 0:
+                LOGGER(__name__).warning(
+                    f"PCM conversion failed for {path}: {error.decode()[-200:]}"
+                )
+                return False
+            os.replace(temp, raw)
+            self._index[name] = {"size": os.path.getsize(raw), "atime": time.time()}
+            self.evict()
+            return True
+        finally:
+            self._jobs.pop(name, None)
+            if os.path.exists(temp):
+                os.remove(temp)
+
+    def _in_use(self, name) -> bool:
+        # a chat playing the source may be reading its converted copy
+        return media_store.is_referenced(name[: -len(".pcm")])
+
+    def evict(self):
+        total = sum(entry["size"] for entry in self._index.values())
+        if total <= self.quota:
+            return
+        for name in sorted(self._index, key=lambda n: self._index[n]["atime"]):
+            if total <= self.quota:
+                break
+            if self._in_use(name):
+                continue
+            total -= self._index.pop(name)["size"]
+            try:
+                os.remove(os.path.join(self.root, name))
+            except OSError:
+                pass
+
+    async def start(self):
+        os.makedirs(self.root, exist_ok=True)
+        for name in os.listdir(self.root):
+            raw = os.path.join(self.root, name)
+            if not name.endswith(".pcm"):
+                os.remove(raw)
+                continue
+            stat = os.stat(raw)
+            self._index[name] = {"size": stat.st_size, "atime": stat.st_mtime}
+        self.evict()
+        LOGGER(__name__).info(f"PCM Cache Indexed ({len(self._index)} tracks).")
+
+
+pcm_cache = PcmCache(PCM_DIR, config.PCM_CACHE_LIMIT * 1024 * 1024)
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
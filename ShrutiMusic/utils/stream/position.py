@@ -0,0 +1,85 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import time
+
+from ShrutiMusic.misc import db
+
+positions = {}
+
+
+class Position:
+    __slots__ = ("started", "offset", "paused_at", "paused")
+
+    def __init__(self, offset: int = 0):
+        self.started = time.monotonic()
+        self.offset = offset
+        self.paused_at = None
+        self.paused = 0.0
+
+    def elapsed(self) -> float:
+        now = self.paused_at or time.monotonic()
+        return self.offset + (now - self.started - self.paused)
+
+
+def start_position(chat_id: int, offset: int = 0):
+    positions[chat_id] = Position(offset)
+
+
+def pause_position(chat_id: int):
+    position = positions.get(chat_id)
+    if position and not position.paused_at:
+        position.paused_at = time.monotonic()
+
+
+def resume_position(chat_id: int):
+    position = positions.get(chat_id)
+    if position and position.paused_at:
+        position.paused += time.monotonic() - position.paused_at
+        position.paused_at = None
+
+
+def clear_position(chat_id: int):
+    positions.pop(chat_id, None)
+
+
+def get_played(chat_id: int) -> int:
+    position = positions.get(chat_id)
+    playing = db.get(chat_id)
+    if not position or not playing:
+        return 0
+    duration = int(playing[0]["seconds"])
+    if duration == 0:
+        return 0
+    return max(0, min(int(position.elapsed()), duration))
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -0,0 +1,80 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+
+import asyncio
+
+import config
+from ShrutiMusic import YouTube
+from ShrutiMusic.logging import LOGGER
+from ShrutiMusic.misc import db
+
+prefetches = {}
+_budget = None
+
+
+def _wanted(chat_id, start):
+    wanted = []
+    queue = db.get(chat_id)
+    if not queue:
+        return wanted
+    for track in queue.upcoming(1 + config.PREFETCH_DEPTH - start, start):
+        if "vid_" not in str(track.get("file")):
+            continue
+        key = (track["vidid"], track["streamtype"] == "video")
+        if key not in wanted:
+            wanted.append(key)
+    return wanted
+
+
+async def _prefetch(vidid, video):
+    global _budget
+    if _budget is None:
+        _budget = asyncio.Semaphore(max(config.PREFETCH_WORKERS, 1))
+    async with _budget:
+        file_path, _ = await YouTube.download(
+            vidid, None, videoid=True, video=video
+        )
+    if not file_path:
+        LOGGER(__name__).warning(f"Prefetch failed for {vidid}")
+
+
+def schedule_prefetch(chat_id):
+    if config.PREFETCH_DEPTH <= 0:
+        return
+    wanted = _wanted(chat_id, 1)
+    # a prefetch that just became the head is being awaited by playback, keep it
+    keep = wanted + _wanted(chat_id, 0)[:1]
+    tasks = prefetches.setdefault(chat_id, {})
+    for key in list(tasks):
+        if key not in keep:
+            tasks.pop(key).cancel()
+    for key in wanted:
+        if key not in tasks:
+            tasks[key] = asyncio.create_task(_prefetch(*key))
+    if not tasks:
+        prefetches.pop(chat_id, None)
+
+
+def cancel_prefetch(chat_id):
+    for task in prefetches.pop(chat_id, {}).values():
+        task.cancel()
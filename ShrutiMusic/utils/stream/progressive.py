@@ -0,0 +1,93 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import os
+from urllib.parse import quote
+
+from aiohttp import web
+
+import config
+from ShrutiMusic.logging import LOGGER
+from ShrutiMusic.utils.mediastore import media_store
+
+
+class ProgressiveServer:
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    def source(self, path):
+        # ffmpeg hits EOF on a growing file, so in-flight downloads are piped over http
+        if not self._runner or not media_store.is_fetching(path):
+            return path
+        name = os.path.basename(path)
+        return f"http://{self.host}:{self.port}/media/{quote(name)}"
+
+    async def _serve(self, request):
+        path = os.path.join(media_store.root, os.path.basename(request.match_info["name"]))
+        if not media_store.is_fetching(path):
+            if os.path.isfile(path):
+                return web.FileResponse(path)
+            raise web.HTTPNotFound()
+        response = web.StreamResponse()
+        response.content_type = "application/octet-stream"
+        await response.prepare(request)
+        try:
+            # response.write waits on the socket, so a slow reader holds us back
+            async for chunk in media_store.follow(
+                path, stall=config.PROGRESSIVE_STALL_TIMEOUT
+            ):
+                await response.write(chunk)
+        except IOError as e:
+            LOGGER(__name__).warning(f"Progressive stream ended early: {e}")
+            return response
+        await response.write_eof()
+        return response
+
+    async def start(self):
+        if config.PROGRESSIVE_BUFFER <= 0:
+            return
+        server = web.Application()
+        server.router.add_get("/media/{name}", self._serve)
+        self._runner = web.AppRunner(server, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+progressive = ProgressiveServer(config.PROGRESSIVE_HOST, config.PROGRESSIVE_PORT)
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
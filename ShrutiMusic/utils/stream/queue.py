@@ -23,9 +23,14 @@
 import asyncio
 from typing import Union
 
+from ShrutiMusic.core.executor import run_in_thread
+from ShrutiMusic.core.playqueue import Track
 from ShrutiMusic.misc import db
+from ShrutiMusic.utils.database.mongodatabase import record_play
 from ShrutiMusic.utils.formatters import check_duration, seconds_to_min
-from config import autoclean, time_to_seconds
+from ShrutiMusic.utils.mediastore import media_store
+from ShrutiMusic.utils.stream.prefetch import schedule_prefetch
+from config import time_to_seconds
 
 
 async def put_queue(
@@ -45,28 +50,30 @@ async def put_queue(
         duration_in_seconds = time_to_seconds(duration) - 3
     except:
         duration_in_seconds = 0
-    put = {
-        "title": title,
-        "dur": duration,
-        "streamtype": stream,
-        "by": user,
-        "user_id": user_id,
-        "chat_id": original_chat_id,
-        "file": file,
-        "vidid": vidid,
-        "seconds": duration_in_seconds,
-        "played": 0,
-    }
-    if forceplay:
-        check = db.get(chat_id)
-        if check:
-            check.insert(0, put)
+    put = Track(
+        title=title,
+        dur=duration,
+        streamtype=stream,
+        by=user,
+        user_id=user_id,
+        chat_id=original_chat_id,
+        file=file,
+        vidid=vidid,
+        seconds=duration_in_seconds,
+    )
+    async with db.lock(chat_id):
+        if forceplay:
+            check = db.get(chat_id)
+            if check:
+                check.appendleft(put)
+            else:
+                db[chat_id] = [put]
         else:
-            db[chat_id] = []
             db[chat_id].append(put)
-    else:
-        db[chat_id].append(put)
-    autoclean.append(file)
+    media_store.acquire(file)
+    schedule_prefetch(chat_id)
+    if vidid not in ("telegram", "soundcloud"):
+        asyncio.create_task(record_play(original_chat_id, user_id, vidid, title))
 
 
 async def put_queue_index(
@@ -82,35 +89,32 @@ async def put_queue_index(
 ):
     if "20.212.146.162" in vidid:
         try:
-            dur = await asyncio.get_event_loop().run_in_executor(
-                None, check_duration, vidid
-            )
+            dur = await run_in_thread(check_duration, vidid)
             duration = seconds_to_min(dur)
         except:
             duration = "ᴜʀʟ sᴛʀᴇᴀᴍ"
             dur = 0
     else:
         dur = 0
-    put = {
-        "title": title,
-        "dur": duration,
-        "streamtype": stream,
-        "by": user,
-        "chat_id": original_chat_id,
-        "file": file,
-        "vidid": vidid,
-        "seconds": dur,
-        "played": 0,
-    }
-    if forceplay:
-        check = db.get(chat_id)
-        if check:
-            check.insert(0, put)
+    put = Track(
+        title=title,
+        dur=duration,
+        streamtype=stream,
+        by=user,
+        chat_id=original_chat_id,
+        file=file,
+        vidid=vidid,
+        seconds=dur,
+    )
+    async with db.lock(chat_id):
+        if forceplay:
+            check = db.get(chat_id)
+            if check:
+                check.appendleft(put)
+            else:
+                db[chat_id] = [put]
         else:
-            db[chat_id] = []
             db[chat_id].append(put)
-    else:
-        db[chat_id].append(put)
 
 
 # ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
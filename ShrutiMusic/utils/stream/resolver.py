@@ -22,29 +22,28 @@
 
 import asyncio
 
-from ShrutiMusic.misc import db
-from ShrutiMusic.utils.database import get_active_chats, is_music_playing
-
-
-async def timer():
-    while not await asyncio.sleep(1):
-        active_chats = await get_active_chats()
-        for chat_id in active_chats:
-            if not await is_music_playing(chat_id):
-                continue
-            playing = db.get(chat_id)
-            if not playing:
-                continue
-            duration = int(playing[0]["seconds"])
-            if duration == 0:
-                continue
-            if db[chat_id][0]["played"] >= duration:
-                continue
-            db[chat_id][0]["played"] += 1
-
-
-asyncio.create_task(timer())
-
+import config
+from ShrutiMusic import YouTube
+
+
+async def resolve_tracks(items, videoid: bool):
+    # lookups run ahead concurrently, results still come back in playlist order
+    budget = asyncio.Semaphore(max(config.PLAYLIST_RESOLVE_WORKERS, 1))
+
+    async def lookup(item):
+        async with budget:
+            try:
+                return await YouTube.details(item, videoid)
+            except Exception:
+                return None
+
+    tasks = [asyncio.create_task(lookup(item)) for item in items]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
 
 # ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
 
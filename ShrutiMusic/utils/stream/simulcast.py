@@ -0,0 +1,266 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import asyncio
+import hashlib
+import os
+import shutil
+
+from pytgcalls.types.input_stream import InputAudioStream, InputStream
+from pytgcalls.types.input_stream.quality import HighQualityAudio
+
+import config
+from ShrutiMusic.logging import LOGGER
+from ShrutiMusic.utils.mediastore import media_store
+from ShrutiMusic.utils.stream.pcmcache import RATE, RAW_INPUT, pcm_cache
+
+SPOOL_DIR = os.path.join("cache", "simulcast")
+BYTES_PER_SECOND = RATE * 2
+
+
+class Session:
+    __slots__ = ("key", "spool", "task", "listeners", "failed", "owned")
+
+    def __init__(self, key, spool, task, owned: bool):
+        self.key = key
+        self.spool = spool
+        self.task = task
+        self.owned = owned
+        # chat_id -> loop time the chat started reading from the top
+        self.listeners = {}
+        self.failed = False
+        task.add_done_callback(self._finished)
+
+    def _finished(self, task):
+        if task.cancelled() or task.exception() or not task.result():
+            self.failed = True
+
+
+class Simulcast:
+    def __init__(self, root: str, lead: int):
+        self.root = root
+        self.lead = lead
+        self.sessions = {}
+        self.listening = {}
+        # chat_id -> file that chat decodes on its own from the start
+        self.solo = {}
+        # set by Call, moves a listener to its own decode at a position
+        self.fallback = None
+        self._swept = False
+
+    def shareable(self, path) -> bool:
+        return (
+            config.SIMULCAST
+            and isinstance(path, str)
+            and os.path.isfile(path)
+            and not media_store.is_fetching(path)
+        )
+
+    async def stream(self, chat_id: int, path, offset: int = 0):
+        # returns None when the chat is better off running its own decode
+        raw = pcm_cache.lookup(path)
+        if raw and not offset:
+            self.leave(chat_id)
+            return InputStream(InputAudioStream(raw, HighQualityAudio()))
+        if not isinstance(path, str):
+            self.leave(chat_id)
+            return None
+        key = (os.path.realpath(path), int(offset))
+        session = self.sessions.get(key)
+        if not session or session.failed:
+            session = self._open(key, chat_id)
+        if not session:
+            self.leave(chat_id)
+            if not offset:
+                self.solo[chat_id] = key[0]
+            return None
+        previous = self.listening.get(chat_id)
+        self.solo.pop(chat_id, None)
+        self.listening[chat_id] = key
+        session.listeners[chat_id] = None
+        if previous and previous != key:
+            self._drop(previous, chat_id)
+        try:
+            await self._ahead(session)
+        except Exception:
+            self.leave(chat_id)
+            raise
+        session.listeners[chat_id] = asyncio.get_running_loop().time()
+        if not session.owned and session.task.done():
+            # the conversion finished meanwhile and moved its output into the cache
+            raw = pcm_cache.lookup(path)
+            if raw:
+                self.leave(chat_id)
+                return InputStream(InputAudioStream(raw, HighQualityAudio()))
+        # pytgcalls reads raw PCM paths itself, so listeners cost no ffmpeg
+        return InputStream(InputAudioStream(session.spool, HighQualityAudio()))
+
+    def _open(self, key, chat_id: int):
+        path, offset = key
+        if not offset:
+            # the PCM conversion is the shared decode, listeners read its output
+            # while it grows and the finished copy replaces it in place
+            output = pcm_cache.output(path)
+            if output:
+                return self._start(key, output[0], output[1], owned=False)
+            # without a conversion, a spool only pays off once a second chat plays it
+            others = [solo for other, solo in self.solo.items() if other != chat_id]
+            if not self.shareable(path) or key[0] not in others:
+                return None
+            source = ["-i", path]
+        else:
+            # a seek into a converted copy is a byte copy, anything else decodes alone
+            raw = pcm_cache.lookup(path)
+            if not raw:
+                return None
+            source = [*RAW_INPUT, "-i", raw]
+        if not self._swept:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self._swept = True
+        os.makedirs(self.root, exist_ok=True)
+        name = hashlib.md5(f"{path}:{offset}".encode()).hexdigest()
+        spool = os.path.abspath(os.path.join(self.root, f"{name}.pcm"))
+        task = asyncio.create_task(self._decode(path, offset, source, spool))
+        return self._start(key, spool, task, owned=True)
+
+    def _start(self, key, spool, task, owned: bool):
+        session = self.sessions[key] = Session(key, spool, task, owned)
+        asyncio.create_task(self._guard(session))
+        return session
+
+    async def _decode(self, path, offset, source, spool) -> bool:
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-nostdin",
+            "-y",
+            "-loglevel",
+            "error",
+            "-ss",
+            str(offset),
+            *source,
+            *RAW_INPUT,
+            spool,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, error = await proc.communicate()
+        except asyncio.CancelledError:
+            if proc.returncode is None:
+                proc.kill()
+            raise
+        if proc.returncode != 0:
+            LOGGER(__name__).warning(
+                f"Shared decode failed for {path}: {error.decode()[-200:]}"
+            )
+            return False
+        return True
+
+    async def _ahead(self, session):
+        # the reader stops at end of file, so start a few seconds behind the decode
+        waited = 0.0
+        while True:
+            if session.failed:
+                raise RuntimeError(f"Shared decode failed for {session.key[0]}")
+            if session.task.done():
+                return
+            if os.path.isfile(session.spool) and os.path.getsize(session.spool) >= self.lead:
+                return
+            if waited >= config.SIMULCAST_TIMEOUT:
+                raise asyncio.TimeoutError(f"Shared decode too slow for {session.key[0]}")
+            await asyncio.sleep(0.05)
+            waited += 0.05
+
+    async def _guard(self, session):
+        # listeners read in real time, so a decode that slows down on a loaded
+        # host hands them over to their own decode before they reach its end
+        loop = asyncio.get_running_loop()
+        while not session.task.done():
+            await asyncio.sleep(0.5)
+            try:
+                produced = os.path.getsize(session.spool)
+            except OSError:
+                continue
+            now = loop.time()
+            for chat_id, joined in list(session.listeners.items()):
+                if joined and produced < (now - joined + 1) * BYTES_PER_SECOND:
+                    self._fall_back(session, chat_id, now - joined)
+        if session.failed:
+            now = loop.time()
+            for chat_id, joined in list(session.listeners.items()):
+                if joined:
+                    self._fall_back(session, chat_id, now - joined)
+
+    def _fall_back(self, session, chat_id: int, elapsed: float):
+        path, offset = session.key
+        LOGGER(__name__).warning(f"Shared decode fell behind in {chat_id}, decoding alone.")
+        self.leave(chat_id)
+        self.solo[chat_id] = path
+        if self.fallback:
+            asyncio.create_task(self.fallback(chat_id, path, offset + int(elapsed)))
+
+    def leave(self, chat_id: int):
+        self.solo.pop(chat_id, None)
+        key = self.listening.pop(chat_id, None)
+        if key:
+            self._drop(key, chat_id)
+
+    def _drop(self, key, chat_id: int):
+        session = self.sessions.get(key)
+        if not session:
+            return
+        session.listeners.pop(chat_id, None)
+        if not session.listeners:
+            # the old stream may still be reading while its replacement starts
+            asyncio.get_running_loop().call_later(5, self._close, session)
+
+    def _close(self, session):
+        if session.listeners or self.sessions.get(session.key) is not session:
+            return
+        self.sessions.pop(session.key)
+        if not session.owned:
+            # the PCM cache keeps converting for the next play
+            return
+        session.task.cancel()
+        try:
+            os.remove(session.spool)
+        except OSError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self.sessions),
+            "listeners": sum(len(s.listeners) for s in self.sessions.values()),
+        }
+
+
+simulcast = Simulcast(SPOOL_DIR, config.SIMULCAST_LEAD * BYTES_PER_SECOND)
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -0,0 +1,213 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import asyncio
+import os
+import re
+
+from pymongo import DeleteOne, ReplaceOne, UpdateOne
+
+import config
+from ShrutiMusic import YouTube
+from ShrutiMusic.core.call import Nand
+from ShrutiMusic.core.mongo import mongodb
+from ShrutiMusic.core.playqueue import Track
+from ShrutiMusic.logging import LOGGER
+from ShrutiMusic.misc import db
+from ShrutiMusic.utils.database.database import active, loop, music_off, pause
+from ShrutiMusic.utils.mediastore import media_store
+from ShrutiMusic.utils.stream.position import get_played
+from ShrutiMusic.utils.stream.prefetch import schedule_prefetch
+
+playbackdb = mongodb.playback
+
+# telegram message handles can't outlive the process
+TRANSIENT = ("mystic", "markup")
+YOUTUBE_ID = re.compile(r"[\w-]{11}")
+
+
+def _state(chat_id):
+    queue = db.get(chat_id)
+    if not queue:
+        return None
+    tracks = []
+    for track in queue:
+        fields = track.to_dict()
+        for key in TRANSIENT:
+            fields.pop(key, None)
+        tracks.append(fields)
+    return {
+        "tracks": tracks,
+        "loop": loop.get(chat_id, 0),
+        "paused": pause.get(chat_id) is False,
+    }
+
+
+def _revive(fields):
+    track = Track(**fields)
+    file = str(track["file"])
+    if track.get("old_dur"):
+        track["dur"] = track["old_dur"]
+        track["seconds"] = track["old_second"]
+        track["speed_path"] = None
+        track["speed"] = 1.0
+    if "vid_" in file or "live_" in file or "index_" in file:
+        return track
+    if os.path.exists(file):
+        return track
+    # downloads may have been wiped, youtube tracks can be fetched again
+    if YOUTUBE_ID.fullmatch(str(track.get("vidid"))):
+        track["file"] = f"vid_{track['vidid']}"
+        return track
+    return None
+
+
+async def _source(track, video):
+    file = str(track["file"])
+    if "live_" in file:
+        n, link = await YouTube.video(track["vidid"], True)
+        return link if n else None
+    if "vid_" in file:
+        file_path, _ = await YouTube.download(
+            track["vidid"], None, videoid=True, video=video
+        )
+        return file_path
+    if "index_" in file:
+        return track["vidid"]
+    return file
+
+
+class Snapshots:
+    def __init__(self, interval: int):
+        self.interval = interval
+        self._written = {}
+        self._task = None
+
+    async def flush(self):
+        requests = []
+        written = {}
+        for chat_id in list(active):
+            state = _state(chat_id)
+            if not state:
+                continue
+            played = get_played(chat_id)
+            last = self._written.get(chat_id)
+            if not last or last[0] != state:
+                requests.append(
+                    ReplaceOne(
+                        {"_id": chat_id}, {**state, "played": played}, upsert=True
+                    )
+                )
+            elif last[1] != played:
+                requests.append(
+                    UpdateOne({"_id": chat_id}, {"$set": {"played": played}})
+                )
+            written[chat_id] = (state, played)
+        for chat_id in self._written:
+            if chat_id not in written:
+                requests.append(DeleteOne({"_id": chat_id}))
+        if requests:
+            try:
+                await playbackdb.bulk_write(requests, ordered=False)
+            except Exception as e:
+                LOGGER(__name__).warning(f"Failed to snapshot queues: {e}")
+                return
+        self._written = written
+
+    async def _flusher(self):
+        while not await asyncio.sleep(self.interval):
+            await self.flush()
+
+    async def _resume(self, doc) -> bool:
+        chat_id = doc["_id"]
+        head = doc["tracks"][0] if doc.get("tracks") else {}
+        offset = int(doc.get("played", 0) * (head.get("speed") or 1.0))
+        tracks = [track for track in map(_revive, doc.get("tracks", [])) if track]
+        if not tracks:
+            return False
+        head = tracks[0]
+        video = str(head["streamtype"]) == "video"
+        if not int(head.get("seconds") or 0):
+            offset = 0
+        acquired = []
+        try:
+            link = await _source(head, video)
+            if not link:
+                return False
+            db[chat_id] = tracks
+            for track in tracks:
+                media_store.acquire(track["file"])
+                acquired.append(track["file"])
+            loop[chat_id] = doc.get("loop", 0)
+            await Nand.join_call(
+                chat_id, head["chat_id"], link, video=video, offset=offset
+            )
+            if doc.get("paused"):
+                await Nand.pause_stream(chat_id)
+                await music_off(chat_id)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Could not resume playback in {chat_id}: {e}")
+            db[chat_id] = []
+            loop.pop(chat_id, None)
+            for file in acquired:
+                media_store.release(file)
+            return False
+        schedule_prefetch(chat_id)
+        return True
+
+    async def restore(self):
+        docs = [doc async for doc in playbackdb.find()]
+        if docs:
+            resumed = await asyncio.gather(*(self._resume(doc) for doc in docs))
+            stale = [
+                DeleteOne({"_id": doc["_id"]})
+                for doc, ok in zip(docs, resumed)
+                if not ok
+            ]
+            if stale:
+                await playbackdb.bulk_write(stale, ordered=False)
+            LOGGER(__name__).info(
+                f"Resumed playback in {sum(resumed)} of {len(docs)} chats."
+            )
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._flusher())
+
+    async def stop(self):
+        # freeze the snapshot so teardown doesn't erase what we resume from
+        if self._task:
+            self._task.cancel()
+            self._task = None
+            await self.flush()
+
+
+snapshots = Snapshots(config.QUEUE_SNAPSHOT_INTERVAL)
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
@@ -0,0 +1,175 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+import asyncio
+import os
+import shutil
+from collections import Counter, OrderedDict
+
+import config
+from ShrutiMusic.logging import LOGGER
+from ShrutiMusic.misc import db
+
+MIN_SPEED = 0.5
+MAX_SPEED = 4.0
+
+
+def parse_speed(value):
+    try:
+        speed = round(float(value), 2)
+    except (TypeError, ValueError):
+        return None
+    if not MIN_SPEED <= speed <= MAX_SPEED:
+        return None
+    return speed
+
+
+def _atempo(speed: float) -> str:
+    # a single atempo stage only takes 0.5-2.0 on older ffmpeg builds
+    stages = []
+    while speed > 2.0:
+        stages.append("atempo=2.0")
+        speed /= 2.0
+    while speed < 0.5:
+        stages.append("atempo=0.5")
+        speed /= 0.5
+    stages.append(f"atempo={speed:g}")
+    return ",".join(stages)
+
+
+def speed_parameters(speed, offset: int, video: bool) -> str:
+    speed = float(speed)
+    if speed == 1.0:
+        return f"-ss {offset}"
+    audio = f"-ss {offset} -atmid -filter:a {_atempo(speed)}"
+    if not video:
+        return audio
+    # pytgcalls appends its own -vf for scaling, so the video clock is
+    # rescaled on input instead of with a setpts filter
+    return f"--audio {audio} --video -ss {offset} -itsscale {1 / speed:g}"
+
+
+class SpeedVariants:
+    def __init__(self, root: str, size: int):
+        self.root = root
+        self.size = size
+        self.requests = Counter()
+        self.variants = OrderedDict()
+        self.rendering = {}
+        self._swept = False
+
+    def lookup(self, file_path, speed):
+        key = (str(file_path), float(speed))
+        path = self.variants.get(key)
+        if path and os.path.isfile(path):
+            self.variants.move_to_end(key)
+            return path
+        self.variants.pop(key, None)
+        return None
+
+    def note(self, file_path, speed):
+        if self.size <= 0 or float(speed) == 1.0:
+            return
+        key = (str(file_path), float(speed))
+        self.requests[key] += 1
+        if len(self.requests) > self.size * 8:
+            self.requests = Counter(dict(self.requests.most_common(self.size)))
+        # only tracks asked for twice at the same speed are worth a full render
+        if self.requests[key] < 2 or key in self.variants or key in self.rendering:
+            return
+        self.rendering[key] = asyncio.create_task(self._render(key))
+
+    async def _render(self, key):
+        file_path, speed = key
+        if not self._swept:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self._swept = True
+        folder = os.path.join(self.root, f"{speed:g}")
+        os.makedirs(folder, exist_ok=True)
+        out = os.path.join(folder, os.path.basename(file_path))
+        temp = os.path.join(folder, f"part_{os.path.basename(file_path)}")
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "ffmpeg",
+                "-y",
+                "-loglevel",
+                "error",
+                "-i",
+                file_path,
+                "-threads",
+                "1",
+                "-filter:a",
+                _atempo(speed),
+                "-filter:v",
+                f"setpts=PTS/{speed:g}",
+                temp,
+                stdin=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            _, error = await proc.communicate()
+            if proc.returncode != 0:
+                LOGGER(__name__).warning(
+                    f"Speed render failed for {file_path}: {error.decode()[-200:]}"
+                )
+                return
+            os.replace(temp, out)
+            self.variants[key] = out
+            self.evict()
+        finally:
+            self.rendering.pop(key, None)
+            if os.path.exists(temp):
+                os.remove(temp)
+
+    def _in_use(self, path) -> bool:
+        for queue in list(db.values()):
+            if queue and queue[0].get("speed_path") == path:
+                return True
+        return False
+
+    def evict(self):
+        for key in list(self.variants):
+            if len(self.variants) <= self.size:
+                return
+            path = self.variants[key]
+            if self._in_use(path):
+                continue
+            self.variants.pop(key)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+speed_variants = SpeedVariants(
+    os.path.join(os.getcwd(), "playback"), config.SPEED_CACHE_SIZE
+)
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
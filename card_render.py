@@ -0,0 +1,413 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+# Now-playing card renderer. Runs inside the render pool, so it stays outside
+# the ShrutiMusic package and imports nothing but PIL and numpy.
+
+import logging
+import math
+import os
+import random
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+LOGGER = logging.getLogger
+
+# Bump whenever the card design changes so cached cards and file_ids are dropped.
+LAYOUT_VERSION = 2
+
+CANVAS_W, CANVAS_H = 1320, 760
+SQRT3 = math.sqrt(3)
+
+FONT_REGULAR_PATH = "ShrutiMusic/assets/font2.ttf"
+FONT_BOLD_PATH = "ShrutiMusic/assets/font3.ttf"
+DEFAULT_THUMB = "ShrutiMusic/assets/ShrutiBots.jpg"
+
+
+def wrap_text(draw, text, font, max_width):
+    words = text.split()
+    lines = []
+    current_line = ""
+    
+    for word in words:
+        test_line = current_line + (" " if current_line else "") + word
+        if draw.textlength(test_line, font=font) <= max_width:
+            current_line = test_line
+        else:
+            if current_line:
+                lines.append(current_line)
+            current_line = word
+    
+    if current_line:
+        lines.append(current_line)
+    
+    return lines[:2]
+
+
+def random_gradient(rng):
+    colors = [
+        [(15, 12, 41), (48, 43, 99), (36, 36, 62)],
+        [(10, 10, 10), (35, 35, 40), (20, 20, 25)],
+        [(26, 26, 46), (56, 56, 86), (40, 40, 60)],
+        [(20, 25, 35), (45, 50, 70), (30, 35, 50)],
+        [(12, 17, 30), (38, 43, 65), (25, 30, 45)],
+        [(18, 18, 28), (48, 48, 68), (32, 32, 48)],
+        [(8, 15, 25), (28, 40, 55), (18, 28, 40)],
+        [(22, 22, 35), (52, 52, 75), (35, 35, 55)],
+        [(14, 20, 28), (44, 50, 68), (28, 35, 48)],
+        [(16, 14, 38), (46, 44, 88), (30, 28, 60)],
+    ]
+    return rng.choice(colors)
+
+
+@lru_cache(maxsize=32)
+def gradient_column(colors):
+    progress = np.arange(CANVAS_H) / CANVAS_H
+    stops = np.array(colors, dtype=np.float64)
+    t = np.where(progress < 0.4, progress / 0.4, (progress - 0.4) / 0.6)[:, None]
+    start = np.where(progress[:, None] < 0.4, stops[0], stops[1])
+    end = np.where(progress[:, None] < 0.4, stops[1], stops[2])
+    return (start * (1 - t) + end * t).astype(np.uint8)
+
+
+def apply_gradient(canvas, colors):
+    overlay = np.empty((CANVAS_H, CANVAS_W, 4), dtype=np.uint8)
+    overlay[..., :3] = gradient_column(tuple(map(tuple, colors)))[:, None, :]
+    overlay[..., 3] = 255
+    return Image.alpha_composite(canvas, Image.fromarray(overlay, "RGBA"))
+
+
+def random_layout(rng):
+    layouts = [
+        {
+            'art_size': rng.randint(420, 520),
+            'art_x': rng.randint(60, 120),
+            'art_shape': rng.choice(['circle', 'rounded', 'diamond']),
+            'text_align': 'right',
+            'accent_style': rng.choice(['line', 'dot', 'wave']),
+            'show_particles': rng.choice([True, False])
+        },
+        {
+            'art_size': rng.randint(400, 500),
+            'art_x': CANVAS_W - rng.randint(520, 620),
+            'art_shape': rng.choice(['circle', 'rounded', 'square']),
+            'text_align': 'left',
+            'accent_style': rng.choice(['line', 'glow', 'none']),
+            'show_particles': rng.choice([True, False])
+        },
+        {
+            'art_size': rng.randint(380, 480),
+            'art_x': rng.randint(80, 140),
+            'art_shape': rng.choice(['circle', 'hexagon', 'rounded']),
+            'text_align': 'right',
+            'accent_style': rng.choice(['dot', 'wave', 'glow']),
+            'show_particles': rng.choice([True, False])
+        }
+    ]
+    return rng.choice(layouts)
+
+
+@lru_cache(maxsize=64)
+def create_shape_mask(size, shape, radius=0):
+    y, x = np.mgrid[0:size, 0:size] + 0.5
+    
+    if shape == 'circle':
+        c = size / 2
+        inside = (x - c) ** 2 + (y - c) ** 2 <= c ** 2
+    elif shape == 'rounded':
+        dx = np.maximum(np.maximum(radius - x, x - (size - radius)), 0)
+        dy = np.maximum(np.maximum(radius - y, y - (size - radius)), 0)
+        inside = dx ** 2 + dy ** 2 <= radius ** 2
+    elif shape == 'diamond':
+        c = size / 2
+        inside = np.abs(x - c) + np.abs(y - c) <= c
+    elif shape == 'hexagon':
+        c = size // 2
+        r = size // 2 - 10
+        dx, dy = np.abs(x - c), np.abs(y - c)
+        inside = (dy <= r * SQRT3 / 2) & (SQRT3 * dx + dy <= SQRT3 * r)
+    else:
+        inside = np.ones((size, size), dtype=bool)
+    
+    return Image.fromarray(np.where(inside, 255, 0).astype(np.uint8), "L")
+
+
+def random_accent_color(rng):
+    colors = [
+        (88, 166, 255),
+        (138, 180, 248),
+        (156, 163, 255),
+        (200, 200, 220),
+        (180, 190, 254),
+        (120, 200, 255),
+        (165, 177, 255),
+        (255, 170, 128),
+        (255, 138, 180),
+        (148, 226, 213),
+    ]
+    return rng.choice(colors)
+
+
+@lru_cache(maxsize=8)
+def _disk(size):
+    y, x = np.mgrid[0:size, 0:size] + 0.5
+    c = size / 2
+    return np.nonzero((x - c) ** 2 + (y - c) ** 2 <= c ** 2)
+
+
+def _stamp(ys, xs, sizes):
+    # Expand top-left corners into the pixel coordinates of their dots, one size group at a time.
+    out_y, out_x, owner = [], [], []
+    for size in np.unique(sizes):
+        idx = np.nonzero(sizes == size)[0]
+        dy, dx = _disk(int(size) + 1)
+        out_y.append((ys[idx, None] + dy).ravel())
+        out_x.append((xs[idx, None] + dx).ravel())
+        owner.append(np.repeat(idx, len(dy)))
+    if not out_y:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    return np.concatenate(out_y), np.concatenate(out_x), np.concatenate(owner)
+
+
+@lru_cache(maxsize=256)
+def scatter_field(seed, count, size, alpha, margin=0):
+    gen = np.random.default_rng(seed)
+    n = gen.integers(count[0], count[1] + 1)
+    xs = gen.integers(margin, CANVAS_W - margin + 1, n)
+    ys = gen.integers(margin, CANVAS_H - margin + 1, n)
+    sizes = gen.integers(size[0], size[1] + 1, n)
+    alphas = gen.integers(alpha[0], alpha[1] + 1, n)
+    py, px, owner = _stamp(ys, xs, sizes)
+    return py, px, alphas[owner]
+
+
+@lru_cache(maxsize=128)
+def wave_field(y_start):
+    xs = np.arange(0, CANVAS_W, 3)
+    ys = y_start + (np.sin(xs / 50) * 20).astype(np.int64)
+    py, px, _ = _stamp(ys, xs, np.full(len(xs), 2))
+    return py, px, np.full(len(py), 60)
+
+
+def paint_field(canvas, field, color):
+    ys, xs, alphas = field
+    keep = (ys >= 0) & (ys < CANVAS_H) & (xs >= 0) & (xs < CANVAS_W)
+    alpha = np.zeros((CANVAS_H, CANVAS_W), dtype=np.uint8)
+    np.maximum.at(alpha, (ys[keep], xs[keep]), alphas[keep].astype(np.uint8))
+    layer = np.empty((CANVAS_H, CANVAS_W, 4), dtype=np.uint8)
+    layer[..., :3] = color
+    layer[..., 3] = alpha
+    return Image.alpha_composite(canvas, Image.fromarray(layer, "RGBA"))
+
+
+def add_particles(canvas, accent_color, rng):
+    field = scatter_field(rng.getrandbits(32), (15, 30), (1, 4), (40, 120))
+    return paint_field(canvas, field, accent_color)
+
+
+def add_accent_elements(canvas, layout, accent_color, rng):
+    style = layout['accent_style']
+    
+    if style == 'line':
+        y_pos = rng.randint(100, 200)
+        x_start = rng.randint(30, 100)
+        length = rng.randint(200, 400)
+        width = rng.randint(2, 4)
+        ImageDraw.Draw(canvas).line([(x_start, y_pos), (x_start + length, y_pos)], 
+                 fill=(*accent_color, 180), width=width)
+    
+    elif style == 'dot':
+        field = scatter_field(rng.getrandbits(32), (3, 8), (4, 10), (100, 100), 40)
+        canvas = paint_field(canvas, field, accent_color)
+    
+    elif style == 'wave':
+        canvas = paint_field(canvas, wave_field(rng.randint(80, 150)), accent_color)
+    
+    return canvas
+
+
+@lru_cache(maxsize=64)
+def glow_ring(size, color, blur_amount):
+    ring_size = size + 30
+    ring_img = Image.new("RGBA", (ring_size, ring_size), (0, 0, 0, 0))
+    rdraw = ImageDraw.Draw(ring_img)
+    
+    for i in range(5):
+        offset = i * 5
+        alpha = 150 - (i * 30)
+        rdraw.ellipse([offset, offset, ring_size - offset, ring_size - offset],
+                     outline=(*color, alpha), width=3)
+    
+    return ring_img.filter(ImageFilter.GaussianBlur(blur_amount))
+
+
+def add_glow_ring(canvas, x, y, size, color, blur_amount):
+    ring_img = glow_ring(size, color, blur_amount)
+    canvas.paste(ring_img, (x - 15, y - 15), ring_img)
+
+
+def render_card(videoid, base_path, title, duration, views, channel, username, out):
+    rng = random.Random(f"{videoid}:{LAYOUT_VERSION}")
+    try:
+        base_img = Image.open(base_path).convert("RGBA")
+    except Exception:
+        base_img = Image.open(DEFAULT_THUMB).convert("RGBA")
+
+    try:
+        canvas = Image.new("RGBA", (CANVAS_W, CANVAS_H), (0, 0, 0, 255))
+        
+        gradient_colors = random_gradient(rng)
+        canvas = apply_gradient(canvas, gradient_colors)
+        
+        layout = random_layout(rng)
+        accent_color = random_accent_color(rng)
+        
+        if layout['show_particles']:
+            canvas = add_particles(canvas, accent_color, rng)
+            canvas = canvas.filter(ImageFilter.GaussianBlur(1))
+        
+        art_size = layout['art_size']
+        art_x = layout['art_x']
+        art_y = (CANVAS_H - art_size) // 2
+        
+        radius = rng.randint(40, 80) if layout['art_shape'] == 'rounded' else 0
+        mask = create_shape_mask(art_size, layout['art_shape'], radius)
+        art = base_img.resize((art_size, art_size), Image.LANCZOS)
+        art.putalpha(mask)
+        
+        if rng.choice([True, False]):
+            add_glow_ring(canvas, art_x, art_y, art_size, accent_color, rng.randint(8, 15))
+        
+        canvas.paste(art, (art_x, art_y), art)
+        
+        canvas = add_accent_elements(canvas, layout, accent_color, rng)
+        
+        draw = ImageDraw.Draw(canvas)
+        
+        brand_font = ImageFont.truetype(FONT_BOLD_PATH, rng.randint(36, 48))
+        brand_x = rng.randint(35, 60)
+        brand_y = rng.randint(25, 45)
+        
+        shadow_offset = 2
+        draw.text((brand_x + shadow_offset, brand_y + shadow_offset), 
+                 username, fill=(0, 0, 0, 150), font=brand_font)
+        draw.text((brand_x, brand_y), username, fill=(255, 255, 255, 255), font=brand_font)
+        
+        brand_bbox = draw.textbbox((brand_x, brand_y), username, font=brand_font)
+        brand_w = brand_bbox[2] - brand_bbox[0]
+        underline_y = brand_bbox[3] + 6
+        draw.line([(brand_x, underline_y), (brand_x + brand_w, underline_y)], 
+                 fill=(*accent_color, 200), width=3)
+        
+        if layout['text_align'] == 'right':
+            info_x = art_x + art_size + rng.randint(60, 100)
+            max_text_w = CANVAS_W - info_x - 50
+        else:
+            info_x = rng.randint(50, 100)
+            max_text_w = art_x - info_x - 50
+        
+        np_options = ["NOW PLAYING", "PLAYING NOW", "NOW PLAYING", "PLAYING"]
+        np_font = ImageFont.truetype(FONT_BOLD_PATH, rng.randint(50, 70))
+        np_text = rng.choice(np_options)
+        np_y = rng.randint(120, 160)
+        
+        np_shadow = 3
+        draw.text((info_x + np_shadow, np_y + np_shadow), np_text, 
+                 fill=(0, 0, 0, 180), font=np_font)
+        draw.text((info_x, np_y), np_text, fill=(*accent_color, 255), font=np_font)
+        
+        title_font_size = rng.randint(36, 48)
+        title_font = ImageFont.truetype(FONT_BOLD_PATH, title_font_size)
+        title_lines = wrap_text(draw, title, title_font, max_text_w)
+        title_text = "\n".join(title_lines)
+        title_y = np_y + rng.randint(70, 100)
+        
+        title_shadow = 2
+        draw.multiline_text((info_x + title_shadow, title_y + title_shadow), title_text, 
+                          fill=(0, 0, 0, 160), font=title_font, 
+                          spacing=rng.randint(8, 15))
+        draw.multiline_text((info_x, title_y), title_text, 
+                          fill=(255, 255, 255, 255), font=title_font, 
+                          spacing=rng.randint(8, 15))
+        
+        meta_font = ImageFont.truetype(FONT_REGULAR_PATH, rng.randint(28, 36))
+        meta_y = title_y + rng.randint(120, 160)
+        line_spacing = rng.randint(45, 60)
+        
+        duration_label = duration
+        if duration and ":" in duration:
+            parts = duration.split(":")
+            if len(parts) == 2 and parts[0].isdigit():
+                duration_label = f"{parts[0]}m {parts[1]}s"
+        
+        meta_labels = rng.choice([
+            ["Views", "Duration", "Channel"],
+            ["", "", ""]
+        ])
+        
+        meta_items = [
+            f"{meta_labels[0]} {views}" if meta_labels[0] else f"{views}",
+            f"{meta_labels[1]} {duration_label}" if meta_labels[1] else f"{duration_label}",
+            f"{meta_labels[2]} {channel}" if meta_labels[2] else f"{channel}"
+        ]
+        
+        for idx, meta in enumerate(meta_items):
+            y = meta_y + (idx * line_spacing)
+            draw.text((info_x + 1, y + 1), meta, fill=(0, 0, 0, 140), font=meta_font)
+            draw.text((info_x, y), meta, fill=(220, 220, 230, 255), font=meta_font)
+        
+        if rng.choice([True, False]):
+            corner_size = rng.randint(30, 50)
+            corner_width = rng.randint(2, 4)
+            corner_color = (*accent_color, 120)
+            
+            draw.line([(25, 25), (25 + corner_size, 25)], fill=corner_color, width=corner_width)
+            draw.line([(25, 25), (25, 25 + corner_size)], fill=corner_color, width=corner_width)
+            
+            draw.line([(CANVAS_W - 25, 25), (CANVAS_W - 25 - corner_size, 25)], 
+                     fill=corner_color, width=corner_width)
+            draw.line([(CANVAS_W - 25, 25), (CANVAS_W - 25, 25 + corner_size)], 
+                     fill=corner_color, width=corner_width)
+        
+        temp = f"{out}.part"
+        canvas.save(temp, format="PNG", compress_level=1)
+        os.replace(temp, out)
+        return out
+
+    except Exception as e:
+        LOGGER(__name__).exception(f"Failed to render card for {videoid}: {e}")
+        return None
+
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 
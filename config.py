@@ -51,10 +51,65 @@ PRIVACY_LINK = os.getenv("PRIVACY_LINK", "https://graph.org/Privacy-Policy-05-01
 
 DURATION_LIMIT_MIN = int(os.getenv("DURATION_LIMIT", 99999))
 PLAYLIST_FETCH_LIMIT = int(os.getenv("PLAYLIST_FETCH_LIMIT", 25))
+PLAYLIST_RESOLVE_WORKERS = int(os.getenv("PLAYLIST_RESOLVE_WORKERS", 5))  # playlist tracks looked up at once
+PLAYLIST_PROGRESS_INTERVAL = int(os.getenv("PLAYLIST_PROGRESS_INTERVAL", 3))  # seconds between playlist progress edits
 
 TG_AUDIO_FILESIZE_LIMIT = int(os.getenv("TG_AUDIO_FILESIZE_LIMIT", 104857600))
 TG_VIDEO_FILESIZE_LIMIT = int(os.getenv("TG_VIDEO_FILESIZE_LIMIT", 2145386496))
 
+# ================= CACHE ================= #
+
+META_CACHE_SIZE = int(os.getenv("META_CACHE_SIZE", 2048))
+META_CACHE_TTL = int(os.getenv("META_CACHE_TTL", 21600))
+
+DOWNLOAD_CACHE_LIMIT = int(os.getenv("DOWNLOAD_CACHE_LIMIT", 2048))  # in MB, 0 = delete after play
+DOWNLOAD_CACHE_POLICY = os.getenv("DOWNLOAD_CACHE_POLICY", "lru").lower()  # lru / lfu
+PCM_CACHE_LIMIT = int(os.getenv("PCM_CACHE_LIMIT", 1024))  # in MB of played audio kept pre-decoded for pytgcalls, 0 = off
+PCM_CACHE_WORKERS = int(os.getenv("PCM_CACHE_WORKERS", 1))  # concurrent background conversions
+
+THUMB_CACHE_SIZE = int(os.getenv("THUMB_CACHE_SIZE", 500))  # rendered now-playing cards kept
+MEDIA_CACHE_SIZE = int(os.getenv("MEDIA_CACHE_SIZE", 4096))  # telegram file_ids kept for re-sends
+SPEED_CACHE_SIZE = int(os.getenv("SPEED_CACHE_SIZE", 20))  # pre-rendered speed variants of replayed tracks, 0 = off
+
+SETTINGS_CACHE_SIZE = int(os.getenv("SETTINGS_CACHE_SIZE", 10000))  # chats whose settings stay in memory
+SETTINGS_FLUSH_INTERVAL = int(os.getenv("SETTINGS_FLUSH_INTERVAL", 5))  # seconds between settings writes
+QUEUE_SNAPSHOT_INTERVAL = int(os.getenv("QUEUE_SNAPSHOT_INTERVAL", 10))  # seconds between queue snapshots, 0 = off
+
+LEADERBOARD_SIZE = int(os.getenv("LEADERBOARD_SIZE", 100))  # entries kept per top chats/users/tracks board
+LEADERBOARD_INTERVAL = int(os.getenv("LEADERBOARD_INTERVAL", 600))  # seconds between leaderboard refreshes
+
+# ================= HTTP ================= #
+
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", 100))
+HTTP_HOST_LIMIT = int(os.getenv("HTTP_HOST_LIMIT", 20))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 2))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", 0.5))
+
+# ================= STREAMING ================= #
+
+PROGRESSIVE_BUFFER = int(os.getenv("PROGRESSIVE_BUFFER", 512))  # KB downloaded before audio starts playing, 0 = wait for the full file
+PROGRESSIVE_STALL_TIMEOUT = int(os.getenv("PROGRESSIVE_STALL_TIMEOUT", 30))  # seconds without new data before a stream is dropped
+PROGRESSIVE_HOST = os.getenv("PROGRESSIVE_HOST", "127.0.0.1")
+PROGRESSIVE_PORT = int(os.getenv("PROGRESSIVE_PORT", 8766))
+
+SIMULCAST_LEAD = int(os.getenv("SIMULCAST_LEAD", 5))  # seconds a shared decode runs ahead before listeners attach
+SIMULCAST_TIMEOUT = int(os.getenv("SIMULCAST_TIMEOUT", 20))  # seconds to wait for that lead before decoding per chat
+
+# ================= WORKERS ================= #
+
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", 2))
+THREAD_WORKERS = int(os.getenv("THREAD_WORKERS", 8))
+EXTRACT_TIMEOUT = int(os.getenv("EXTRACT_TIMEOUT", 300))
+THREAD_TIMEOUT = int(os.getenv("THREAD_TIMEOUT", 60))
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", 2))
+RENDER_TIMEOUT = int(os.getenv("RENDER_TIMEOUT", 30))
+
+PREFETCH_DEPTH = int(os.getenv("PREFETCH_DEPTH", 2))  # queued tracks to fetch ahead, 0 = off
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", 2))  # concurrent prefetches across chats
+
+BROADCAST_RATE = int(os.getenv("BROADCAST_RATE", 25))  # messages per second across all broadcasts
+BROADCAST_WORKERS = int(os.getenv("BROADCAST_WORKERS", 8))  # concurrent sends per broadcast
+
 # ================= SPOTIFY ================= #
 
 SPOTIFY_CLIENT_ID = os.getenv("SPOTIFY_CLIENT_ID")
@@ -68,6 +123,31 @@ STRING3 = os.getenv("STRING_SESSION3")
 STRING4 = os.getenv("STRING_SESSION4")
 STRING5 = os.getenv("STRING_SESSION5")
 
+# every STRING_SESSION<n> variable, keyed by assistant number
+STRING_SESSIONS = {
+    int(match.group(1) or 1): value
+    for key, value in os.environ.items()
+    if (match := re.fullmatch(r"STRING_SESSION(\d*)", key)) and value
+}
+
+# ================= ASSISTANTS ================= #
+
+ASSISTANT_VIDEO_WEIGHT = int(os.getenv("ASSISTANT_VIDEO_WEIGHT", 3))  # a video call costs this many audio calls
+ASSISTANT_ERROR_WINDOW = int(os.getenv("ASSISTANT_ERROR_WINDOW", 600))  # seconds call errors count against an assistant
+ASSISTANT_ERROR_LIMIT = int(os.getenv("ASSISTANT_ERROR_LIMIT", 3))  # recent errors before an assistant is avoided
+ASSISTANT_REBALANCE_MARGIN = int(os.getenv("ASSISTANT_REBALANCE_MARGIN", 2))  # extra cost before idle chats move off
+
+# ================= SHARDING ================= #
+
+SHARD_WORKERS = int(os.getenv("SHARD_WORKERS", 0))  # processes hosting voice calls, 0 = all in this process
+SHARD_HOST = os.getenv("SHARD_HOST", "127.0.0.1")  # loopback only, workers play media straight from this machine
+SHARD_PORT = int(os.getenv("SHARD_PORT", 8765))
+SHARD_SPAWN = os.getenv(
+    "SHARD_SPAWN", "True"
+).lower() in ["true", "1", "yes"]  # start the shard workers ourselves instead of externally
+SHARD_SECRET = os.getenv("SHARD_SECRET")  # defaults to the bot token
+SHARD_TIMEOUT = int(os.getenv("SHARD_TIMEOUT", 60))  # seconds to wait for a shard reply or connection
+
 # ================= FLAGS ================= #
 
 AUTO_LEAVING_ASSISTANT = os.getenv(
@@ -78,6 +158,15 @@ START_STICKER_ENABLED = os.getenv(
     "START_STICKER_ENABLED", "True"
 ).lower() in ["true", "1", "yes"]
 
+SIMULCAST = os.getenv(
+    "SIMULCAST", "True"
+).lower() in ["true", "1", "yes"]  # chats playing the same local audio share one decode
+
+MONGO_DEBUG = os.getenv(
+    "MONGO_DEBUG", "False"
+).lower() in ["true", "1", "yes"]
+MONGO_SLOW_MS = int(os.getenv("MONGO_SLOW_MS", 100))  # queries logged as slow in MONGO_DEBUG
+
 # ================= START MEDIA ================= #
 
 START_IMG_URL = os.getenv(
@@ -110,7 +199,6 @@ BANNED_USERS = filters.user()
 adminlist = {}
 lyrical = {}
 votemode = {}
-autoclean = []
 confirmer = {}
 
 TEMP_DB_FOLDER = "tempdb"
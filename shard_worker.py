@@ -0,0 +1,353 @@
+# Copyright (c) 2025 Nand Yaduwanshi <NoxxOP>
+# Location: Supaul, Bihar
+#
+# All rights reserved.
+#
+# This code is the intellectual property of Nand Yaduwanshi.
+# You are not allowed to copy, modify, redistribute, or use this
+# code for commercial or personal projects without explicit permission.
+#
+# Allowed:
+# - Forking for personal learning
+# - Submitting improvements via pull requests
+#
+# Not Allowed:
+# - Claiming this code as your own
+# - Re-uploading without credit or permission
+# - Selling or using commercially
+#
+# Contact for permissions:
+# Email: badboy809075@gmail.com
+
+
+# Shard worker entry point. Kept outside the ShrutiMusic package on purpose:
+# importing the package runs its boot side effects (dir cleanup, git pull,
+# heroku checks), which must only ever happen in the coordinator.
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import struct
+import sys
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pyrogram import Client
+from pytgcalls import PyTgCalls, StreamType
+from pytgcalls.types import Update
+from pytgcalls.types.input_stream import (
+    AudioParameters,
+    AudioPiped,
+    AudioVideoPiped,
+    InputAudioStream,
+    InputStream,
+    VideoParameters,
+)
+from pytgcalls.types.stream import StreamAudioEnded
+
+import config
+
+HEADER = struct.Struct(">I")
+NONCE = 16
+MAC = 32
+MAX_FRAME = 1024 * 1024
+
+CALL_METHODS = {
+    "change_stream",
+    "get_participants",
+    "join_group_call",
+    "leave_group_call",
+    "pause_stream",
+    "ping",
+    "resume_stream",
+}
+WORKER_METHODS = {"add", "remove"}
+STREAM_TYPES = {3: "live_stream", 4: "pulse_stream", 10: "local_stream"}
+
+LOGGER = logging.getLogger
+
+
+def shard_of(number: int) -> int:
+    return (int(number) - 1) % config.SHARD_WORKERS
+
+
+def _secret() -> bytes:
+    secret = config.SHARD_SECRET or str(config.BOT_TOKEN)
+    return hashlib.sha256(secret.encode()).digest()
+
+
+def _mac(key: bytes, data: bytes) -> bytes:
+    return hmac.new(key, data, "sha256").digest()
+
+
+async def _send_raw(writer, data: bytes):
+    writer.write(HEADER.pack(len(data)) + data)
+    await writer.drain()
+
+
+async def _recv_raw(reader) -> bytes:
+    size = HEADER.unpack(await reader.readexactly(HEADER.size))[0]
+    if size > MAX_FRAME:
+        raise ConnectionError(f"shard frame of {size} bytes refused")
+    return await reader.readexactly(size)
+
+
+class Channel:
+    # every frame carries a MAC over its direction, sequence number and body
+    def __init__(self, reader, writer, key: bytes, outgoing: bytes, incoming: bytes):
+        self.reader = reader
+        self.writer = writer
+        self.key = key
+        self.outgoing = outgoing
+        self.incoming = incoming
+        self.sent = 0
+        self.received = 0
+        self._lock = asyncio.Lock()
+
+    def _sign(self, label: bytes, counter: int, body: bytes) -> bytes:
+        return _mac(self.key, label + counter.to_bytes(8, "big") + body)
+
+    async def send(self, message):
+        body = json.dumps(message).encode()
+        async with self._lock:
+            mac = self._sign(self.outgoing, self.sent, body)
+            self.sent += 1
+            await _send_raw(self.writer, mac + body)
+
+    async def recv(self):
+        frame = await _recv_raw(self.reader)
+        mac, body = frame[:MAC], frame[MAC:]
+        if not hmac.compare_digest(mac, self._sign(self.incoming, self.received, body)):
+            raise ConnectionError("shard frame failed authentication")
+        self.received += 1
+        return json.loads(body)
+
+    def close(self):
+        self.writer.close()
+
+
+async def handshake(reader, writer, coordinator: bool) -> Channel:
+    # each proof names its role and covers both nonces, so neither side can
+    # reflect the other's proof back, and the coordinator only answers a
+    # worker that has already proven itself
+    secret = _secret()
+    if coordinator:
+        ours = os.urandom(NONCE)
+        await _send_raw(writer, ours)
+        frame = await _recv_raw(reader)
+        theirs, proof = frame[:NONCE], frame[NONCE:]
+        if len(theirs) != NONCE or not hmac.compare_digest(
+            proof, _mac(secret, b"worker" + theirs + ours)
+        ):
+            raise ConnectionError("shard worker failed the handshake")
+        await _send_raw(writer, _mac(secret, b"coord" + ours + theirs))
+        coord, worker = ours, theirs
+    else:
+        theirs = await _recv_raw(reader)
+        if len(theirs) != NONCE:
+            raise ConnectionError("malformed shard handshake")
+        ours = os.urandom(NONCE)
+        await _send_raw(writer, ours + _mac(secret, b"worker" + ours + theirs))
+        proof = await _recv_raw(reader)
+        if not hmac.compare_digest(proof, _mac(secret, b"coord" + theirs + ours)):
+            raise ConnectionError("shard coordinator failed the handshake")
+        coord, worker = theirs, ours
+    key = _mac(secret, b"session" + coord + worker)
+    if coordinator:
+        return Channel(reader, writer, key, b"coord>", b"worker>")
+    return Channel(reader, writer, key, b"worker>", b"coord>")
+
+
+def _local_path(path):
+    # workers share this machine's disk but may run from another directory
+    if isinstance(path, str) and os.path.exists(path):
+        return os.path.abspath(path)
+    return path
+
+
+def encode_value(value):
+    if isinstance(value, StreamType):
+        return {"stream_type": value.stream_mode}
+    if not isinstance(value, InputStream):
+        return value
+    audio = value.stream_audio
+    spec = {
+        "kind": "raw",
+        "path": _local_path(audio.path),
+        "bitrate": audio.parameters.bitrate,
+        "ffmpeg": getattr(value, "ffmpeg_parameters", ""),
+    }
+    if isinstance(value, AudioVideoPiped):
+        video = value.stream_video.parameters
+        spec.update(
+            kind="av",
+            path=_local_path(value._path),
+            video=[video.width, video.height, video.frame_rate],
+        )
+    elif isinstance(value, AudioPiped):
+        spec.update(kind="audio", path=_local_path(value._path))
+    return {"stream": spec}
+
+
+def decode_value(value):
+    if not isinstance(value, dict):
+        return value
+    if "stream_type" in value:
+        return getattr(StreamType(), STREAM_TYPES[int(value["stream_type"])])
+    spec = value["stream"]
+    path, ffmpeg = str(spec["path"]), str(spec["ffmpeg"])
+    audio = AudioParameters(int(spec["bitrate"]))
+    if spec["kind"] == "av":
+        width, height, frame_rate = (int(x) for x in spec["video"])
+        return AudioVideoPiped(
+            path,
+            audio_parameters=audio,
+            video_parameters=VideoParameters(width, height, frame_rate),
+            additional_ffmpeg_parameters=ffmpeg,
+        )
+    if spec["kind"] == "audio":
+        return AudioPiped(path, audio_parameters=audio, additional_ffmpeg_parameters=ffmpeg)
+    return InputStream(InputAudioStream(path, audio))
+
+
+def encode_result(value):
+    if isinstance(value, (int, float, str, bool)) or value is None:
+        return value
+    if isinstance(value, list):
+        return [vars(item) for item in value]
+    return None
+
+
+class ShardWorker:
+    def __init__(self, index: int):
+        self.index = index
+        self.clients = {}
+        self.calls = {}
+        self.channel = None
+
+    async def _emit(self, number: int, kind: str, chat_id: int):
+        if self.channel:
+            try:
+                await self.channel.send(["event", number, kind, chat_id])
+            except Exception:
+                pass
+
+    async def add(self, number: int, session: str):
+        number = int(number)
+        client = Client(
+            name=f"NandAss{number}",
+            api_id=config.API_ID,
+            api_hash=config.API_HASH,
+            session_string=str(session),
+        )
+        call = PyTgCalls(
+            client,
+            cache_duration=100,
+        )
+        await call.start()
+
+        @call.on_kicked()
+        @call.on_closed_voice_chat()
+        @call.on_left()
+        async def stream_services_handler(_, chat_id: int):
+            await self._emit(number, "closed", chat_id)
+
+        @call.on_stream_end()
+        async def stream_end_handler1(_, update: Update):
+            if not isinstance(update, StreamAudioEnded):
+                return
+            await self._emit(number, "stream_end", update.chat_id)
+
+        self.clients[number] = client
+        self.calls[number] = call
+        LOGGER(__name__).info(f"Shard {self.index} serving assistant {number}.")
+
+    async def remove(self, number: int):
+        number = int(number)
+        self.calls.pop(number, None)
+        client = self.clients.pop(number, None)
+        if client:
+            await client.stop()
+
+    async def _handle(self, request_id, number, method, args, kwargs):
+        try:
+            args = [decode_value(arg) for arg in args]
+            kwargs = {key: decode_value(value) for key, value in kwargs.items()}
+            if number is None:
+                if method not in WORKER_METHODS:
+                    raise ValueError(f"unknown shard method {method}")
+                result = await getattr(self, method)(*args, **kwargs)
+            else:
+                if method not in CALL_METHODS:
+                    raise ValueError(f"unknown call method {method}")
+                call = self.calls[int(number)]
+                if method == "ping":
+                    result = await call.ping
+                else:
+                    result = await getattr(call, method)(*args, **kwargs)
+            reply = ["reply", request_id, True, encode_result(result)]
+        except Exception as e:
+            reply = ["reply", request_id, False, [type(e).__name__, str(e)]]
+        try:
+            await self.channel.send(reply)
+        except Exception:
+            pass
+
+    async def _sessions(self) -> dict:
+        # same merge as get_assistant_sessions, read without the bot package
+        sessions = dict(config.STRING_SESSIONS)
+        client = AsyncIOMotorClient(config.MONGO_DB_URI)
+        async for doc in client.Yukki.sessions.find({}):
+            sessions.setdefault(doc["_id"], doc["session"])
+        client.close()
+        return sessions
+
+    async def run(self):
+        sessions = await self._sessions()
+        await asyncio.gather(
+            *(
+                self.add(number, session)
+                for number, session in sessions.items()
+                if shard_of(number) == self.index
+            )
+        )
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(
+                    config.SHARD_HOST, config.SHARD_PORT
+                )
+                self.channel = await handshake(reader, writer, coordinator=False)
+                await self.channel.send(["hello", self.index, list(self.calls)])
+                while True:
+                    message = await self.channel.recv()
+                    asyncio.create_task(self._handle(*message))
+            except (OSError, asyncio.IncompleteReadError, ConnectionError, ValueError) as e:
+                LOGGER(__name__).warning(f"Shard {self.index} lost the coordinator: {e}")
+            if self.channel:
+                self.channel.close()
+                self.channel = None
+            await asyncio.sleep(5)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s - %(levelname)s] - %(name)s - %(message)s",
+        datefmt="%d-%b-%y %H:%M:%S",
+    )
+    logging.getLogger("pyrogram").setLevel(logging.ERROR)
+    logging.getLogger("pytgcalls").setLevel(logging.ERROR)
+    asyncio.get_event_loop().run_until_complete(ShardWorker(int(sys.argv[1])).run())
+
+# ©️ Copyright Reserved - @NoxxOP  Nand Yaduwanshi
+
+# ===========================================
+# ©️ 2025 Nand Yaduwanshi (aka @NoxxOP)
+# 🔗 GitHub : https://github.com/NoxxOP/ShrutiMusic
+# 📢 Telegram Channel : https://t.me/ShrutiBots
+# ===========================================
+
+
+# ❤️ Love From ShrutiBots 